@@ -0,0 +1,88 @@
+# assets.py
+"""
+Rejestr zasobów (obrazy, dźwięki, czcionki) ładowanych w tle.
+
+Każdy zasób ma dwie części:
+- load – praca w wątku roboczym (odczyt i dekodowanie pliku, inicjalizacja
+  miksera, przeszukanie czcionek systemowych),
+- finalize – krótki krok w wątku głównym przy pierwszym użyciu
+  (np. convert(), które wymaga okna).
+
+get() nigdy nie czeka: dopóki zasób się ładuje, zwraca wartość zastępczą,
+więc pierwsza klatka pojawia się od razu, a zasoby dochodzą, gdy są gotowe.
+poll() w pętli gry mówi, które zasoby właśnie doszły.
+"""
+
+from concurrent.futures import ThreadPoolExecutor, wait
+
+_MISSING = object()
+
+
+class AssetRegistry:
+    """
+    Ładuje zarejestrowane zasoby w puli wątków i trzyma gotowe wyniki.
+    Zasób, którego nie udało się wczytać, pozostaje niedostępny
+    (get() zwraca wartość zastępczą), a błąd trafia do errors.
+    """
+
+    def __init__(self, workers: int = 2):
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="assets")
+        self._finalizers = {}
+        self._futures = {}
+        self._cache = {}
+        self._announced = set()
+        self.errors = {}
+
+    def register(self, name: str, load, finalize=None):
+        """Rejestruje zasób i od razu zleca jego wczytanie w tle."""
+        if name in self._futures:
+            return
+        self._finalizers[name] = finalize
+        self._futures[name] = self._executor.submit(load)
+
+    def _settle(self, name) -> bool:
+        """Przenosi wczytany zasób do pamięci (z finalize). False, jeśli jeszcze trwa."""
+        if name in self._cache or name in self.errors:
+            return True
+        future = self._futures.get(name)
+        if future is None or not future.done():
+            return False
+        try:
+            value = future.result()
+            finalize = self._finalizers[name]
+            self._cache[name] = finalize(value) if finalize is not None else value
+        except Exception as e:
+            self.errors[name] = e
+        return True
+
+    def ready(self, name: str) -> bool:
+        """Czy zasób jest wczytany i gotowy do użycia."""
+        return self._settle(name) and name in self._cache
+
+    def get(self, name: str, default=None):
+        """Zasób albo default, jeśli jeszcze się ładuje lub się nie wczytał."""
+        value = self._cache.get(name, _MISSING)
+        if value is _MISSING:
+            value = self._cache.get(name, default) if self._settle(name) else default
+        return value
+
+    def poll(self) -> list[str]:
+        """Nazwy zasobów, które doszły (albo zawiodły) od ostatniego wywołania."""
+        if len(self._announced) == len(self._futures):
+            return []
+        arrived = [
+            name for name in self._futures
+            if name not in self._announced and self._settle(name)
+        ]
+        self._announced.update(arrived)
+        return arrived
+
+    def wait_all(self, timeout: float | None = None) -> bool:
+        """Czeka na wszystkie zasoby (np. w benchmarku). False po przekroczeniu timeout."""
+        _, not_done = wait(list(self._futures.values()), timeout=timeout)
+        for name in self._futures:
+            self._settle(name)
+        return not not_done
+
+    def shutdown(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
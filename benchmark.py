@@ -0,0 +1,422 @@
+# benchmark.py
+"""
+Benchmarki silników planszy, renderowania i pamięci z wynikami w JSON.
+
+    python benchmark.py --output wyniki.json
+    python benchmark.py --quick --baseline wyniki.json      # porównanie
+    python benchmark.py --compare stare.json nowe.json      # bez pomiarów
+
+Zestawy (--suites):
+- step   – przepustowość kroku (komórki/s) dla silników, rozmiarów planszy,
+           gęstości losowej zupy i wzorów (R-pentomino, działo Gospera, acorn);
+           step-hashed to krok z odczytem board_hash, jak w grze z CycleDetector,
+- render – czas klatki GameApp.draw na niewidocznym ekranie (SDL dummy),
+- memory – szczytowa pamięć silnika (tracemalloc) na komórkę planszy,
+- startup – zimny start gry w nowym procesie: import, pierwsza klatka
+            i moment, w którym wszystkie zasoby są wczytane.
+
+Każdy wynik ma stałą nazwę (np. "step/numpy/1024/soup-0.25"), więc plik
+można porównać z zapisaną linią bazową: wynik gorszy o więcej niż
+--threshold jest regresją, a program kończy się kodem 1.
+"""
+
+import argparse
+import io
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+
+from grid import create_grid
+from patterns import place_pattern, read_rle
+
+SUITES = ("step", "render", "memory", "startup")
+ENGINES = ("numpy", "bitpacked", "chunked", "parallel")
+DEFAULT_ENGINES = ("numpy", "bitpacked", "chunked")
+SIZES = (64, 256, 1024, 4096)
+QUICK_SIZES = (64, 256, 1024)
+DENSITIES = (0.1, 0.25, 0.5)
+
+# Wzory standardowe w RLE – małe zarodki, które długo się rozwijają
+PATTERNS = {
+    "r-pentomino": "x = 3, y = 3\nb2o$2o$bo!",
+    "acorn": "x = 7, y = 3\nbo5b$3bo3b$2o2b3o!",
+    "gosper-gun": (
+        "x = 36, y = 9\n"
+        "24bo$22bobo$12b2o6b2o12b2o$11bo3bo4b2o12b2o$2o8bo5bo3b2o$"
+        "2o8bo3bob2o4bobo$10bo5bo7bo$11bo3bo$12b2o!"
+    ),
+}
+
+# Widoki dla zestawu render: (nazwa, bok planszy, powiększenie kamery)
+RENDER_VIEWS = (
+    ("window", None, None),
+    ("1024-zoom1", 1024, 1),
+    ("4096-zoom0.25", 4096, 1 / 4),
+)
+RENDER_MODES = ("sprites", "pixels")
+
+# Zimny start w osobnym procesie; czasy w sekundach od początku skryptu
+STARTUP_SCRIPT = """
+import json, time
+start = time.perf_counter()
+from game import GameApp
+imported = time.perf_counter()
+app = GameApp()
+app.draw()
+first_frame = time.perf_counter()
+app.assets.wait_all()
+assets = time.perf_counter()
+app.assets.shutdown()
+print(json.dumps({
+    "import": imported - start,
+    "first-frame": first_frame - start,
+    "assets": assets - start,
+}))
+"""
+STARTUP_RUNS = 5
+
+
+def _result(suite, name, metric, unit, value, better, **details) -> dict:
+    return {
+        "suite": suite,
+        "name": name,
+        "metric": metric,
+        "unit": unit,
+        "value": value,
+        "better": better,
+        **details,
+    }
+
+
+def _timed_runs(action, min_time, min_runs=3, max_runs=10_000) -> list[float]:
+    """Czasy kolejnych wywołań action(), aż minie min_time sekund."""
+    times = []
+    start = time.perf_counter()
+    while len(times) < max_runs and (
+        len(times) < min_runs or time.perf_counter() - start < min_time
+    ):
+        t0 = time.perf_counter()
+        action()
+        times.append(time.perf_counter() - t0)
+    return times
+
+
+def _engine_options(engine) -> dict:
+    return {"workers": os.cpu_count() or 1} if engine == "parallel" else {}
+
+
+def _step_hashed(grid):
+    """Krok z odczytem haszu – tyle płaci gra i sweep (CycleDetector.step)."""
+    grid.step()
+    return grid.board_hash
+
+
+def _seed_board(grid, workload):
+    """Przygotowuje planszę: "soup-<gęstość>" albo nazwa z PATTERNS."""
+    if workload.startswith("soup-"):
+        grid.randomize(float(workload[len("soup-"):]), seed=0)
+    else:
+        pattern = read_rle(io.BytesIO(PATTERNS[workload].encode("ascii")))
+        place_pattern(grid, pattern)
+
+
+# ----------------- ZESTAWY ----------------- #
+
+def bench_step(engines, sizes, densities, min_time, log) -> list[dict]:
+    """
+    Przepustowość grid.step() w komórkach na sekundę – sam krok ("step")
+    i krok z odczytem haszu ("step-hashed"), żeby koszt haszu Zobrista
+    nie mógł urosnąć niezauważony.
+    """
+    workloads = [f"soup-{d:g}" for d in densities] + list(PATTERNS)
+    variants = {"step": lambda grid: grid.step(), "step-hashed": _step_hashed}
+    results = []
+    for engine in engines:
+        for size in sizes:
+            for workload in workloads:
+                for variant, step in variants.items():
+                    grid = create_grid(size, size, engine, **_engine_options(engine))
+                    try:
+                        _seed_board(grid, workload)
+                        _step_hashed(grid)  # rozgrzewka (bufory, pula procesów)
+                        times = _timed_runs(lambda: step(grid), min_time)
+                    finally:
+                        if hasattr(grid, "close"):
+                            grid.close()
+                    median = statistics.median(times)
+                    results.append(_result(
+                        "step", f"{variant}/{engine}/{size}/{workload}",
+                        "cells_per_sec", "cells/s", size * size / median, "higher",
+                        engine=engine, size=size, workload=workload,
+                        steps=len(times), step_ms_median=median * 1000,
+                        step_ms_min=min(times) * 1000,
+                    ))
+                    log(results[-1])
+    return results
+
+
+def bench_render(min_time, log) -> list[dict]:
+    """Czas klatki GameApp.draw z planszą w ruchu (SDL dummy, bez okna)."""
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+    import pygame
+    from camera import Camera
+    from config import WINDOW_WIDTH
+    from game import GameApp
+
+    app = GameApp()
+    # Mierzymy ze sprite'ami i czcionkami, nie z zastępczymi
+    app.assets.wait_all()
+    app.update(0)
+    # Bez zanikania startowego – inaczej każda klatka to pełne przerysowanie okna
+    app.fade_alpha = 0
+    results = []
+    for view, size, zoom in RENDER_VIEWS:
+        for mode in RENDER_MODES:
+            if size is not None:
+                app.grid = create_grid(size, size)
+                app.cols = app.rows = size
+                app.camera = Camera((WINDOW_WIDTH, app.game_height), zoom, (size, size))
+                app.board_renderer.camera = app.camera
+            app.board_renderer.pixel_mode = mode == "pixels"
+            app.board_renderer.invalidate()
+            app.grid.randomize(0.25, seed=0)
+            app.state = "running"
+            app.draw()  # pierwsza klatka po zmianie stanu to pełne przerysowanie
+
+            def frame():
+                app.grid.step()
+                t0 = time.perf_counter()
+                app.draw()
+                frame.times.append(time.perf_counter() - t0)
+
+            frame.times = []
+            _timed_runs(frame, min_time, min_runs=10)
+            times = sorted(frame.times)
+            p95 = times[min(len(times) - 1, int(len(times) * 0.95))]
+            results.append(_result(
+                "render", f"render/{view}/{mode}",
+                "frame_ms_median", "ms", statistics.median(times) * 1000, "lower",
+                view=view, mode=mode, cols=app.grid.cols, rows=app.grid.rows,
+                frames=len(times), frame_ms_p95=p95 * 1000,
+            ))
+            log(results[-1])
+    app.assets.shutdown()
+    pygame.quit()
+    return results
+
+
+def bench_memory(engines, sizes, log) -> list[dict]:
+    """
+    Szczytowa pamięć (tracemalloc) planszy w trakcie kilku kroków – stan
+    silnika razem z tablicami tymczasowymi kroku i haszu, bez jednorazowego
+    losowania. Pamięć współdzielona i procesy robocze silnika "parallel"
+    nie są widoczne dla tracemalloc.
+    """
+    results = []
+    for engine in engines:
+        for size in sizes:
+            tracemalloc.start()
+            grid = create_grid(size, size, engine, **_engine_options(engine))
+            try:
+                _seed_board(grid, "soup-0.25")
+                tracemalloc.reset_peak()
+                for _ in range(3):
+                    _step_hashed(grid)
+                peak = tracemalloc.get_traced_memory()[1]
+            finally:
+                tracemalloc.stop()
+                if hasattr(grid, "close"):
+                    grid.close()
+            results.append(_result(
+                "memory", f"memory/{engine}/{size}",
+                "peak_bytes", "B", peak, "lower",
+                engine=engine, size=size, bytes_per_cell=peak / (size * size),
+            ))
+            log(results[-1])
+    return results
+
+
+def bench_startup(runs, log) -> list[dict]:
+    """
+    Czas zimnego startu GameApp (SDL dummy) – mediana z kilku nowych
+    procesów, bez czasu uruchomienia samego interpretera.
+    """
+    env = dict(os.environ, SDL_VIDEODRIVER="dummy", SDL_AUDIODRIVER="dummy")
+    cwd = os.path.dirname(os.path.abspath(__file__))
+    samples = []
+    for _ in range(runs):
+        output = subprocess.run(
+            [sys.executable, "-c", STARTUP_SCRIPT],
+            cwd=cwd, env=env, capture_output=True, text=True, check=True,
+        ).stdout
+        samples.append(json.loads(output.strip().splitlines()[-1]))
+
+    results = []
+    for phase in samples[0]:
+        times = [sample[phase] for sample in samples]
+        results.append(_result(
+            "startup", f"startup/{phase}",
+            "ms_median", "ms", statistics.median(times) * 1000, "lower",
+            runs=runs, ms_min=min(times) * 1000,
+        ))
+        log(results[-1])
+    return results
+
+
+# ----------------- PORÓWNANIE ----------------- #
+
+def compare(baseline, current, threshold) -> list[dict]:
+    """
+    Zestawia wyniki o tych samych nazwach. Zmiana change jest liczona
+    tak, że wartość ujemna zawsze oznacza pogorszenie.
+    """
+    old = {r["name"]: r for r in baseline["results"]}
+    rows = []
+    for r in current["results"]:
+        base = old.get(r["name"])
+        if base is None or not base["value"]:
+            continue
+        ratio = r["value"] / base["value"]
+        change = ratio - 1 if r["better"] == "higher" else 1 / ratio - 1
+        rows.append({
+            "name": r["name"],
+            "unit": r["unit"],
+            "baseline": base["value"],
+            "current": r["value"],
+            "change": change,
+            "regression": change < -threshold,
+        })
+    return rows
+
+
+def _print_comparison(rows, threshold, file=None):
+    for row in rows:
+        flag = "REGRESSION" if row["regression"] else ""
+        print(
+            f"{row['name']:<40} {row['baseline']:>12.4g} -> {row['current']:>12.4g} "
+            f"{row['unit']:<8} {row['change']:+7.1%} {flag}",
+            file=file,
+        )
+    regressions = sum(row["regression"] for row in rows)
+    print(f"{len(rows)} compared, {regressions} regressions (threshold {threshold:.0%})", file=file)
+
+
+def _log(result):
+    print(f"{result['name']:<40} {result['value']:>12.4g} {result['unit']}", file=sys.stderr)
+
+
+def _metadata() -> dict:
+    return {
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "cpu_count": os.cpu_count(),
+    }
+
+
+def _csv(text) -> list[str]:
+    return [item.strip() for item in text.split(",") if item.strip()]
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Benchmark grid engines, rendering and memory; compare with a baseline."
+    )
+    parser.add_argument(
+        "--suites", type=_csv, default=list(SUITES),
+        help=f"comma-separated suites to run ({', '.join(SUITES)})",
+    )
+    parser.add_argument(
+        "--engines", type=_csv, default=list(DEFAULT_ENGINES),
+        help=f"comma-separated grid engines ({', '.join(ENGINES)})",
+    )
+    parser.add_argument(
+        "--sizes", type=lambda text: [int(s) for s in _csv(text)], default=None,
+        help="comma-separated board sides (default 64,256,1024,4096)",
+    )
+    parser.add_argument(
+        "--quick", action="store_true",
+        help="smaller boards, one soup density and shorter timing",
+    )
+    parser.add_argument(
+        "--min-time", type=float, default=None, metavar="SECONDS",
+        help="minimum measured time per case (default 0.5, --quick 0.1)",
+    )
+    parser.add_argument("--output", metavar="FILE", help="write JSON results to FILE (default stdout)")
+    parser.add_argument("--baseline", metavar="FILE", help="compare the run with a baseline JSON")
+    parser.add_argument(
+        "--compare", nargs=2, metavar=("BASELINE", "CURRENT"),
+        help="only compare two result files, without running benchmarks",
+    )
+    parser.add_argument(
+        "--threshold", type=float, default=0.10,
+        help="relative slowdown reported as a regression (default 0.10)",
+    )
+    args = parser.parse_args(argv)
+
+    for suite in args.suites:
+        if suite not in SUITES:
+            parser.error(f"unknown suite: {suite}")
+    for engine in args.engines:
+        if engine not in ENGINES:
+            parser.error(f"unknown engine: {engine}")
+    if args.sizes is None:
+        args.sizes = list(QUICK_SIZES if args.quick else SIZES)
+    if args.min_time is None:
+        args.min_time = 0.1 if args.quick else 0.5
+    return args
+
+
+def main(argv=None) -> int:
+    args = parse_args(argv)
+    if args.compare:
+        with open(args.compare[0], encoding="utf-8") as f:
+            baseline = json.load(f)
+        with open(args.compare[1], encoding="utf-8") as f:
+            current = json.load(f)
+        rows = compare(baseline, current, args.threshold)
+        _print_comparison(rows, args.threshold)
+        return 1 if any(row["regression"] for row in rows) else 0
+
+    densities = DENSITIES[1:2] if args.quick else DENSITIES
+    results = []
+    if "step" in args.suites:
+        results += bench_step(args.engines, args.sizes, densities, args.min_time, _log)
+    if "render" in args.suites:
+        results += bench_render(args.min_time, _log)
+    if "memory" in args.suites:
+        results += bench_memory(args.engines, args.sizes, _log)
+    if "startup" in args.suites:
+        results += bench_startup(2 if args.quick else STARTUP_RUNS, _log)
+    report = {"metadata": _metadata(), "results": results}
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+            f.write("\n")
+    else:
+        json.dump(report, sys.stdout, indent=2)
+        print()
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)
+        rows = compare(baseline, report, args.threshold)
+        # Tabela na stderr, gdy JSON idzie na stdout
+        _print_comparison(rows, args.threshold, None if args.output else sys.stderr)
+        return 1 if any(row["regression"] for row in rows) else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,416 @@
+# bitgrid.py
+
+import numpy as np
+
+from boundary import check_boundary, wrap_cell
+from cycles import xor_cells, xor_keys
+from rules import CONWAY, parse_rule
+from soup import fill_rect, random_cells
+
+WORD_BITS = 64
+
+_ONE = np.uint64(1)
+_HIGH_SHIFT = np.uint64(WORD_BITS - 1)
+# Liczba niezerowych słów rozpakowywanych naraz przy liczeniu haszu
+_HASH_STRIPE_WORDS = 1 << 10
+
+# Tablica popcount dla pojedynczych bajtów (gdy brak np.bitwise_count)
+_POPCOUNT8 = np.array([bin(i).count("1") for i in range(256)], dtype=np.uint8)
+
+
+def pack_rows(rows: np.ndarray, words_per_row: int) -> np.ndarray:
+    """
+    Pakuje wiersze komórek (0/1) do słów uint64.
+    Kolumna c trafia do słowa c // 64, bitu c % 64 (od najmłodszego).
+    """
+    packed = np.packbits(rows.astype(bool, copy=False), axis=1, bitorder="little")
+    out = np.zeros((rows.shape[0], words_per_row * 8), dtype=np.uint8)
+    out[:, :packed.shape[1]] = packed
+    return out.view("<u8").astype(np.uint64, copy=False)
+
+
+def unpack_rows(words: np.ndarray, cols: int) -> np.ndarray:
+    """Rozpakowuje słowa uint64 z powrotem do wierszy komórek uint8 (0/1)."""
+    as_bytes = np.ascontiguousarray(words).astype("<u8", copy=False).view(np.uint8)
+    bits = np.unpackbits(as_bytes, axis=1, bitorder="little")
+    return bits[:, :cols]
+
+
+def popcount(words: np.ndarray) -> int:
+    """Liczy ustawione bity w tablicy słów."""
+    if hasattr(np, "bitwise_count"):
+        return int(np.bitwise_count(words).sum(dtype=np.int64))
+    as_bytes = np.ascontiguousarray(words).view(np.uint8)
+    return int(_POPCOUNT8[as_bytes].sum(dtype=np.int64))
+
+
+def _west(x: np.ndarray) -> np.ndarray:
+    """Bit c wyniku = komórka c - 1 (przeniesienie przez granice słów)."""
+    out = x << _ONE
+    out[:, 1:] |= x[:, :-1] >> _HIGH_SHIFT
+    return out
+
+
+def _east(x: np.ndarray) -> np.ndarray:
+    """Bit c wyniku = komórka c + 1 (przeniesienie przez granice słów)."""
+    out = x >> _ONE
+    out[:, :-1] |= x[:, 1:] << _HIGH_SHIFT
+    return out
+
+
+def _unpack_words(words: np.ndarray) -> np.ndarray:
+    """Bity jednowymiarowej tablicy słów jako tablica bool (64 na słowo, od najmłodszego)."""
+    as_bytes = words.astype("<u8", copy=False).view(np.uint8)
+    return np.unpackbits(as_bytes, bitorder="little").view(bool)
+
+
+def _set_bits(words: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """(wiersze, kolumny) ustawionych bitów – rozpakowuje tylko niezerowe słowa."""
+    index = np.flatnonzero(words)
+    bits = np.flatnonzero(_unpack_words(words.reshape(-1)[index]))
+    word_rows, word_cols = np.divmod(index[bits // WORD_BITS], words.shape[1])
+    return word_rows, word_cols * WORD_BITS + bits % WORD_BITS
+
+
+def _xor_set_bits(words: np.ndarray, cols: int) -> int:
+    """
+    XOR kluczy Zobrista komórek ustawionych w tablicy słów (rows, words_per_row).
+    Rozpakowuje tylko niezerowe słowa, pasami po _HASH_STRIPE_WORDS –
+    pamięć pomocnicza nie rośnie z liczbą zmian.
+    """
+    flat = words.reshape(-1)
+    nonzero = np.flatnonzero(flat)
+    result = 0
+    for start in range(0, nonzero.size, _HASH_STRIPE_WORDS):
+        index = nonzero[start:start + _HASH_STRIPE_WORDS]
+        # Indeks pierwszej komórki każdego słowa – arytmetyka na słowach, nie na bitach
+        word_rows, word_cols = np.divmod(index, words.shape[1])
+        first = word_rows * cols + word_cols * WORD_BITS
+        bits = np.flatnonzero(_unpack_words(flat[index]))
+        result ^= xor_keys(first[bits // WORD_BITS] + bits % WORD_BITS)
+    return result
+
+
+class BitPackedGrid:
+    """
+    Plansza Game of Life upakowana po 64 komórki w słowie uint64.
+
+    Zajmuje ~1 bit na komórkę zamiast bajtu, a kolejne pokolenie
+    liczone jest logiką sumatorów na całych słowach (SWAR), a reguła –
+    zminimalizowaną sumą iloczynów bitów licznika (Rule.implicants).
+    Populacja i statystyki pokolenia są liczone popcountem przyrostowo.
+    Warunek brzegowy (boundary) to tylko inne bity wstawiane na krawędziach.
+    """
+
+    def __init__(self, cols, rows, rule=CONWAY, boundary="dead"):
+        self.cols = cols
+        self.rows = rows
+        self.rule = parse_rule(rule)
+        self.boundary = check_boundary(boundary)
+        self.words_per_row = (cols + WORD_BITS - 1) // WORD_BITS
+        self.words = np.zeros((rows, self.words_per_row), dtype=np.uint64)
+        self.generation = 0
+
+        self.population = 0
+        self.births = 0
+        self.deaths = 0
+        self.changed_cells = 0
+        self._board_hash = 0
+        # XOR słów zmienionych od ostatniego odczytu board_hash (None – brak zmian)
+        self._pending_hash = None
+        self._bbox = None
+        # Wywoływane z planszą po każdym kroku (np. Recorder.record)
+        self.step_listeners = []
+
+        # Maska ostatniego słowa w wierszu – bity poza planszą zawsze 0
+        tail = cols % WORD_BITS
+        self._tail_mask = np.uint64((1 << tail) - 1 if tail else (1 << WORD_BITS) - 1)
+
+    def _reset_stats(self):
+        """Przelicza populację i hasz po zmianie całej planszy naraz."""
+        self.population = popcount(self.words)
+        # Cała plansza: szybciej rozpakować pasami, niż szukać bitów w słowach
+        self._board_hash = 0
+        self._pending_hash = None
+        stripe = max(1, (1 << 20) // max(self.cols, 1))
+        for r0 in range(0, self.rows, stripe):
+            cells = unpack_rows(self.words[r0:r0 + stripe], self.cols)
+            self._board_hash ^= xor_cells(cells, r0 * self.cols)
+        self.births = self.deaths = self.changed_cells = 0
+        self._bbox = None
+
+    def set_rule(self, rule):
+        """Zmienia regułę (obiekt Rule albo tekst B/S)."""
+        self.rule = parse_rule(rule)
+
+    def set_boundary(self, boundary):
+        """Zmienia warunek brzegowy (nazwa z boundary.BOUNDARIES)."""
+        self.boundary = check_boundary(boundary)
+
+    def _restore_stats(self, population, board_hash):
+        """Ustawia populację i hasz znane z zewnątrz (np. z nagłówka migawki)."""
+        self.population = population
+        self._board_hash = board_hash
+        self._pending_hash = None
+        self.births = self.deaths = self.changed_cells = 0
+        self._bbox = None
+
+    @property
+    def board_hash(self) -> int:
+        """
+        Hasz Zobrista planszy. Zmiany z kroków są doliczane dopiero przy
+        odczycie – krok bez CycleDetector ani nagrywania nie płaci za hasz.
+        """
+        if self._pending_hash is not None:
+            self._board_hash ^= _xor_set_bits(self._pending_hash, self.cols)
+            self._pending_hash = None
+        return self._board_hash
+
+    def _record_step(self, births, deaths, changed_words):
+        """
+        Aktualizuje liczniki po kroku symulacji i powiadamia słuchaczy.
+        changed_words (stare ^ nowe słowa) trafia do haszu przy odczycie board_hash.
+        """
+        self.births = births
+        self.deaths = deaths
+        self.changed_cells = births + deaths
+        self.population += births - deaths
+        if self.changed_cells:
+            self._bbox = None
+            if self._pending_hash is None:
+                self._pending_hash = changed_words
+            else:
+                self._pending_hash ^= changed_words
+        for listener in self.step_listeners:
+            listener(self)
+
+    def clear(self):
+        """Czyści siatkę (wszystkie komórki martwe)."""
+        self.words.fill(0)
+        self.generation = 0
+        self._reset_stats()
+
+    def randomize(self, probability=0.25, seed=None, rect=None, symmetry="C1"):
+        """
+        Losowo wypełnia siatkę żywymi komórkami (soup.random_cells).
+        seed to ziarno albo np.random.Generator; rect = (c0, r0, c1, r1)
+        ogranicza losowanie do prostokąta, reszta planszy zostaje bez zmian.
+        """
+        c0, r0, c1, r1 = fill_rect(rect, self.cols, self.rows)
+        rng = np.random.default_rng(seed)
+        # Pasami, żeby nie trzymać w pamięci całej planszy bajt na komórkę.
+        # Liczba wierszy w pasie podzielna przez 4 – strumień losowań jest
+        # wtedy taki sam jak przy losowaniu całości naraz. Symetria wiąże
+        # odległe wiersze, więc wtedy losujemy cały prostokąt.
+        if symmetry == "C1":
+            stripe = max(4, ((1 << 22) // max(c1 - c0, 1)) & ~3)
+        else:
+            stripe = max(r1 - r0, 1)
+        whole_rows = c0 == 0 and c1 == self.cols
+        for a in range(r0, r1, stripe):
+            b = min(a + stripe, r1)
+            if whole_rows:
+                cells = random_cells(b - a, self.cols, probability, rng, symmetry)
+            else:
+                cells = unpack_rows(self.words[a:b], self.cols)
+                cells[:, c0:c1] = random_cells(b - a, c1 - c0, probability, rng, symmetry)
+            self.words[a:b] = pack_rows(cells, self.words_per_row)
+        self.generation = 0
+        self._reset_stats()
+
+    def is_alive(self, col, row) -> bool:
+        """Zwraca True, jeśli komórka jest żywa."""
+        word = int(self.words[row, col // WORD_BITS])
+        return (word >> (col % WORD_BITS)) & 1 == 1
+
+    def toggle_cell(self, col, row):
+        """Przełącza stan komórki (żywa/martwa)."""
+        if 0 <= row < self.rows and 0 <= col < self.cols:
+            self.words[row, col // WORD_BITS] ^= _ONE << np.uint64(col % WORD_BITS)
+            self.population += 1 if self.is_alive(col, row) else -1
+            self._board_hash ^= xor_keys(np.array([row * self.cols + col]))
+            self._bbox = None
+
+    def count_alive_neighbors(self, col, row):
+        """Liczy liczbę żywych sąsiadów wokół komórki (z warunkiem brzegowym)."""
+        count = 0
+        for dr in (-1, 0, 1):
+            for dc in (-1, 0, 1):
+                if dr == 0 and dc == 0:
+                    continue
+                cell = wrap_cell(row + dr, col + dc, self.rows, self.cols, self.boundary)
+                if cell is not None:
+                    count += self.is_alive(cell[1], cell[0])
+        return count
+
+    def step(self) -> bool:
+        """
+        Oblicza kolejne pokolenie według reguły planszy.
+        Zwraca True, jeśli stan planszy się zmienił, inaczej False.
+        """
+        w = self.words
+        boundary = self.boundary
+
+        # Suma poziomych trójek (lewy + środek + prawy) jako liczba 2-bitowa
+        left, right = _west(w), _east(w)
+        if boundary != "dead":
+            self._wrap_columns(w, left, right)
+        lr_xor = left ^ right
+        row0 = lr_xor ^ w
+        row1 = (left & right) | (w & lr_xor)
+
+        # Wiersz powyżej i poniżej; za krawędzią według warunku brzegowego
+        above0 = np.zeros_like(w)
+        above1 = np.zeros_like(w)
+        above0[1:], above1[1:] = row0[:-1], row1[:-1]
+        below0 = np.zeros_like(w)
+        below1 = np.zeros_like(w)
+        below0[:-1], below1[:-1] = row0[1:], row1[1:]
+        if boundary != "dead":
+            top, bottom = (0, -1) if boundary == "mirror" else (-1, 0)
+            above0[0], above1[0] = self._edge_row(row0[top]), self._edge_row(row1[top])
+            below0[-1], below1[-1] = self._edge_row(row0[bottom]), self._edge_row(row1[bottom])
+
+        # Środkowy wiersz: tylko lewy i prawy sąsiad
+        mid0 = lr_xor
+        mid1 = left & right
+
+        # Sumator: bity wagi 1, 2 i 4 liczby sąsiadów
+        ab_xor = above0 ^ mid0
+        sum0 = ab_xor ^ below0
+        carry = (above0 & mid0) | (below0 & ab_xor)
+
+        p = above1 ^ mid1
+        q = above1 & mid1
+        r = below1 ^ carry
+        t = below1 & carry
+        sum1 = p ^ r
+        sum2 = q ^ t ^ (p & r)
+
+        # Reguła jako suma iloczynów zmiennych SWAR_VARS; bit wagi 8
+        # (dokładnie 8 sąsiadów) liczymy tylko, gdy reguła go używa
+        variables = [w, sum0, sum1, sum2, None]
+        if any(var == 4 for implicant in self.rule.implicants for var, _ in implicant):
+            variables[4] = q & t
+        new_words = self._apply_rule(variables)
+        new_words[:, -1] &= self._tail_mask
+
+        changed = new_words ^ w
+        births = popcount(new_words & changed)
+        deaths = popcount(w & changed)
+
+        self.words = new_words
+        self.generation += 1
+        self._record_step(births, deaths, changed)
+        return self.changed_cells > 0
+
+    def _wrap_columns(self, w, left, right):
+        """Wstawia do przesunięć _west/_east komórki zza lewej i prawej krawędzi."""
+        high = np.uint64((self.cols - 1) % WORD_BITS)
+        first = w[:, 0] & _ONE
+        last = (w[:, -1] >> high) & _ONE
+        if self.boundary == "mirror":
+            first, last = last, first
+        # Za lewą krawędzią: ostatnia kolumna (torus, klein) albo pierwsza (mirror)
+        left[:, 0] |= last
+        right[:, -1] |= first << high
+
+    def _edge_row(self, row: np.ndarray) -> np.ndarray:
+        """Wiersz sum poziomych wstawiany za górną/dolną krawędzią."""
+        if self.boundary != "klein":
+            return row
+        # Butelka Kleina: wiersz z przeciwległej krawędzi z odwróconymi kolumnami
+        cells = unpack_rows(row[None, :], self.cols)[:, ::-1]
+        return pack_rows(cells, self.words_per_row)[0]
+
+    def _apply_rule(self, variables) -> np.ndarray:
+        """
+        Oblicza regułę na słowach: (suma Rule.swar_terms) & Rule.swar_common.
+        Negacje zmiennych liczone są najwyżej raz.
+        """
+        rule = self.rule
+        if not rule.implicants:
+            return np.zeros_like(variables[0])
+
+        inverted = {}
+
+        def literal(var, positive):
+            if positive:
+                return variables[var]
+            if var not in inverted:
+                inverted[var] = ~variables[var]
+            return inverted[var]
+
+        result = None
+        for implicant in rule.swar_terms:
+            term = None
+            for var, positive in implicant:
+                operand = literal(var, positive)
+                term = operand if term is None else term & operand
+            result = term if result is None else result | term
+        for var, positive in rule.swar_common:
+            operand = literal(var, positive)
+            result = operand if result is None else result & operand
+        if result is None:
+            return np.full_like(variables[0], np.iinfo(np.uint64).max)
+        # Wynik nie może współdzielić pamięci ze zmiennymi (maska ogona in-place)
+        if any(result is v for v in variables) or any(result is v for v in inverted.values()):
+            result = result.copy()
+        return result
+
+    def alive_count(self):
+        """Zwraca liczbę żywych komórek (licznik, bez skanowania planszy)."""
+        return self.population
+
+    def bounding_box(self) -> tuple[int, int, int, int] | None:
+        """
+        Zwraca (c0, r0, c1, r1) – prostokąt żywych komórek (c1, r1 wyłącznie)
+        albo None dla pustej planszy. Wynik jest pamiętany do następnej zmiany.
+        """
+        if self._bbox is None and self.population:
+            rows = np.flatnonzero(self.words.any(axis=1))
+            # OR wszystkich wierszy: jeden wiersz słów z zajętymi kolumnami
+            used = unpack_rows(np.bitwise_or.reduce(self.words, axis=0)[None, :], self.cols)[0]
+            cols = np.flatnonzero(used)
+            self._bbox = (int(cols[0]), int(rows[0]), int(cols[-1]) + 1, int(rows[-1]) + 1)
+        return self._bbox if self.population else None
+
+    def to_array(self) -> np.ndarray:
+        """Rozpakowuje planszę do tablicy uint8 (rows, cols)."""
+        return unpack_rows(self.words, self.cols)
+
+    def view(self, r0, r1, c0, c1) -> np.ndarray:
+        """
+        Fragment planszy [r0:r1, c0:c1] jako tablica uint8 – rozpakowuje
+        tylko słowa z tego zakresu (np. widoku kamery), nie całą planszę.
+        """
+        c1 = max(c0, min(c1, self.cols))
+        w0, w1 = c0 // WORD_BITS, -(-c1 // WORD_BITS)
+        cells = unpack_rows(self.words[r0:r1, w0:w1], (w1 - w0) * WORD_BITS)
+        return cells[:, c0 - w0 * WORD_BITS:c1 - w0 * WORD_BITS]
+
+    def load_array(self, cells: np.ndarray):
+        """Wczytuje całą planszę z tablicy (rows, cols), pakując ją pasami."""
+        stripe = max(1, (1 << 22) // max(self.cols, 1))
+        for r0 in range(0, self.rows, stripe):
+            r1 = min(r0 + stripe, self.rows)
+            self.words[r0:r1] = pack_rows(cells[r0:r1] != 0, self.words_per_row)
+        self._reset_stats()
+
+    def load_packed(self, words: np.ndarray, population=None, board_hash=None):
+        """
+        Przejmuje tablicę słów bez kopiowania (np. np.memmap migawki).
+        Bez population i board_hash liczy je od nowa (czyta całą planszę).
+        """
+        self.words = words
+        if population is None or board_hash is None:
+            self._reset_stats()
+        else:
+            self._restore_stats(population, board_hash)
+
+    def alive_cells(self) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Zwraca (wiersze, kolumny) żywych komórek.
+        Rozpakowuje tylko niezerowe słowa, więc koszt zależy od populacji.
+        """
+        return _set_bits(self.words)
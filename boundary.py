@@ -0,0 +1,135 @@
+# boundary.py
+"""
+Warunki brzegowe planszy – co leży "za krawędzią":
+
+- "dead"   – martwe komórki (plansza ograniczona),
+- "torus"  – przeciwległa krawędź (zawijanie w obu osiach),
+- "mirror" – odbicie: komórka za krawędzią to komórka brzegowa,
+- "klein"  – butelka Kleina: zawijanie w poziomie, a w pionie
+             zawijanie z odwróceniem kolumn (c -> cols - 1 - c).
+
+Silniki nie sprawdzają zakresów dla każdej komórki: budują okno
+z jednokomórkową ramką (halo) – przez wypełnienie ramki gotowego bufora
+(fill_halo) albo przez tablice indeksów (halo_window).
+"""
+
+import numpy as np
+
+BOUNDARIES = ("dead", "torus", "mirror", "klein")
+
+
+def check_boundary(boundary) -> str:
+    """Zwraca nazwę warunku brzegowego albo zgłasza ValueError."""
+    if boundary not in BOUNDARIES:
+        raise ValueError(f"Unknown boundary: {boundary!r} (expected one of {BOUNDARIES})")
+    return boundary
+
+
+def fill_halo(padded: np.ndarray, boundary):
+    """
+    Wypełnia ramkę bufora (rows + 2, cols + 2), którego wnętrze zawiera
+    już planszę. Kopiuje tylko dwa wiersze i dwie kolumny.
+    """
+    if boundary == "dead":
+        padded[0] = padded[-1] = 0
+        padded[:, 0] = padded[:, -1] = 0
+    elif boundary == "torus":
+        padded[0, 1:-1] = padded[-2, 1:-1]
+        padded[-1, 1:-1] = padded[1, 1:-1]
+        padded[:, 0] = padded[:, -2]
+        padded[:, -1] = padded[:, 1]
+    elif boundary == "mirror":
+        padded[0, 1:-1] = padded[1, 1:-1]
+        padded[-1, 1:-1] = padded[-2, 1:-1]
+        padded[:, 0] = padded[:, 1]
+        padded[:, -1] = padded[:, -2]
+    elif boundary == "klein":
+        # Najpierw kolumny, potem odwrócone wiersze razem z rogami
+        padded[1:-1, 0] = padded[1:-1, -2]
+        padded[1:-1, -1] = padded[1:-1, 1]
+        padded[0] = padded[-2, ::-1]
+        padded[-1] = padded[1, ::-1]
+    else:
+        check_boundary(boundary)
+
+
+def halo_window(cells: np.ndarray, r0, r1, c0, c1, boundary) -> np.ndarray:
+    """
+    Wycinek [r0, r1) x [c0, c1) planszy z ramką 1 komórki (kształt
+    (r1 - r0 + 2, c1 - c0 + 2)). Wnętrze planszy to zwykły widok bez
+    kopiowania; przy krawędzi ramka pochodzi z tablic indeksów.
+    """
+    rows, cols = cells.shape
+    if r0 > 0 and c0 > 0 and r1 < rows and c1 < cols:
+        return cells[r0 - 1:r1 + 1, c0 - 1:c1 + 1]
+
+    if boundary == "dead":
+        wr0, wr1 = max(r0 - 1, 0), min(r1 + 1, rows)
+        wc0, wc1 = max(c0 - 1, 0), min(c1 + 1, cols)
+        pad = (
+            (wr0 - (r0 - 1), (r1 + 1) - wr1),
+            (wc0 - (c0 - 1), (c1 + 1) - wc1),
+        )
+        return np.pad(cells[wr0:wr1, wc0:wc1], pad)
+
+    r = np.arange(r0 - 1, r1 + 1)
+    c = np.arange(c0 - 1, c1 + 1)
+    if boundary == "mirror":
+        return cells[np.ix_(r.clip(0, rows - 1), c.clip(0, cols - 1))]
+    if boundary == "torus":
+        return cells[np.ix_(r % rows, c % cols)]
+    if boundary == "klein":
+        window = cells[np.ix_(r % rows, c % cols)]
+        outside = (r < 0) | (r >= rows)
+        if outside.any():
+            window[outside] = cells[np.ix_(r[outside] % rows, (cols - 1 - c) % cols)]
+        return window
+    check_boundary(boundary)
+
+
+def wrap_ranges(start, stop, size) -> list[tuple[int, int, bool]]:
+    """
+    Dzieli zakres [start, stop), wystający najwyżej o size, na zakresy
+    (a, b, zawinięty) w [0, size).
+    """
+    ranges = [(max(start, 0), min(stop, size), False)]
+    if start < 0:
+        ranges.append((size + start, size, True))
+    if stop > size:
+        ranges.append((0, stop - size, True))
+    return [(a, b, wrapped) for a, b, wrapped in ranges if a < b]
+
+
+def affected_rects(r0, r1, c0, c1, rows, cols, boundary) -> list[tuple[int, int, int, int]]:
+    """
+    Prostokąty planszy (r0, r1, c0, c1), na które wpływają komórki
+    prostokąta [r0, r1) x [c0, c1) w następnym pokoleniu – prostokąt
+    powiększony o 1 komórkę i przeniesiony przez krawędzie.
+    """
+    r0, r1, c0, c1 = r0 - 1, r1 + 1, c0 - 1, c1 + 1
+    if boundary in ("dead", "mirror"):
+        # Odbicie wskazuje na komórki brzegowe, które i tak są w prostokącie
+        return [(max(r0, 0), min(r1, rows), max(c0, 0), min(c1, cols))]
+
+    rects = []
+    for a, b, wrapped in wrap_ranges(r0, r1, rows):
+        if boundary == "klein" and wrapped:
+            # Wiersze przeniesione przez górną/dolną krawędź mają odwrócone kolumny
+            col_ranges = wrap_ranges(cols - c1, cols - c0, cols)
+        else:
+            col_ranges = wrap_ranges(c0, c1, cols)
+        rects.extend((a, b, ca, cb) for ca, cb, _ in col_ranges)
+    return rects
+
+
+def wrap_cell(row, col, rows, cols, boundary) -> tuple[int, int] | None:
+    """Komórka planszy odpowiadająca (row, col) sprzed krawędzi; None – martwa."""
+    if boundary == "dead":
+        if 0 <= row < rows and 0 <= col < cols:
+            return row, col
+        return None
+    if boundary == "mirror":
+        return min(max(row, 0), rows - 1), min(max(col, 0), cols - 1)
+    if boundary == "klein" and not 0 <= row < rows:
+        col = cols - 1 - col
+    return row % rows, col % cols
@@ -0,0 +1,115 @@
+import math
+
+# Dostępne powiększenia w pikselach na komórkę.
+# Poniżej 1 jedna kratka ekranu zbiera 1 / zoom komórek (2, 4, 8, 16).
+ZOOM_LEVELS = (1 / 16, 1 / 8, 1 / 4, 1 / 2, 1, 2, 3, 5, 10, 20, 40)
+
+
+class Camera:
+    """
+    Widok (viewport) na planszę dowolnego rozmiaru.
+
+    x, y to współrzędne komórki w lewym górnym rogu widoku, zoom to liczba
+    pikseli na komórkę (wartość z ZOOM_LEVELS). Renderer rysuje tylko to,
+    co mieści się w widoku, a kliknięcia są mapowane przez screen_to_cell.
+    """
+
+    def __init__(self, view_size: tuple[int, int], zoom: float, board_size: tuple[int, int]):
+        self.view_width, self.view_height = view_size
+        self.board_cols, self.board_rows = board_size
+        self.zoom = min(ZOOM_LEVELS, key=lambda z: abs(z - zoom))
+        self.x = 0.0
+        self.y = 0.0
+
+    # ----------------- PARAMETRY ----------------- #
+
+    @property
+    def cell_pixels(self) -> int:
+        """Rozmiar komórki w pikselach (co najmniej 1)."""
+        return max(1, int(self.zoom))
+
+    @property
+    def cells_per_pixel(self) -> int:
+        """Ile komórek przypada na piksel w jednym wymiarze (co najmniej 1)."""
+        return max(1, round(1 / self.zoom))
+
+    @property
+    def origin(self) -> tuple[int, int]:
+        """Całkowite współrzędne komórki w lewym górnym rogu widoku."""
+        return math.floor(self.x), math.floor(self.y)
+
+    def state(self) -> tuple[int, int, float]:
+        """Klucz stanu kamery – zmiana oznacza pełne przerysowanie."""
+        return (*self.origin, self.zoom)
+
+    def view_cells(self) -> tuple[int, int]:
+        """Liczba komórek mieszczących się w widoku (kolumny, wiersze)."""
+        if self.zoom >= 1:
+            size = self.cell_pixels
+            return -(-self.view_width // size), -(-self.view_height // size)
+        k = self.cells_per_pixel
+        return self.view_width * k, self.view_height * k
+
+    def visible_range(self) -> tuple[int, int, int, int]:
+        """Zakres widocznych komórek planszy: (c0, c1, r0, r1), przycięty do planszy."""
+        ox, oy = self.origin
+        width, height = self.view_cells()
+        c0, r0 = max(ox, 0), max(oy, 0)
+        c1 = min(ox + width, self.board_cols)
+        r1 = min(oy + height, self.board_rows)
+        return c0, max(c0, c1), r0, max(r0, r1)
+
+    # ----------------- TRANSFORMACJE ----------------- #
+
+    def screen_to_cell(self, px: int, py: int) -> tuple[int, int]:
+        """Mapuje piksel widoku na (kolumnę, wiersz) planszy."""
+        ox, oy = self.origin
+        if self.zoom >= 1:
+            size = self.cell_pixels
+            return ox + px // size, oy + py // size
+        k = self.cells_per_pixel
+        return ox + px * k, oy + py * k
+
+    def cell_to_screen(self, col: int, row: int) -> tuple[int, int]:
+        """Mapuje komórkę na piksel widoku (lewy górny róg komórki)."""
+        ox, oy = self.origin
+        if self.zoom >= 1:
+            size = self.cell_pixels
+            return (col - ox) * size, (row - oy) * size
+        k = self.cells_per_pixel
+        return (col - ox) // k, (row - oy) // k
+
+    # ----------------- STEROWANIE ----------------- #
+
+    def pan(self, dx_pixels: float, dy_pixels: float):
+        """Przesuwa widok o podaną liczbę pikseli (jak przeciąganie myszą)."""
+        self.x -= dx_pixels / self.zoom
+        self.y -= dy_pixels / self.zoom
+        self._clamp()
+
+    def pan_cells(self, dcols: float, drows: float):
+        """Przesuwa widok o podaną liczbę komórek."""
+        self.x += dcols
+        self.y += drows
+        self._clamp()
+
+    def zoom_at(self, direction: int, px: int, py: int):
+        """
+        Zmienia powiększenie o jeden poziom (direction = +1 / -1),
+        zachowując komórkę pod kursorem w tym samym miejscu ekranu.
+        """
+        index = ZOOM_LEVELS.index(self.zoom) + direction
+        if not 0 <= index < len(ZOOM_LEVELS):
+            return
+        cell_x = self.x + px / self.zoom
+        cell_y = self.y + py / self.zoom
+        self.zoom = ZOOM_LEVELS[index]
+        self.x = cell_x - px / self.zoom
+        self.y = cell_y - py / self.zoom
+        self._clamp()
+
+    def _clamp(self):
+        """Pilnuje, żeby choć fragment planszy był w widoku."""
+        width, height = self.view_cells()
+        self.x = min(max(self.x, 1 - width), self.board_cols - 1)
+        self.y = min(max(self.y, 1 - height), self.board_rows - 1)
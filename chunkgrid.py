@@ -0,0 +1,145 @@
+# chunkgrid.py
+
+import numpy as np
+
+from boundary import affected_rects, halo_window
+from grid import CellGrid, count_changes, next_state
+from rules import CONWAY
+from soup import fill_rect
+
+# Bok kwadratowego fragmentu (chunka) planszy w komórkach
+CHUNK_SIZE = 32
+
+
+class ChunkedGrid(CellGrid):
+    """
+    Plansza dzielona na fragmenty CHUNK_SIZE x CHUNK_SIZE.
+
+    W każdym pokoleniu przeliczane są tylko fragmenty aktywne, czyli te,
+    w których (lub obok których) coś zmieniło się w poprzednim pokoleniu.
+    Uśpione fragmenty są pomijane, więc koszt kroku zależy od aktywności,
+    a nie od powierzchni planszy.
+    """
+
+    def __init__(self, cols, rows, chunk_size=CHUNK_SIZE, rule=CONWAY, boundary="dead"):
+        super().__init__(cols, rows, rule, boundary)
+        self.chunk_size = chunk_size
+        self.chunk_cols = (cols + chunk_size - 1) // chunk_size
+        self.chunk_rows = (rows + chunk_size - 1) // chunk_size
+        self.active_chunks = set()
+        if 0 in self.rule.birth:
+            # B0: pusta plansza zmienia się już w pierwszym kroku
+            self._wake_all()
+
+    def clear(self):
+        """Czyści siatkę (wszystkie komórki martwe)."""
+        super().clear()
+        self.active_chunks.clear()
+        if 0 in self.rule.birth:
+            # B0: pusta plansza też się zmienia
+            self._wake_all()
+
+    def set_rule(self, rule):
+        """Zmienia regułę i budzi wszystkie fragmenty."""
+        super().set_rule(rule)
+        self._wake_all()
+
+    def set_boundary(self, boundary):
+        """Zmienia warunek brzegowy i budzi wszystkie fragmenty."""
+        super().set_boundary(boundary)
+        self._wake_all()
+
+    def randomize(self, probability=0.25, seed=None, rect=None, symmetry="C1"):
+        """Losowo wypełnia siatkę (albo prostokąt rect) i budzi zmienione fragmenty."""
+        super().randomize(probability, seed, rect, symmetry)
+        if rect is None:
+            self._wake_all()
+        else:
+            c0, r0, c1, r1 = fill_rect(rect, self.cols, self.rows)
+            if r1 > r0 and c1 > c0:
+                self._wake_affected(r0, r1, c0, c1, self.active_chunks)
+
+    def load_array(self, cells: np.ndarray):
+        """Wczytuje całą planszę i budzi wszystkie fragmenty."""
+        super().load_array(cells)
+        self._wake_all()
+
+    def load_packed(self, words: np.ndarray, population=None, board_hash=None):
+        """Wczytuje planszę z upakowanych słów i budzi wszystkie fragmenty."""
+        super().load_packed(words, population, board_hash)
+        self._wake_all()
+
+    def _wake_all(self):
+        self.active_chunks = {
+            (cr, cc)
+            for cr in range(self.chunk_rows)
+            for cc in range(self.chunk_cols)
+        }
+
+    def toggle_cell(self, col, row):
+        """Przełącza stan komórki (żywa/martwa) i budzi sąsiednie fragmenty."""
+        if 0 <= row < self.rows and 0 <= col < self.cols:
+            super().toggle_cell(col, row)
+            self._wake_cell(col, row)
+
+    def _wake_cell(self, col, row):
+        """Oznacza jako aktywne fragmenty, na które wpływa komórka."""
+        self._wake_affected(row, row + 1, col, col + 1, self.active_chunks)
+
+    def _wake_affected(self, r0, r1, c0, c1, active):
+        """
+        Dodaje do active fragmenty, na które wpływa prostokąt komórek
+        [r0, r1) x [c0, c1) – także przez krawędź (torus, klein).
+        """
+        size = self.chunk_size
+        for wr0, wr1, wc0, wc1 in affected_rects(r0, r1, c0, c1, self.rows, self.cols, self.boundary):
+            for cr in range(wr0 // size, (wr1 - 1) // size + 1):
+                for cc in range(wc0 // size, (wc1 - 1) // size + 1):
+                    active.add((cr, cc))
+
+    def _chunk_bounds(self, cr, cc):
+        size = self.chunk_size
+        r0, c0 = cr * size, cc * size
+        return r0, min(r0 + size, self.rows), c0, min(c0 + size, self.cols)
+
+    def _window(self, r0, r1, c0, c1) -> np.ndarray:
+        """Wycinek planszy z ramką 1 komórki według warunku brzegowego."""
+        return halo_window(self.grid, r0, r1, c0, c1, self.boundary)
+
+    def step(self) -> bool:
+        """
+        Oblicza kolejne pokolenie, przeliczając tylko aktywne fragmenty.
+        Zwraca True, jeśli któryś fragment się zmienił, inaczej False.
+        """
+        # Najpierw liczymy wszystkie nowe fragmenty, dopiero potem zapisujemy,
+        # żeby sąsiednie fragmenty czytały stan z tego samego pokolenia
+        updates = []
+        births = deaths = hash_delta = 0
+        for cr, cc in self.active_chunks:
+            r0, r1, c0, c1 = self._chunk_bounds(cr, cc)
+            new_block = next_state(self._window(r0, r1, c0, c1), self.rule)
+            born, died, keys = count_changes(
+                self.grid[r0:r1, c0:c1], new_block, r0, c0, self.cols
+            )
+            if born or died:
+                updates.append(((cr, cc), new_block))
+                births += born
+                deaths += died
+                hash_delta ^= keys
+
+        dirty = set()
+        for (cr, cc), new_block in updates:
+            r0, r1, c0, c1 = self._chunk_bounds(cr, cc)
+            self.grid[r0:r1, c0:c1] = new_block
+            dirty.add((cr, cc))
+
+        # Następne pokolenie: zmienione fragmenty i ich sąsiedzi
+        active = set()
+        for cr, cc in dirty:
+            r0, r1, c0, c1 = self._chunk_bounds(cr, cc)
+            self._wake_affected(r0, r1, c0, c1, active)
+        self.active_chunks = active
+
+        self.generation += 1
+        self._record_step(births, deaths, hash_delta)
+        return bool(dirty)
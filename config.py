@@ -6,12 +6,74 @@ WINDOW_HEIGHT = 640
 # Wysokość paska HUD
 HUD_HEIGHT = 40
 
-# Rozmiar komórki
+# Rozmiar komórki (początkowe powiększenie kamery)
 CELL_SIZE = 20
 
+# Sposób rysowania komórek:
+# "pixels"  – małe komórki wpisywane wprost w piksele (surfarray),
+#             duże (mieszczące sprite) nadal sprite'ami
+# "sprites" – zawsze jeden kafelek na żywą komórkę
+RENDER_MODE = "pixels"
+
+# Rozmiar planszy w komórkach (None = tyle, ile mieści okno)
+BOARD_COLS = None
+BOARD_ROWS = None
+
+# Silnik planszy: "numpy", "bitpacked", "chunked" albo "parallel"
+GRID_ENGINE = "numpy"
+
+# Reguła początkowa w notacji B/S albo nazwa z rules.RULES (TAB w SETUP zmienia)
+RULE = "B3/S23"
+
+# Krawędzie planszy: "dead", "torus", "mirror" albo "klein" (B w SETUP zmienia)
+BOUNDARY = "dead"
+
+# Silnik "parallel": liczba procesów (None = liczba rdzeni)
+# i wysokość pasa w wierszach (None = automatycznie)
+PARALLEL_WORKERS = None
+PARALLEL_STRIPE_HEIGHT = None
+
+# Skok HashLife (klawisz J): liczba pokoleń i limit pamięci węzłów
+JUMP_GENERATIONS = 1024
+HASHLIFE_MAX_NODES = 1_000_000
+
+# Koniec gry: najdłuższy wykrywany okres cyklu planszy (1 = martwa natura)
+CYCLE_MAX_PERIOD = 64
+
+# Nagrywanie przebiegu (przewijanie klawiszami , i . w pauzie i po końcu gry).
+# RECORDINGS_DIR = None – plik tymczasowy usuwany po zakończeniu przebiegu,
+# ścieżka katalogu – nagrania zostają jako archiwum
+RECORD_RUNS = True
+RECORDINGS_DIR = None
+RECORD_KEYFRAME_INTERVAL = 256
+
+# Katalog wzorów (.rle, .cells, .mc): L wczytuje kolejny, S zapisuje planszę
+PATTERNS_DIR = "patterns"
+
+# Migawka planszy (F5 zapis, F9 wznowienie)
+SNAPSHOT_PATH = "checkpoint.golsnap"
+
 # FPS
 FPS = 60
 
+# Symulacja niezależna od klatek: budżet czasu na kroki w jednej klatce (ms)
+# i limit nadrabianych kroków na klatkę
+SIM_BUDGET_MS = 12
+MAX_STEPS_PER_FRAME = 8
+
+# Tryb TURBO: plansza rysowana co tyle pokoleń
+TURBO_RENDER_EVERY = 16
+
+# Symulacja w osobnym wątku (renderer dostaje ostatnie gotowe pokolenie)
+SIMULATION_THREAD = False
+
+# Pamięć podręczna wyrenderowanych napisów (liczba wpisów)
+TEXT_CACHE_SIZE = 128
+
+# Profiler (F3 nakładka, F4 eksport): próbek na fazę i katalog eksportu
+PROFILE_SAMPLES = 1024
+PROFILES_DIR = "profiles"
+
 # Kolory (RGB)
 COLOR_BG = (0, 0, 0)          # tło: czarne
 COLOR_GRID = (40, 40, 40)     # siatka: bardzo ciemna szarość
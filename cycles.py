@@ -0,0 +1,103 @@
+# cycles.py
+
+from collections import deque
+
+import numpy as np
+
+_GOLDEN = np.uint64(0x9E3779B97F4A7C15)
+_MIX1 = np.uint64(0xBF58476D1CE4E5B9)
+_MIX2 = np.uint64(0x94D049BB133111EB)
+_SHIFT30, _SHIFT27, _SHIFT31 = np.uint64(30), np.uint64(27), np.uint64(31)
+# Liczba komórek liczonych naraz w xor_keys i xor_cells
+_STRIPE = 1 << 16
+
+
+def cell_keys(indices: np.ndarray) -> np.ndarray:
+    """
+    Klucze Zobrista dla komórek o podanych indeksach (row * cols + col).
+
+    Zamiast tablicy losowych kluczy (8 bajtów na komórkę) klucz jest
+    liczony funkcją mieszającą splitmix64 – dowolny proces policzy ten
+    sam klucz dla tej samej komórki.
+    """
+    # astype zawsze kopiuje, więc dalej można liczyć w miejscu
+    z = indices.astype(np.uint64)
+    z += _GOLDEN
+    z ^= z >> _SHIFT30
+    z *= _MIX1
+    z ^= z >> _SHIFT27
+    z *= _MIX2
+    z ^= z >> _SHIFT31
+    return z
+
+
+def xor_keys(indices: np.ndarray) -> int:
+    """XOR kluczy Zobrista podanych komórek (0 dla pustego zbioru)."""
+    result = 0
+    # Pasami mieszczącymi się w cache – przy całej planszy kilka razy szybciej
+    for start in range(0, indices.size, _STRIPE):
+        result ^= int(np.bitwise_xor.reduce(cell_keys(indices[start:start + _STRIPE])))
+    return result
+
+
+def xor_cells(cells: np.ndarray, offset=0) -> int:
+    """
+    XOR kluczy Zobrista żywych komórek tablicy (rows, cols) z 0/1.
+    offset to indeks pierwszej komórki tablicy na planszy (dla pasów).
+    """
+    flat = cells.reshape(-1).view(bool) if cells.dtype == np.uint8 else cells.reshape(-1) != 0
+    result = 0
+    for start in range(0, flat.size, _STRIPE):
+        indices = np.flatnonzero(flat[start:start + _STRIPE])
+        if indices.size:
+            result ^= int(np.bitwise_xor.reduce(cell_keys(indices + (offset + start))))
+    return result
+
+
+class CycleDetector:
+    """
+    Wykrywa dokładne cykle planszy na podstawie historii haszy Zobrista.
+
+    Pamięta hasze z ostatnich max_period pokoleń. Gdy hasz się powtórzy,
+    ustawia period (okres cyklu, 1 = martwa natura) i cycle_start
+    (pokolenie, od którego plansza się powtarza).
+    """
+
+    def __init__(self, max_period=64):
+        self.max_period = max_period
+        self.history = deque()
+        self._seen = {}
+        self.period = None
+        self.cycle_start = None
+
+    def reset(self):
+        self.history.clear()
+        self._seen.clear()
+        self.period = None
+        self.cycle_start = None
+
+    def observe(self, generation, board_hash) -> bool:
+        """Dodaje stan planszy; zwraca True, jeśli właśnie wykryto cykl."""
+        previous = self._seen.get(board_hash)
+        if previous is not None:
+            self.period = generation - previous
+            self.cycle_start = previous
+            return True
+
+        self.history.append((generation, board_hash))
+        self._seen[board_hash] = generation
+        while len(self.history) > self.max_period:
+            _, old_hash = self.history.popleft()
+            del self._seen[old_hash]
+        return False
+
+    def step(self, grid) -> bool:
+        """
+        Krok planszy z kryterium końca gry (GameApp, headless, sweep):
+        przed pierwszym krokiem do historii trafia też stan startowy.
+        Zwraca True, gdy plansza właśnie weszła w cykl.
+        """
+        if not self.history:
+            self.observe(grid.generation, grid.board_hash)
+        grid.step()
+        return self.observe(grid.generation, grid.board_hash)
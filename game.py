@@ -1,4 +1,8 @@
+import os
 import sys
+import time
+from collections import deque
+
 import pygame
 from config import (
     WINDOW_WIDTH,
@@ -11,17 +15,55 @@ from config import (
     COLOR_CELL,
     HUD_HEIGHT,  # ← DODANE
     COLOR_HUD_BG,  # ← DODANE
+    GRID_ENGINE,
+    PARALLEL_WORKERS,
+    PARALLEL_STRIPE_HEIGHT,
+    SIM_BUDGET_MS,
+    MAX_STEPS_PER_FRAME,
+    TURBO_RENDER_EVERY,
+    SIMULATION_THREAD,
+    BOARD_COLS,
+    BOARD_ROWS,
+    RENDER_MODE,
+    JUMP_GENERATIONS,
+    HASHLIFE_MAX_NODES,
+    CYCLE_MAX_PERIOD,
+    RECORD_RUNS,
+    RECORDINGS_DIR,
+    RECORD_KEYFRAME_INTERVAL,
+    PATTERNS_DIR,
+    SNAPSHOT_PATH,
+    RULE,
+    BOUNDARY,
+    PROFILE_SAMPLES,
+    PROFILES_DIR,
+    TEXT_CACHE_SIZE,
 )
-from grid import CellGrid
+from assets import AssetRegistry
+from grid import create_grid
 from sound_manager import SoundManager
-from graphics import GraphicsManager
+from graphics import GraphicsManager, TextCache
+from renderer import BoardRenderer
+from camera import Camera
+from cycles import CycleDetector
+from rules import RULES
+from boundary import BOUNDARIES
+from scheduler import StepScheduler, SimulationThread
+
+# HashLife, nagrania, migawki, wzory i profiler są importowane dopiero
+# przy pierwszym użyciu – nie opóźniają startu
+
+# Stany, w których widać planszę
+BOARD_STATES = ("setup", "running", "paused", "game_over")
 
 
 class GameApp:
     """Główna klasa aplikacji."""
 
     def __init__(self):
-        pygame.init()
+        # Tylko ekran i czcionki – mikser startuje w tle (SoundManager)
+        pygame.display.init()
+        pygame.font.init()
         self.screen = pygame.display.set_mode((WINDOW_WIDTH, WINDOW_HEIGHT))
         pygame.display.set_caption("Game of Life - pygame")
         self.clock = pygame.time.Clock()
@@ -30,17 +72,41 @@ class GameApp:
         # ========== ZMIENIONE: Plansza bez paska HUD ========== #
         # Plansza zajmuje okno MINUS pasek HUD na dole
         self.game_height = WINDOW_HEIGHT - HUD_HEIGHT  # 600px na planszę
-        self.cols = WINDOW_WIDTH // CELL_SIZE
-        self.rows = self.game_height // CELL_SIZE  # ← używamy game_height!
+        # Domyślnie plansza wypełnia okno; BOARD_COLS/BOARD_ROWS pozwalają
+        # na dowolnie dużą planszę oglądaną przez kamerę
+        self.cols = BOARD_COLS or WINDOW_WIDTH // CELL_SIZE
+        self.rows = BOARD_ROWS or self.game_height // CELL_SIZE  # ← używamy game_height!
         # ====================================================== #
 
-        self.grid = CellGrid(self.cols, self.rows)
+        self.grid = create_grid(
+            self.cols, self.rows, GRID_ENGINE, rule=RULE, boundary=BOUNDARY,
+            **self._engine_options()
+        )
+
+        # Obrazy, dźwięki i czcionki wczytywane w tle; do tego czasu
+        # rysujemy z zastępczymi, a update() podmienia je, gdy dojdą
+        self.assets = AssetRegistry()
 
         # GraphicsManager dla planszy (bez HUD)
         self.graphics = GraphicsManager(
             (WINDOW_WIDTH, self.game_height),  # ← ZMIENIONE!
-            CELL_SIZE
+            CELL_SIZE,
+            COLOR_GRID,
+            self.assets,
         )
+        # Kamera: przesuwanie i powiększanie widoku planszy
+        self.camera = Camera(
+            (WINDOW_WIDTH, self.game_height), CELL_SIZE, (self.cols, self.rows)
+        )
+        self._dragging = False
+
+        # Trwała powierzchnia widoku odświeżana tylko w zmienionych komórkach
+        self.board_renderer = BoardRenderer(
+            self.graphics, self.camera, pixel_mode=RENDER_MODE == "pixels"
+        )
+        self._drawn_state = None
+        self._hud_values = None
+        self._rendered_generation = None
 
         # Animacja klatek
         self.animation_frame = 0
@@ -50,19 +116,36 @@ class GameApp:
         # Stan aplikacji
         self.state = "menu"
 
-        # Prędkość
-        self.speed_levels = [400, 200, 80]
-        self.speed_labels = ["NORMAL", "FAST", "FASTEST"]
+        # Prędkość (0 ms = TURBO: tyle kroków, ile zmieści się w budżecie klatki)
+        self.speed_levels = [400, 200, 80, 0]
+        self.speed_labels = ["NORMAL", "FAST", "FASTEST", "TURBO"]
         self.speed_index = 0
         self.step_interval = self.speed_levels[self.speed_index]
-        self.time_since_last_step = 0
+
+        # Symulacja niezależna od klatek: stały krok albo osobny wątek
+        self.scheduler = StepScheduler(
+            self.step_interval, MAX_STEPS_PER_FRAME, SIM_BUDGET_MS
+        )
+        self.sim_thread = None
+        # Wyniki kroków wątku symulacji (pokolenie, cykl, zmiana) – stan gry
+        # zmienia z nich dopiero wątek główny (_apply_thread_steps)
+        self._thread_steps = deque()
 
         # Dźwięki
-        self.sounds = SoundManager()
+        self.sounds = SoundManager(self.assets)
 
-        # Czcionki
-        self.font = pygame.font.SysFont("consolas", 16)  # ← mniejsza dla HUD
-        self.title_font = pygame.font.SysFont("consolas", 36, bold=True)
+        # Czcionki: od razu wbudowana, consolas po przeszukaniu czcionek
+        # systemowych w tle (pierwsze SysFont potrafi trwać długo)
+        self.font = pygame.font.Font(None, 16)  # ← mniejsza dla HUD
+        self.title_font = pygame.font.Font(None, 36)
+        self.title_font.set_bold(True)
+        self.assets.register("fonts", pygame.font.get_fonts, lambda _: (
+            pygame.font.SysFont("consolas", 16),
+            pygame.font.SysFont("consolas", 36, bold=True),
+        ))
+        # Stałe napisy renderowane raz; pola HUD – tylko po zmianie wartości
+        self.text_cache = TextCache(TEXT_CACHE_SIZE)
+        self._hud_surfaces = {}
 
         # Logika
         self.stagnant_generations = 0
@@ -71,12 +154,36 @@ class GameApp:
         # Wyniki
         self.current_score = 0
         self.best_score = 0
-        self.alive_history = []
+        # Wykrywanie końca gry: dokładny cykl planszy (hasz Zobrista)
+        self.cycles = CycleDetector(CYCLE_MAX_PERIOD)
+
+        # Nagranie bieżącego przebiegu i odtwarzacz do przewijania
+        self.recorder = None
+        self.player = None
+        self._recording_temporary = False
+
+        # Profiler faz pętli – tworzony przy pierwszym F3, bez kosztu, gdy wyłączony
+        self.profiler = None
+        self._profile_surface = None
+        self._profile_drawn_at = 0.0
+
+        # Wzory z katalogu PATTERNS_DIR (klawisz L wczytuje kolejny)
+        self._pattern_index = -1
 
         # Fade
         self.fade_alpha = 255
         self.fade_direction = -5
 
+    @staticmethod
+    def _engine_options() -> dict:
+        """Dodatkowe parametry konstruktora wybranego silnika planszy."""
+        if GRID_ENGINE == "parallel":
+            return {
+                "workers": PARALLEL_WORKERS,
+                "stripe_height": PARALLEL_STRIPE_HEIGHT,
+            }
+        return {}
+
     def run(self):
         while self.running:
             dt = self.clock.tick(FPS)
@@ -84,6 +191,12 @@ class GameApp:
             self.update(dt)
             self.draw()
 
+        self._stop_simulation_thread()
+        self._stop_recording()
+        # Silniki z zasobami systemowymi (np. pula procesów) trzeba zamknąć
+        if hasattr(self.grid, "close"):
+            self.grid.close()
+        self.assets.shutdown()
         pygame.quit()
         sys.exit()
 
@@ -96,20 +209,27 @@ class GameApp:
                 if event.key == pygame.K_ESCAPE:
                     self.running = False
 
+                elif event.key == pygame.K_F3:
+                    self.toggle_profiler()
+
+                elif event.key == pygame.K_F4:
+                    self.export_profile()
+
                 elif event.key == pygame.K_SPACE:
                     if self.state == "menu":
                         self.state = "controls"
                         self.sounds.play("click")
                     elif self.state == "controls":
                         self.state = "setup"
-                        self.alive_history.clear()
+                        self.cycles.reset()
                         self.sounds.play("click")
                     elif self.state == "setup":
                         self.state = "running"
                         self.grid.generation = 0
                         self.current_score = 0
                         self.stagnant_generations = 0
-                        self.alive_history.clear()
+                        self.cycles.reset()
+                        self._start_recording()
                         self.sounds.play("click")
                     elif self.state == "running":
                         self.state = "paused"
@@ -120,53 +240,418 @@ class GameApp:
                     elif self.state == "game_over":
                         self.current_score = 0
                         self.stagnant_generations = 0
-                        self.alive_history.clear()
+                        self.cycles.reset()
+                        self._stop_recording()
                         self.state = "setup"
                         self.sounds.play("click")
 
+                elif (
+                        event.key in (pygame.K_COMMA, pygame.K_PERIOD)
+                        and self.state in ("paused", "game_over")
+                ):
+                    # Przewijanie nagrania: o pokolenie, z SHIFT o 100
+                    amount = 100 if pygame.key.get_mods() & pygame.KMOD_SHIFT else 1
+                    self.scrub(amount if event.key == pygame.K_PERIOD else -amount)
+
+                elif self.state == "setup" and event.key == pygame.K_TAB:
+                    self.next_rule()
+
+                elif self.state == "setup" and event.key == pygame.K_b:
+                    self.next_boundary()
+
                 elif self.state in ("running", "setup", "paused"):
                     if event.key == pygame.K_r:
+                        self._stop_simulation_thread()
                         self.grid.randomize()
                         self.grid.generation = 0
                         self.current_score = 0
                         self.stagnant_generations = 0
-                        self.alive_history.clear()
+                        self.cycles.reset()
+                        if self.state != "setup":
+                            self._start_recording()
                         self.sounds.play("click")
                     elif event.key == pygame.K_c:
+                        self._stop_simulation_thread()
                         self.grid.clear()
                         self.grid.generation = 0
                         self.current_score = 0
                         self.stagnant_generations = 0
-                        self.alive_history.clear()
+                        self.cycles.reset()
+                        if self.state != "setup":
+                            self._start_recording()
                         self.sounds.play("clear")
+                    elif event.key == pygame.K_l:
+                        self.load_next_pattern()
+                    elif event.key == pygame.K_s:
+                        self.save_pattern()
+                    elif event.key == pygame.K_F5:
+                        self.save_snapshot()
+                    elif event.key == pygame.K_F9:
+                        self.restore_snapshot()
+                    elif event.key == pygame.K_j:
+                        self.jump_generations(JUMP_GENERATIONS)
+                        self.sounds.play("step")
                     elif event.key in (pygame.K_PLUS, pygame.K_EQUALS):
                         if self.speed_index < len(self.speed_levels) - 1:
                             self.speed_index += 1
-                            self.step_interval = self.speed_levels[self.speed_index]
+                            self.set_speed(self.speed_levels[self.speed_index])
                             self.sounds.play("click")
                     elif event.key == pygame.K_MINUS:
                         if self.speed_index > 0:
                             self.speed_index -= 1
-                            self.step_interval = self.speed_levels[self.speed_index]
+                            self.set_speed(self.speed_levels[self.speed_index])
                             self.sounds.play("click")
 
+                if self.state in BOARD_STATES:
+                    self.handle_camera_key(event.key)
+
+            elif event.type == pygame.DROPFILE and self.state in ("setup", "running", "paused"):
+                self.load_pattern(event.file)
+
+            elif event.type == pygame.MOUSEWHEEL and self.state in BOARD_STATES:
+                x, y = pygame.mouse.get_pos()
+                if y < self.game_height:
+                    self.camera.zoom_at(1 if event.y > 0 else -1, x, y)
+
+            elif event.type == pygame.MOUSEBUTTONUP and event.button == 3:
+                self._dragging = False
+
+            elif event.type == pygame.MOUSEMOTION and self._dragging:
+                self.camera.pan(*event.rel)
+
             elif (
                     event.type == pygame.MOUSEBUTTONDOWN
                     and self.state in ("setup", "running", "paused")
             ):
-                if event.button == 1:
+                if event.button == 3:
+                    # Prawy przycisk – przeciąganie widoku
+                    self._dragging = True
+                elif event.button == 1:
                     x, y = event.pos
                     # ========== ZMIENIONE: Sprawdź czy klik jest NA PLANSZY ========== #
                     if y < self.game_height:  # ← tylko jeśli NIE w HUD
-                        col = x // CELL_SIZE
-                        row = y // CELL_SIZE
+                        col, row = self.camera.screen_to_cell(x, y)
+                        self._stop_simulation_thread()
                         self.grid.toggle_cell(col, row)
                         self.stagnant_generations = 0
-                        self.alive_history.clear()
+                        self.cycles.reset()
                         self.sounds.play("click")
                     # ================================================================= #
 
+    def handle_camera_key(self, key):
+        """Strzałki przesuwają widok, HOME przywraca widok początkowy."""
+        cols, rows = self.camera.view_cells()
+        step_x, step_y = max(1, cols // 10), max(1, rows // 10)
+        if key == pygame.K_LEFT:
+            self.camera.pan_cells(-step_x, 0)
+        elif key == pygame.K_RIGHT:
+            self.camera.pan_cells(step_x, 0)
+        elif key == pygame.K_UP:
+            self.camera.pan_cells(0, -step_y)
+        elif key == pygame.K_DOWN:
+            self.camera.pan_cells(0, step_y)
+        elif key == pygame.K_HOME:
+            self.camera = Camera(
+                (WINDOW_WIDTH, self.game_height), CELL_SIZE, (self.cols, self.rows)
+            )
+            self.board_renderer.camera = self.camera
+
+    def jump_generations(self, generations):
+        """
+        Przeskakuje o wiele pokoleń naraz silnikiem HashLife.
+        HashLife liczy na nieskończonej płaszczyźnie, a na planszę
+        wraca tylko widok o jej rozmiarze – dlatego tylko z martwymi
+        krawędziami. Nawet wtedy wynik może się różnić od tylu samo
+        kroków planszy: komórki za krawędzią nie giną i mogą wrócić.
+        Stan po skoku trafia do nagrania (nowy segment od klatki kluczowej).
+        """
+        if self.grid.boundary != "dead":
+            return
+        from hashlife import HashLife
+
+        self._stop_simulation_thread()
+        try:
+            life = HashLife.from_grid(self.grid, max_nodes=HASHLIFE_MAX_NODES)
+        except ValueError:
+            return  # reguła z B0 – HashLife jej nie obsługuje
+        life.advance(generations)
+        life.write_to(self.grid)
+        if self.recorder is not None:
+            # load_array nie powiadamia step_listeners – bez tego luka w nagraniu
+            self.recorder.record(self.grid)
+
+        self.current_score = self.grid.generation
+        self.stagnant_generations = 0
+        self.cycles.reset()
+
+    def next_rule(self):
+        """Przełącza regułę planszy na kolejną z listy RULES."""
+        index = RULES.index(self.grid.rule) if self.grid.rule in RULES else -1
+        self.grid.set_rule(RULES[(index + 1) % len(RULES)])
+        self.cycles.reset()
+        self.sounds.play("click")
+
+    def next_boundary(self):
+        """Przełącza warunek brzegowy na kolejny z listy BOUNDARIES."""
+        index = BOUNDARIES.index(self.grid.boundary)
+        self.grid.set_boundary(BOUNDARIES[(index + 1) % len(BOUNDARIES)])
+        self.cycles.reset()
+        self.sounds.play("click")
+
+    # ----------------- WZORY ----------------- #
+
+    def load_pattern(self, path) -> bool:
+        """Wczytuje wzór z pliku na środek planszy; False, jeśli się nie da."""
+        from patterns import place_pattern, read_pattern
+
+        self._stop_simulation_thread()
+        try:
+            pattern = read_pattern(path)
+        except (OSError, ValueError):
+            return False
+        place_pattern(self.grid, pattern)
+        try:
+            self.grid.set_rule(pattern.rule)
+        except ValueError:
+            pass  # reguła spoza B/S – zostaje bieżąca
+        self.current_score = 0
+        self.stagnant_generations = 0
+        self.cycles.reset()
+        if self.state != "setup":
+            self._start_recording()
+        self.sounds.play("click")
+        return True
+
+    def load_next_pattern(self):
+        """Wczytuje kolejny (w kolejności nazw) wzór z katalogu PATTERNS_DIR."""
+        from patterns import READERS
+
+        if not os.path.isdir(PATTERNS_DIR):
+            return
+        files = sorted(
+            name for name in os.listdir(PATTERNS_DIR)
+            if os.path.splitext(name)[1].lower() in READERS
+        )
+        if not files:
+            return
+        self._pattern_index = (self._pattern_index + 1) % len(files)
+        self.load_pattern(os.path.join(PATTERNS_DIR, files[self._pattern_index]))
+
+    def save_pattern(self):
+        """Zapisuje żywe komórki planszy jako RLE w katalogu PATTERNS_DIR."""
+        from patterns import Pattern, write_pattern
+
+        os.makedirs(PATTERNS_DIR, exist_ok=True)
+        name = time.strftime("board-%Y%m%d-%H%M%S")
+        write_pattern(
+            os.path.join(PATTERNS_DIR, name + ".rle"),
+            Pattern.from_grid(self.grid, name=name),
+        )
+        self.sounds.play("click")
+
+    def save_snapshot(self) -> bool:
+        """Zapisuje planszę do migawki SNAPSHOT_PATH; False, jeśli się nie da."""
+        from snapshot import save_snapshot
+
+        self._stop_simulation_thread()
+        try:
+            save_snapshot(self.grid, SNAPSHOT_PATH)
+        except OSError as exc:
+            print(f"Cannot save snapshot: {exc}", file=sys.stderr)
+            return False
+        self.sounds.play("click")
+        return True
+
+    def restore_snapshot(self):
+        """Wznawia planszę z migawki SNAPSHOT_PATH (także o innym rozmiarze)."""
+        from snapshot import open_snapshot
+
+        self._stop_simulation_thread()
+        try:
+            grid = open_snapshot(
+                SNAPSHOT_PATH, GRID_ENGINE, boundary=self.grid.boundary,
+                **self._engine_options()
+            )
+        except (OSError, ValueError):
+            return
+        self._stop_recording()
+        if hasattr(self.grid, "close"):
+            self.grid.close()
+        self.grid = grid
+
+        if (grid.cols, grid.rows) != (self.cols, self.rows):
+            self.cols, self.rows = grid.cols, grid.rows
+            self.camera = Camera(
+                (WINDOW_WIDTH, self.game_height), CELL_SIZE, (self.cols, self.rows)
+            )
+            self.board_renderer.camera = self.camera
+
+        self.current_score = grid.generation
+        self.stagnant_generations = 0
+        self.cycles.reset()
+        if self.state != "setup":
+            self._start_recording()
+        self.sounds.play("click")
+
+    # ----------------- NAGRYWANIE ----------------- #
+
+    def _start_recording(self):
+        """Zaczyna nowe nagranie przebiegu od bieżącego stanu planszy."""
+        self._stop_recording()
+        if not RECORD_RUNS:
+            return
+        from recorder import Recorder
+
+        if RECORDINGS_DIR:
+            os.makedirs(RECORDINGS_DIR, exist_ok=True)
+            path = os.path.join(
+                RECORDINGS_DIR, time.strftime("run-%Y%m%d-%H%M%S.golrec")
+            )
+        else:
+            import tempfile
+            fd, path = tempfile.mkstemp(suffix=".golrec")
+            os.close(fd)
+        self._recording_temporary = not RECORDINGS_DIR
+        self.recorder = Recorder(path, self.cols, self.rows, RECORD_KEYFRAME_INTERVAL)
+        self.recorder.attach(self.grid)
+
+    def _stop_recording(self):
+        if self.recorder is None:
+            return
+        self.recorder.detach(self.grid)
+        self.recorder.close()
+        if self.player is not None:
+            self.player.close()
+            self.player = None
+        if self._recording_temporary:
+            os.remove(self.recorder.path)
+        self.recorder = None
+
+    def scrub(self, generations):
+        """
+        Przewija planszę o podaną liczbę pokoleń w nagraniu, bez symulacji.
+        Wznowienie po przewinięciu wstecz nagrywa nową gałąź od tego miejsca.
+        """
+        if self.recorder is None:
+            return
+        self._stop_simulation_thread()
+        self.recorder.flush()
+        if self.player is None:
+            from recorder import RecordingPlayer
+            self.player = RecordingPlayer(self.recorder.path)
+        else:
+            self.player.refresh()
+
+        target = min(
+            max(self.grid.generation + generations, self.player.first_generation),
+            self.player.last_generation,
+        )
+        # Pokolenia przeskoczone (HashLife) nie są nagrane – zatrzymujemy się
+        # na najbliższym nagranym w kierunku przewijania
+        target = self.player.nearest(target, generations)
+        if target is None or target == self.grid.generation:
+            return
+        self.grid.load_array(self.player.frame(target))
+        self.grid.generation = target
+        self.stagnant_generations = 0
+        self.cycles.reset()
+        self.sounds.play("step")
+
+    def set_speed(self, interval_ms):
+        self.step_interval = interval_ms
+        self.scheduler.set_interval(interval_ms)
+        if self.sim_thread is not None:
+            self.sim_thread.interval_ms = interval_ms
+            self.sim_thread.render_every = self._render_every()
+
+    def _render_every(self) -> int:
+        """W trybie turbo plansza jest rysowana co TURBO_RENDER_EVERY pokoleń."""
+        return TURBO_RENDER_EVERY if self.scheduler.turbo else 1
+
+    def _start_simulation_thread(self):
+        self._thread_steps.clear()
+        self.sim_thread = SimulationThread(
+            self.grid, self._thread_step, self.step_interval, self._render_every(),
+            self.camera.visible_range(),
+        )
+        self.sim_thread.start()
+
+    def _stop_simulation_thread(self):
+        """Zatrzymuje wątek symulacji (przed edycją planszy lub poza RUNNING)."""
+        if self.sim_thread is not None:
+            self.sim_thread.stop()
+            self.sim_thread = None
+            # Kroki policzone, zanim wątek się zatrzymał
+            self._apply_thread_steps()
+
+    def _thread_step(self) -> bool:
+        """
+        Krok w wątku symulacji: tylko plansza i detektor cykli. Wynik trafia
+        do kolejki, a wynik gry, koniec gry i dźwięki ustawia wątek główny.
+        Zwraca False po wykryciu cyklu (wątek kończy pracę).
+        """
+        outcome = self._step_grid()
+        self._thread_steps.append(outcome)
+        return not outcome[1]
+
+    def _apply_thread_steps(self):
+        """Przenosi wyniki kroków z wątku symulacji na stan gry (wątek główny)."""
+        while self._thread_steps:
+            self._apply_step(*self._thread_steps.popleft())
+
+    def simulate_step(self) -> bool:
+        """
+        Jeden krok symulacji wraz z logiką końca gry.
+        Zwraca False, gdy symulacja ma się zatrzymać.
+        """
+        if self.state != "running":
+            return False
+        return self._apply_step(*self._step_grid())
+
+    def _step_grid(self) -> tuple[int, bool, bool]:
+        """Sam krok planszy z detektorem cykli: (pokolenie, cykl, zmiana)."""
+        cycle_found = self.cycles.step(self.grid)
+        return self.grid.generation, cycle_found, self.grid.changed_cells > 0
+
+    def _apply_step(self, generation, cycle_found, changed) -> bool:
+        """
+        Wynik, koniec gry i dźwięk po kroku; tylko w wątku głównym.
+        Zwraca False, gdy symulacja ma się zatrzymać.
+        """
+        self.current_score = generation
+
+        if cycle_found:
+            if self.current_score > self.best_score:
+                self.best_score = self.current_score
+            self.state = "game_over"
+            self.sounds.play("clear")
+
+        if changed:
+            self.stagnant_generations = 0
+        else:
+            self.stagnant_generations += 1
+
+        return self.state == "running"
+
+    def _on_asset_loaded(self, name):
+        """Podmienia zastępczy zasób na wczytany i wymusza pełne przerysowanie."""
+        if name == "fonts":
+            fonts = self.assets.get("fonts")
+            if fonts is None:
+                return  # czcionki systemowe niedostępne – zostaje wbudowana
+            self.font, self.title_font = fonts
+            # Napisy wyrenderowane starą czcionką
+            self.text_cache.clear()
+            self._hud_surfaces.clear()
+            self._profile_surface = None
+        elif name in ("background", "cell_sprites"):
+            self.graphics.refresh_assets()
+        self._drawn_state = None
+
     def update(self, dt):
+        for name in self.assets.poll():
+            self._on_asset_loaded(name)
+
         if self.fade_alpha > 0:
             self.fade_alpha += self.fade_direction
             if self.fade_alpha < 0:
@@ -179,111 +664,203 @@ class GameApp:
             self.animation_frame = (self.animation_frame + 1) % 4
 
         if self.state != "running":
+            self._stop_simulation_thread()
+            self.scheduler.reset()
+            return
+
+        if SIMULATION_THREAD:
+            if self.sim_thread is None:
+                self._start_simulation_thread()
+            else:
+                self._apply_thread_steps()
             return
 
-        self.time_since_last_step += dt
-        if self.time_since_last_step >= self.step_interval:
-            self.time_since_last_step = 0
-            changed = self.grid.step()
+        steps = self.scheduler.advance(dt, self.simulate_step)
+        if steps and not self.scheduler.turbo:
             self.sounds.play("step")
 
-            self.current_score = self.grid.generation
+    # ----------------- PROFILER ----------------- #
 
-            alive_now = self.grid.alive_count()
-            self.alive_history.append(alive_now)
-            if len(self.alive_history) > 5:
-                self.alive_history.pop(0)
+    @property
+    def profiling(self) -> bool:
+        return self.profiler is not None and self.profiler.attached
 
-            if (
-                    len(self.alive_history) == 5
-                    and all(a == self.alive_history[0] for a in self.alive_history)
-            ):
-                if self.current_score > self.best_score:
-                    self.best_score = self.current_score
-                self.state = "game_over"
-                self.sounds.play("clear")
+    def toggle_profiler(self):
+        """Włącza/wyłącza pomiar faz pętli i nakładkę z wynikami."""
+        # Wątek symulacji trzyma metodę kroku – po zmianie startuje od nowa
+        self._stop_simulation_thread()
+        if self.profiler is None:
+            from profiler import Profiler
+            self.profiler = Profiler(PROFILE_SAMPLES)
+        if self.profiler.attached:
+            self.profiler.detach()
+        else:
+            self.profiler.clear()
+            self.profiler.attach(self, {
+                "handle_events": "events",
+                "update": "update",
+                "_step_grid": "step",
+                "draw": "draw",
+                "draw_full": "draw_full",
+                "draw_hud": "hud",
+                "draw_profiler_overlay": "overlay",
+                "present": "flip",
+            })
+            self.profiler.attach(self.board_renderer, {"update": "render_board"})
+            self.profiler.attach_frame(self, "handle_events")
+        self._profile_surface = None
+        self._drawn_state = None  # pełne przerysowanie: pokaż/zasłoń nakładkę
 
-            if changed:
-                self.stagnant_generations = 0
-            else:
-                self.stagnant_generations += 1
+    def export_profile(self):
+        """Zapisuje zebrane czasy do PROFILES_DIR jako JSON i Chrome trace."""
+        if self.profiler is None or not any(
+                buffer.count for buffer in self.profiler.phases.values()
+        ):
+            return
+        os.makedirs(PROFILES_DIR, exist_ok=True)
+        base = os.path.join(PROFILES_DIR, time.strftime("profile-%Y%m%d-%H%M%S"))
+        self.profiler.save_json(
+            base + ".json",
+            gens_per_sec=self.profiler.rate("step"),
+            engine=GRID_ENGINE,
+            board=[self.cols, self.rows],
+        )
+        self.profiler.save_chrome_trace(base + ".trace.json")
+        self.sounds.play("click")
 
-    # ========== RYSOWANIE ========== #
+    def profile_lines(self) -> list[str]:
+        """Wiersze nakładki: czas klatki, pokolenia/s i p50/p99 każdej fazy."""
+        from profiler import FRAME
 
-    def draw_grid(self):
-        # Siatka tylko na planszy (bez HUD)
-        for x in range(0, WINDOW_WIDTH, CELL_SIZE):
-            pygame.draw.line(self.screen, COLOR_GRID, (x, 0), (x, self.game_height))
-        for y in range(0, self.game_height, CELL_SIZE):
-            pygame.draw.line(self.screen, COLOR_GRID, (0, y), (WINDOW_WIDTH, y))
-
-    def draw_cells(self):
-        for row in range(self.rows):
-            for col in range(self.cols):
-                if self.grid.grid[row][col] == 1:
-                    self.graphics.draw_cell(
-                        self.screen,
-                        col,
-                        row,
-                        frame_index=self.animation_frame,
-                        fallback_color=COLOR_CELL
-                    )
-
-    def draw_hud(self):
-        # ========== NOWY HUD - PASEK NA DOLE ========== #
-        if self.state in ("setup", "running", "paused", "game_over"):
-            # Tło HUD
-            hud_rect = pygame.Rect(0, self.game_height, WINDOW_WIDTH, HUD_HEIGHT)
-            pygame.draw.rect(self.screen, COLOR_HUD_BG, hud_rect)
-            pygame.draw.line(
-                self.screen,
-                COLOR_GRID,
-                (0, self.game_height),
-                (WINDOW_WIDTH, self.game_height),
-                2
+        stats = self.profiler.stats()
+        frame = stats.get(FRAME)
+        lines = []
+        if frame:
+            fps = 1000 / frame["mean_ms"] if frame["mean_ms"] else 0
+            lines.append(
+                f"frame {frame['p50_ms']:6.2f} / {frame['p99_ms']:6.2f} ms  ({fps:.0f} FPS)"
             )
+        lines.append(f"gen/s {self.profiler.rate('step'):.1f}")
+        for phase, s in stats.items():
+            if phase != FRAME:
+                lines.append(f"{phase:<12} {s['p50_ms']:6.2f} / {s['p99_ms']:6.2f} ms")
+        return lines
 
-            # Status
-            if self.state == "running":
-                status = "RUNNING"
-                status_color = (0, 255, 0)
-            elif self.state == "paused":
-                status = "PAUSED"
-                status_color = (255, 255, 0)
-            elif self.state == "setup":
-                status = "SETUP"
-                status_color = (100, 100, 255)
-            else:
-                status = "GAME OVER"
-                status_color = (255, 0, 0)
-
-            speed_label = self.speed_labels[self.speed_index]
-
-            # Tekst
-            text = (
-                f"Gen: {self.grid.generation} | "
-                f"Alive: {self.grid.alive_count()} | "
-                f"[{status}] | "
-                f"Speed: {speed_label} | "
-                f"Score: {self.current_score} | "
-                f"Best: {self.best_score}"
-            )
+    def draw_profiler_overlay(self) -> pygame.Rect:
+        """
+        Nakładka z wynikami profilera w lewym górnym rogu planszy.
+        Tekst jest składany najwyżej 4 razy na sekundę, w pozostałych
+        klatkach tylko kopiujemy gotową powierzchnię.
+        """
+        now = time.perf_counter()
+        if self._profile_surface is None or now - self._profile_drawn_at >= 0.25:
+            lines = ["p50 / p99"] + self.profile_lines()
+            rendered = [self.font.render(line, True, COLOR_TEXT) for line in lines]
+            height = sum(r.get_height() for r in rendered) + 10
+            width = max(r.get_width() for r in rendered) + 10
+            surface = pygame.Surface((width, height), pygame.SRCALPHA)
+            surface.fill((0, 0, 0, 180))
+            y = 5
+            for r in rendered:
+                surface.blit(r, (5, y))
+                y += r.get_height()
+            self._profile_surface = surface
+            self._profile_drawn_at = now
+        return self.screen.blit(self._profile_surface, (5, 5))
 
-            surf = self.font.render(text, True, COLOR_TEXT)
+    def present(self, rects=None):
+        """Wysyła klatkę na ekran: całe okno albo tylko podane prostokąty."""
+        if rects is None:
+            pygame.display.flip()
+        else:
+            pygame.display.update(rects)
+
+    # ========== RYSOWANIE ========== #
 
-            # Wycentruj w pasku HUD
-            text_y = self.game_height + (HUD_HEIGHT - surf.get_height()) // 2
-            self.screen.blit(surf, (10, text_y))
+    def _grid_stats(self) -> tuple[int, int, int, int]:
+        """
+        (pokolenie, żywe, narodziny, zgony) do HUD. Z wątkiem symulacji –
+        z ostatniej publikacji, bo plansza zmienia się w trakcie kroku.
+        """
+        latest = self.sim_thread.latest if self.sim_thread is not None else None
+        if latest is not None:
+            generation, _, _, stats = latest
+            return (generation, *stats)
+        grid = self.grid
+        return grid.generation, grid.alive_count(), grid.births, grid.deaths
+
+    def hud_fields(self) -> list[tuple[str, str]]:
+        """HUD jako pary (stała etykieta, zmienna wartość)."""
+        if self.state == "running":
+            status = "RUNNING"
+        elif self.state == "paused":
+            status = "PAUSED"
+        elif self.state == "setup":
+            status = "SETUP"
+        else:
+            status = "GAME OVER"
+
+        speed_label = self.speed_labels[self.speed_index]
+        generation, alive, births, deaths = self._grid_stats()
+
+        return [
+            ("Gen: ", str(generation)),
+            (" | Alive: ", str(alive)),
+            (" (+", str(births)),
+            ("/-", str(deaths)),
+            (") | [", status),
+            ("] | Speed: ", speed_label),
+            (" | Score: ", str(self.current_score)),
+            (" | Best: ", str(self.best_score)),
+        ]
+
+    def _hud_value(self, index, value) -> pygame.Surface:
+        """Powierzchnia pola HUD – renderowana ponownie tylko po zmianie wartości."""
+        cached = self._hud_surfaces.get(index)
+        if cached is None or cached[0] != value:
+            cached = (value, self.font.render(value, True, COLOR_TEXT))
+            self._hud_surfaces[index] = cached
+        return cached[1]
+
+    def draw_hud(self) -> pygame.Rect | None:
+        # ========== NOWY HUD - PASEK NA DOLE ========== #
+        if self.state not in BOARD_STATES:
+            return None
+
+        # Tło HUD
+        hud_rect = pygame.Rect(0, self.game_height, WINDOW_WIDTH, HUD_HEIGHT)
+        pygame.draw.rect(self.screen, COLOR_HUD_BG, hud_rect)
+        pygame.draw.line(
+            self.screen,
+            COLOR_GRID,
+            (0, self.game_height),
+            (WINDOW_WIDTH, self.game_height),
+            2
+        )
+
+        # Tekst: etykiety z pamięci podręcznej, wartości pól osobno
+        fields = self.hud_fields()
+        self._hud_values = [value for _, value in fields]
+        text_y = self.game_height + (HUD_HEIGHT - self.font.get_height()) // 2
+        x = 10
+        for index, (label, value) in enumerate(fields):
+            for surf in (
+                self.text_cache.render(self.font, label, COLOR_TEXT),
+                self._hud_value(index, value),
+            ):
+                self.screen.blit(surf, (x, text_y))
+                x += surf.get_width()
+        return hud_rect
         # ============================================== #
 
     def draw_menu(self):
-        title = self.title_font.render("Conway's Game of Life", True, (255, 0, 0))
-        msg = self.font.render("Press SPACE to view controls", True, COLOR_TEXT)
+        title = self.text_cache.render(self.title_font, "Conway's Game of Life", (255, 0, 0))
+        msg = self.text_cache.render(self.font, "Press SPACE to view controls", COLOR_TEXT)
         self.screen.blit(title, (WINDOW_WIDTH // 2 - title.get_width() // 2, 200))
         self.screen.blit(msg, (WINDOW_WIDTH // 2 - msg.get_width() // 2, 280))
 
     def draw_controls(self):
-        title = self.title_font.render("Controls", True, (255, 0, 0))
+        title = self.text_cache.render(self.title_font, "Controls", (255, 0, 0))
         self.screen.blit(title, (WINDOW_WIDTH // 2 - title.get_width() // 2, 120))
 
         controls = [
@@ -291,40 +868,55 @@ class GameApp:
             "R - Randomize board (SETUP / RUNNING / PAUSED)",
             "C - Clear board (SETUP / RUNNING / PAUSED)",
             "Mouse Left - Toggle cell (SETUP / RUNNING / PAUSED)",
-            "+ / - - Adjust speed (in RUNNING)",
+            "Wheel - Zoom, Mouse Right drag / Arrows - Pan, HOME - Reset view",
+            "+ / - - Adjust speed, up to TURBO (in RUNNING)",
+            f"J - Jump {JUMP_GENERATIONS} generations (HashLife, unbounded plane, dead edges only)",
+            "TAB - Change rule: Conway, HighLife, Seeds, Day & Night... (SETUP)",
+            "B - Change edges: dead, torus, mirror, klein (SETUP)",
+            "L / S - Load next / Save pattern in patterns/ (or drop a file)",
+            "F5 / F9 - Save / Restore board snapshot",
+            "F3 / F4 - Performance overlay / Export profile (JSON + Chrome trace)",
+            ", / . - Rewind / forward recorded run, SHIFT x100 (PAUSED / GAME OVER)",
             "ESC - Exit",
             "",
             "Press SPACE to go to board setup",
         ]
 
         for i, text in enumerate(controls):
-            surf = self.font.render(text, True, COLOR_TEXT)
+            surf = self.text_cache.render(self.font, text, COLOR_TEXT)
             self.screen.blit(
                 surf,
                 (WINDOW_WIDTH // 2 - surf.get_width() // 2, 200 + i * 25),
             )
 
     def draw_setup_overlay(self):
-        text = self.font.render(
+        text = self.text_cache.render(
+            self.font,
             "SETUP - Click cells, press R for random, SPACE to start",
-            True,
+            (255, 255, 0),
+        )
+        options = self.text_cache.render(
+            self.font,
+            f"TAB rule: {self.grid.rule.label} | B edges: {self.grid.boundary}",
             (255, 255, 0),
         )
         # Wyświetl NA PLANSZY (tuż nad HUD)
+        self.screen.blit(
+            options,
+            (WINDOW_WIDTH // 2 - options.get_width() // 2, self.game_height - 55)
+        )
         self.screen.blit(
             text,
             (WINDOW_WIDTH // 2 - text.get_width() // 2, self.game_height - 30)
         )
 
     def draw_pause_overlay(self):
-        overlay = pygame.Surface((WINDOW_WIDTH, self.game_height))
-        overlay.set_alpha(120)
-        overlay.fill((0, 0, 0))
+        overlay = self.graphics.shade_layer((WINDOW_WIDTH, self.game_height), 120)
         self.screen.blit(overlay, (0, 0))
 
-        text = self.font.render(
+        text = self.text_cache.render(
+            self.font,
             "PAUSED - Edit board, use R/C, or press SPACE to resume",
-            True,
             (255, 255, 0),
         )
         self.screen.blit(
@@ -333,20 +925,27 @@ class GameApp:
         )
 
     def draw_game_over_overlay(self):
-        overlay = pygame.Surface((WINDOW_WIDTH, self.game_height))
-        overlay.set_alpha(160)
-        overlay.fill((0, 0, 0))
+        overlay = self.graphics.shade_layer((WINDOW_WIDTH, self.game_height), 160)
         self.screen.blit(overlay, (0, 0))
 
-        title = self.title_font.render("GAME OVER", True, (255, 0, 0))
-        score_text = self.font.render(
+        title = self.text_cache.render(self.title_font, "GAME OVER", (255, 0, 0))
+        score_text = self.text_cache.render(
+            self.font,
             f"Score: {self.current_score}   Best: {self.best_score}",
-            True,
             COLOR_TEXT,
         )
-        msg = self.font.render(
+        if self.cycles.period == 1:
+            cycle_label = f"Still life since gen {self.cycles.cycle_start}"
+        elif self.cycles.period:
+            cycle_label = (
+                f"Period {self.cycles.period} cycle since gen {self.cycles.cycle_start}"
+            )
+        else:
+            cycle_label = ""
+        cycle_text = self.text_cache.render(self.font, cycle_label, COLOR_TEXT)
+        msg = self.text_cache.render(
+            self.font,
             "Press SPACE to return to setup",
-            True,
             COLOR_TEXT,
         )
 
@@ -359,24 +958,25 @@ class GameApp:
             score_text,
             (WINDOW_WIDTH // 2 - score_text.get_width() // 2, y_center),
         )
+        self.screen.blit(
+            cycle_text,
+            (WINDOW_WIDTH // 2 - cycle_text.get_width() // 2, y_center + 25),
+        )
         self.screen.blit(
             msg,
-            (WINDOW_WIDTH // 2 - msg.get_width() // 2, y_center + 40),
+            (WINDOW_WIDTH // 2 - msg.get_width() // 2, y_center + 55),
         )
 
-    def draw(self):
+    def draw_full(self):
+        """Rysuje całe okno od nowa."""
         # Wypełnij całe okno czarnym
         self.screen.fill(COLOR_BG)
 
-        # TŁO planszy (tylko górna część)
-        bg_cropped = pygame.Surface((WINDOW_WIDTH, self.game_height))
-        bg_cropped.blit(self.graphics.background, (0, 0))
-        self.screen.blit(bg_cropped, (0, 0))
-
-        # PLANSZA
-        if self.state in ("setup", "running", "paused", "game_over"):
-            self.draw_cells()
-            self.draw_grid()
+        # PLANSZA (trwała powierzchnia renderera) albo samo tło
+        if self.state in BOARD_STATES:
+            self.screen.blit(self.board_renderer.surface, (0, 0))
+        else:
+            self.graphics.draw_background(self.screen)
 
         # MENU/CONTROLS
         if self.state == "menu":
@@ -397,9 +997,82 @@ class GameApp:
 
         # FADE
         if self.fade_alpha > 0:
-            fade_surf = pygame.Surface((WINDOW_WIDTH, WINDOW_HEIGHT))
-            fade_surf.fill((0, 0, 0))
-            fade_surf.set_alpha(self.fade_alpha)
+            fade_surf = self.graphics.shade_layer(
+                (WINDOW_WIDTH, WINDOW_HEIGHT), self.fade_alpha
+            )
             self.screen.blit(fade_surf, (0, 0))
 
-        pygame.display.flip()
\ No newline at end of file
+    def _board_to_render(self):
+        """
+        Zwraca (komórki, (c0, r0)) do narysowania albo None, jeśli planszy
+        nie odświeżamy. Komórki to tylko widoczny fragment planszy
+        (grid.view zakresu kamery), a (c0, r0) – jego lewy górny róg.
+        Z wątkiem symulacji bierzemy ostatnie opublikowane pokolenie;
+        w trybie turbo rysujemy co TURBO_RENDER_EVERY pokoleń.
+        """
+        if self.state not in BOARD_STATES:
+            return None
+
+        if self.sim_thread is not None:
+            region = self.camera.visible_range()
+            if region != self.sim_thread.region:
+                # Kamera się ruszyła – nowy fragment od razu, nie po następnym kroku
+                self.sim_thread.region = region
+                self.sim_thread.publish_now()
+            latest = self.sim_thread.latest
+            self.sim_thread.request_frame()
+            if latest is None:
+                return None
+            generation, cells, offset, _ = latest
+        else:
+            generation = self.grid.generation
+            if (
+                self.state == "running"
+                and self.scheduler.turbo
+                and self._rendered_generation is not None
+                and 0 <= generation - self._rendered_generation < self._render_every()
+            ):
+                return None
+            c0, c1, r0, r1 = self.camera.visible_range()
+            cells, offset = self.grid.view(r0, r1, c0, c1), (c0, r0)
+
+        self._rendered_generation = generation
+        return cells, offset
+
+    def draw(self):
+        """
+        Odświeża ekran. Pełne przerysowanie tylko przy zmianie stanu,
+        zanikaniu lub zmianach pod nakładką; w trakcie symulacji wysyłamy
+        na ekran jedynie prostokąty zmienionych komórek i HUD.
+        """
+        dirty = []
+        board = self._board_to_render()
+        if board is not None:
+            cells, offset = board
+            dirty = self.board_renderer.update(
+                cells, self.animation_frame, COLOR_CELL, offset
+            )
+
+        full = self.state != self._drawn_state or self.fade_alpha > 0
+        if dirty and self.state != "running":
+            # Nakładki (setup/pauza/koniec gry) leżą na planszy
+            full = True
+
+        if full:
+            self.draw_full()
+            if self.profiling:
+                self.draw_profiler_overlay()
+            self.present()
+        elif self.state in BOARD_STATES:
+            rects = [
+                self.screen.blit(self.board_renderer.surface, rect, rect)
+                for rect in dirty
+            ]
+            if [value for _, value in self.hud_fields()] != self._hud_values:
+                rects.append(self.draw_hud())
+            if self.profiling:
+                rects.append(self.draw_profiler_overlay())
+            if rects:
+                self.present(rects)
+
+        self._drawn_state = self.state
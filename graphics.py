@@ -1,16 +1,34 @@
+from collections import OrderedDict
+
+import numpy as np
 import pygame
+from assets import AssetRegistry
 from utils import resource_path
-import os
+
+# Poniżej tego rozmiaru komórki nie rysujemy linii siatki
+GRID_MIN_CELL = 4
+# Poniżej tego rozmiaru komórki sprite'y są nieczytelne – rysujemy prostokąty
+SPRITE_MIN_CELL = 8
+
 
 class SpriteSheet:
     """
     Prosty komponent do pracy ze sprite sheetem.
-    Umożliwia wycinanie klatek (kopiowanie fragmentów obrazu).
+    Wszystkie klatki są wycinane raz, przy ładowaniu, i trzymane w pamięci
+    w formacie ekranu – get_frame() niczego już nie alokuje.
     """
 
-    def __init__(self, filename: str, frame_width: int, frame_height: int):
-        image_path = resource_path(filename)
-        self.sheet = pygame.image.load(image_path).convert_alpha()
+    def __init__(
+        self,
+        filename: str,
+        frame_width: int,
+        frame_height: int,
+        image: pygame.Surface | None = None,
+    ):
+        # image: arkusz już wczytany (np. w tle przez AssetRegistry)
+        if image is None:
+            image = pygame.image.load(resource_path(filename))
+        self.sheet = image.convert_alpha()
         self.frame_width = frame_width
         self.frame_height = frame_height
 
@@ -18,9 +36,30 @@ class SpriteSheet:
         self.rows = self.sheet.get_height() // frame_height
         self.total_frames = self.columns * self.rows
 
-    def get_frame(self, index: int) -> pygame.Surface:
-        """Zwraca wyciętą klatkę o danym indeksie."""
-        index = index % self.total_frames
+        self.frames = [self._cut_frame(i) for i in range(self.total_frames)]
+        self._scaled = {frame_width: self.frames}
+
+    def get_frame(self, index: int, size: int | None = None) -> pygame.Surface:
+        """
+        Zwraca wyciętą klatkę o danym indeksie (z pamięci podręcznej),
+        opcjonalnie przeskalowaną do kwadratu size x size.
+        """
+        frames = self.frames if size is None else self._frames_for(size)
+        return frames[index % self.total_frames]
+
+    def _frames_for(self, size: int) -> list[pygame.Surface]:
+        """Klatki przeskalowane do danego rozmiaru – skalowane raz."""
+        frames = self._scaled.get(size)
+        if frames is None:
+            frames = [
+                pygame.transform.smoothscale(frame, (size, size)).convert_alpha()
+                for frame in self.frames
+            ]
+            self._scaled[size] = frames
+        return frames
+
+    def _cut_frame(self, index: int) -> pygame.Surface:
+        """Wycina klatkę z arkusza i konwertuje ją do formatu ekranu."""
         col = index % self.columns
         row = index // self.columns
 
@@ -33,7 +72,44 @@ class SpriteSheet:
 
         frame_surf = pygame.Surface((self.frame_width, self.frame_height), pygame.SRCALPHA)
         frame_surf.blit(self.sheet, (0, 0), rect)
-        return frame_surf
+        return frame_surf.convert_alpha()
+
+
+class TextCache:
+    """
+    Pamięć podręczna wyrenderowanych napisów: (czcionka, tekst, kolor) -> Surface.
+
+    Stałe napisy (menu, sterowanie, etykiety HUD) są rasteryzowane raz;
+    najdawniej używane wpisy są usuwane po przekroczeniu capacity.
+    """
+
+    def __init__(self, capacity: int = 128):
+        self.capacity = capacity
+        self._surfaces = OrderedDict()
+
+    def render(
+        self,
+        font: pygame.font.Font,
+        text: str,
+        color: tuple[int, int, int],
+        antialias: bool = True,
+    ) -> pygame.Surface:
+        key = (font, text, color, antialias)
+        surface = self._surfaces.get(key)
+        if surface is None:
+            surface = font.render(text, antialias, color)
+            self._surfaces[key] = surface
+            if len(self._surfaces) > self.capacity:
+                self._surfaces.popitem(last=False)
+        else:
+            self._surfaces.move_to_end(key)
+        return surface
+
+    def clear(self):
+        self._surfaces.clear()
+
+    def __len__(self):
+        return len(self._surfaces)
 
 
 class GraphicsManager:
@@ -41,50 +117,174 @@ class GraphicsManager:
     Odpowiada za zasoby graficzne:
     - tło
     - sprite'y komórek
+    - warstwy statyczne (tło z siatką, półprzezroczyste nakładki)
+
+    Warstwy są budowane raz i przebudowywane dopiero po zmianie
+    rozmiaru, rozmiaru komórki albo motywu (koloru siatki).
+
+    Tło i sprite'y wczytują się w tle (AssetRegistry); do tego czasu
+    rysujemy jednolite tło i prostokąty, a po ich dojściu wystarczy
+    refresh_assets().
     """
 
-    def __init__(self, screen_size: tuple[int, int], cell_size: int):
+    def __init__(
+        self,
+        screen_size: tuple[int, int],
+        cell_size: int,
+        grid_color: tuple[int, int, int] = (40, 40, 40),
+        assets: AssetRegistry | None = None,
+    ):
         self.width, self.height = screen_size
         self.cell_size = cell_size
+        self.grid_color = grid_color
+        self.assets = assets if assets is not None else AssetRegistry()
+
+        # Tło (w oryginalnym rozmiarze – skalowane w warstwie) i sprite sheet
+        # komórek; do czasu wczytania – awaryjne tło i prostokąty
+        self._fallback_background = pygame.Surface((1, 1))
+        self._fallback_background.fill((10, 10, 40))
+        self._load_background()
+        self._load_cell_sprites()
 
-        # Ładowanie tła
-        self.background = self._load_background()
+        # Gotowe kafelki zastępczych komórek ((kolor, rozmiar) -> Surface)
+        self._fallback_cells = {}
 
-        # Ładowanie sprite sheet komórek
-        self.cell_sprite_sheet, self.use_sprites = self._load_cell_sprites()
+        # Pamięć podręczna warstw: nazwa -> Surface
+        self._layers = {}
+        self._layers_key = None
+        self._shades = {}
 
     # ----------------- ŁADOWANIE ZASOBÓW ----------------- #
 
-    def _load_background(self) -> pygame.Surface:
-        try:
-            path = resource_path("background.png")
-            print(f"🔍 Trying to load background from: {path}")
-            print(f"📁 File exists: {os.path.exists(path)}")
-
-            bg_image = pygame.image.load(path).convert()
-            bg_image = pygame.transform.scale(bg_image, (self.width, self.height))
-            print("✅ Background loaded successfully!")
-            return bg_image
-        except Exception as e:
-            print(f"❌ Failed to load background: {e}")
-            # awaryjne tło
-            fallback = pygame.Surface((self.width, self.height))
-            fallback.fill((10, 10, 40))
-            return fallback
-
-    def _load_cell_sprites(self) -> tuple[SpriteSheet | None, bool]:
-        try:
-            sheet = SpriteSheet("cell_sprites.png", self.cell_size, self.cell_size)
-            return sheet, True
-        except Exception:
-            # jeśli brak pliku / problem – rysujemy prostokąty zamiast sprite'ów
-            return None, False
+    def _load_background(self) -> None:
+        self.assets.register(
+            "background",
+            lambda: pygame.image.load(resource_path("background.png")),
+            pygame.Surface.convert,
+        )
+
+    def _load_cell_sprites(self) -> None:
+        # Jeśli brak pliku / problem – rysujemy prostokąty zamiast sprite'ów
+        size = self.cell_size
+        self.assets.register(
+            "cell_sprites",
+            lambda: pygame.image.load(resource_path("cell_sprites.png")),
+            lambda image: SpriteSheet("cell_sprites.png", size, size, image),
+        )
+
+    @property
+    def _background_image(self) -> pygame.Surface:
+        return self.assets.get("background", self._fallback_background)
+
+    @property
+    def cell_sprite_sheet(self) -> SpriteSheet | None:
+        return self.assets.get("cell_sprites")
+
+    @property
+    def use_sprites(self) -> bool:
+        return self.cell_sprite_sheet is not None
+
+    def refresh_assets(self) -> None:
+        """Po dojściu tła lub sprite'ów – warstwy przebudują się przy następnym użyciu."""
+        self._layers.clear()
+        self._layers_key = None
+
+    # ----------------- WARSTWY ----------------- #
+
+    def configure(
+        self,
+        screen_size: tuple[int, int] | None = None,
+        cell_size: int | None = None,
+        grid_color: tuple[int, int, int] | None = None,
+    ) -> None:
+        """Zmienia parametry warstw; przebudują się przy następnym użyciu."""
+        if screen_size is not None:
+            self.width, self.height = screen_size
+        if cell_size is not None:
+            self.cell_size = cell_size
+        if grid_color is not None:
+            self.grid_color = grid_color
+
+    def get_layer(self, name: str) -> pygame.Surface:
+        """Zwraca warstwę "background" albo "board" (tło z siatką)."""
+        key = (self.width, self.height, self.cell_size, self.grid_color)
+        if key != self._layers_key:
+            self._layers.clear()
+            self._layers_key = key
+
+        layer = self._layers.get(name)
+        if layer is None:
+            if name == "background":
+                layer = pygame.transform.scale(
+                    self._background_image, (self.width, self.height)
+                )
+            elif name == "board":
+                layer = self._build_board_layer()
+            else:
+                raise KeyError(f"Unknown layer: {name}")
+            self._layers[name] = layer
+        return layer
+
+    @property
+    def show_grid(self) -> bool:
+        """Czy przy bieżącym rozmiarze komórki rysujemy linie siatki."""
+        return self.cell_size >= GRID_MIN_CELL
+
+    def _build_board_layer(self) -> pygame.Surface:
+        """Tło z wypalonymi liniami siatki."""
+        board = self.get_layer("background").copy()
+        if not self.show_grid:
+            return board
+        for x in range(0, self.width, self.cell_size):
+            pygame.draw.line(board, self.grid_color, (x, 0), (x, self.height))
+        for y in range(0, self.height, self.cell_size):
+            pygame.draw.line(board, self.grid_color, (0, y), (self.width, y))
+        return board
+
+    def shade_layer(self, size: tuple[int, int], alpha: int) -> pygame.Surface:
+        """
+        Zwraca czarną, półprzezroczystą nakładkę o danym rozmiarze.
+        Powierzchnia jest współdzielona – zmienia się tylko jej alpha.
+        """
+        shade = self._shades.get(size)
+        if shade is None:
+            shade = pygame.Surface(size).convert()
+            shade.fill((0, 0, 0))
+            self._shades[size] = shade
+        shade.set_alpha(alpha)
+        return shade
+
+    @property
+    def background(self) -> pygame.Surface:
+        return self.get_layer("background")
 
     # ----------------- RYSOWANIE ----------------- #
 
     def draw_background(self, screen: pygame.Surface) -> None:
         screen.blit(self.background, (0, 0))
 
+    def cell_surface(
+        self,
+        frame_index: int,
+        fallback_color: tuple[int, int, int],
+    ) -> pygame.Surface:
+        """Zwraca gotowy kafelek komórki: klatkę sprite'a albo prostokąt."""
+        size = self.cell_size
+        sheet = self.cell_sprite_sheet
+        if sheet is not None and size >= SPRITE_MIN_CELL:
+            return sheet.get_frame(frame_index, size)
+
+        key = (fallback_color, size)
+        tile = self._fallback_cells.get(key)
+        if tile is None:
+            # fallback – prostokąt (1 px odstępu, żeby nie zasłaniać linii siatki)
+            inset = 1 if self.show_grid else 0
+            tile = pygame.Surface((size, size), pygame.SRCALPHA)
+            tile.fill(fallback_color, pygame.Rect(inset, inset, size - inset, size - inset))
+            tile = tile.convert_alpha()
+            self._fallback_cells[key] = tile
+        return tile
+
     def draw_cell(
         self,
         screen: pygame.Surface,
@@ -95,14 +295,22 @@ class GraphicsManager:
     ) -> None:
         x = col * self.cell_size
         y = row * self.cell_size
+        screen.blit(self.cell_surface(frame_index, fallback_color), (x, y))
 
-        if self.use_sprites and self.cell_sprite_sheet is not None:
-            frame = self.cell_sprite_sheet.get_frame(frame_index)
-            screen.blit(frame, (x, y))
-        else:
-            # fallback – prostokąt
-            pygame.draw.rect(
-                screen,
-                fallback_color,
-                pygame.Rect(x, y, self.cell_size, self.cell_size),
-            )
+    def draw_cells(
+        self,
+        screen: pygame.Surface,
+        rows: np.ndarray,
+        cols: np.ndarray,
+        frame_index: int,
+        fallback_color: tuple[int, int, int],
+        origin: tuple[int, int] = (0, 0),
+    ) -> None:
+        """
+        Rysuje wszystkie podane komórki jednym wywołaniem Surface.blits.
+        origin to piksel, w którym leży komórka (0, 0).
+        """
+        tile = self.cell_surface(frame_index, fallback_color)
+        xs = (cols * self.cell_size + origin[0]).tolist()
+        ys = (rows * self.cell_size + origin[1]).tolist()
+        screen.blits([(tile, pos) for pos in zip(xs, ys)], doreturn=False)
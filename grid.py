@@ -1,74 +1,237 @@
 # grid.py
 
-import random
+import numpy as np
+
+from bitgrid import unpack_rows
+from boundary import check_boundary, fill_halo, halo_window
+from cycles import xor_cells, xor_keys
+from rules import CONWAY, parse_rule
+from soup import fill_rect, random_cells
+
+
+def next_state(window: np.ndarray, rule=CONWAY) -> np.ndarray:
+    """
+    Oblicza kolejne pokolenie dla wnętrza okna z jednokomórkową ramką (halo).
+
+    window ma kształt (h + 2, w + 2); wynik ma kształt (h, w) i typ uint8.
+    Sąsiedzi są liczeni przesunięciami tablicy, bez pętli po komórkach,
+    a nowy stan wynika z reguły (domyślnie Conway B3/S23).
+    """
+    neighbors = (
+        window[:-2, :-2] + window[:-2, 1:-1] + window[:-2, 2:]
+        + window[1:-1, :-2] + window[1:-1, 2:]
+        + window[2:, :-2] + window[2:, 1:-1] + window[2:, 2:]
+    )
+    return rule.apply(neighbors, window[1:-1, 1:-1])
+
+
+def count_changes(old: np.ndarray, new: np.ndarray, r0=0, c0=0, board_cols=None) -> tuple[int, int, int]:
+    """
+    Porównuje dwa stany tego samego fragmentu planszy.
+    Zwraca (narodziny, zgony, XOR kluczy Zobrista zmienionych komórek).
+    r0, c0 i board_cols opisują położenie fragmentu na planszy.
+    """
+    # Liczniki bez współrzędnych: komórki 0/1, więc new > old to narodziny
+    births = int(np.count_nonzero(new > old))
+    deaths = int(np.count_nonzero(old > new))
+    if births == 0 and deaths == 0:
+        return 0, 0, 0
+    changed = old != new
+    width = new.shape[1]
+    if board_cols is None:
+        board_cols = width
+    if board_cols == width and c0 == 0:
+        # Pełne wiersze: płaskie indeksy zmian pasami (xor_cells)
+        return births, deaths, xor_cells(changed, r0 * board_cols)
+    # Fragment: płaskie indeksy, położenie na planszy liczone arytmetycznie
+    rows, cols = np.divmod(np.flatnonzero(changed), width)
+    return births, deaths, xor_keys((rows + r0) * board_cols + (cols + c0))
 
 
 class CellGrid:
-    """Reprezentuje siatkę komórek Game of Life."""
+    """
+    Reprezentuje siatkę komórek Game of Life.
 
-    def __init__(self, cols, rows):
+    Populacja i statystyki ostatniego pokolenia (births, deaths,
+    changed_cells) są aktualizowane przyrostowo, więc odczyt kosztuje O(1).
+    Tak samo board_hash – hasz Zobrista stanu planszy (XOR kluczy
+    żywych komórek), aktualizowany tylko o zmienione komórki.
+    rule to reguła B/S (obiekt Rule albo tekst, domyślnie Conway),
+    boundary – warunek brzegowy z boundary.BOUNDARIES.
+    """
+
+    def __init__(self, cols, rows, rule=CONWAY, boundary="dead"):
         self.cols = cols
         self.rows = rows
-        self.grid = [[0 for _ in range(cols)] for _ in range(rows)]
+        self.rule = parse_rule(rule)
+        self.boundary = check_boundary(boundary)
+        # Bufor (rows + 2, cols + 2) na planszę z ramką, tworzony przy 1. kroku
+        self._padded = None
+        # Plansza jako tablica NumPy: grid[row][col] działa jak wcześniej
+        self.grid = np.zeros((rows, cols), dtype=np.uint8)
         self.generation = 0
 
+        self.population = 0
+        self.births = 0
+        self.deaths = 0
+        self.changed_cells = 0
+        self.board_hash = 0
+        self._bbox = None
+        # Wywoływane z planszą po każdym kroku (np. Recorder.record)
+        self.step_listeners = []
+
+    def _reset_stats(self):
+        """Przelicza populację i hasz po zmianie całej planszy naraz."""
+        self.population = int(np.count_nonzero(self.grid))
+        self.board_hash = xor_cells(self.grid)
+        self.births = self.deaths = self.changed_cells = 0
+        self._bbox = None
+
+    def set_rule(self, rule):
+        """Zmienia regułę (obiekt Rule albo tekst B/S)."""
+        self.rule = parse_rule(rule)
+
+    def set_boundary(self, boundary):
+        """Zmienia warunek brzegowy (nazwa z boundary.BOUNDARIES)."""
+        self.boundary = check_boundary(boundary)
+
+    def _restore_stats(self, population, board_hash):
+        """Ustawia populację i hasz znane z zewnątrz (np. z nagłówka migawki)."""
+        self.population = population
+        self.board_hash = board_hash
+        self.births = self.deaths = self.changed_cells = 0
+        self._bbox = None
+
+    def _record_step(self, births, deaths, hash_delta):
+        """Aktualizuje liczniki i hasz po kroku symulacji i powiadamia słuchaczy."""
+        self.births = births
+        self.deaths = deaths
+        self.changed_cells = births + deaths
+        self.population += births - deaths
+        self.board_hash ^= hash_delta
+        if self.changed_cells:
+            self._bbox = None
+        for listener in self.step_listeners:
+            listener(self)
+
     def clear(self):
         """Czyści siatkę (wszystkie komórki martwe)."""
-        for r in range(self.rows):
-            for c in range(self.cols):
-                self.grid[r][c] = 0
+        self.grid.fill(0)
         self.generation = 0
+        self._reset_stats()
 
-    def randomize(self, probability=0.25):
-        """Losowo wypełnia siatkę żywymi komórkami."""
-        for r in range(self.rows):
-            for c in range(self.cols):
-                self.grid[r][c] = 1 if random.random() < probability else 0
+    def randomize(self, probability=0.25, seed=None, rect=None, symmetry="C1"):
+        """
+        Losowo wypełnia siatkę żywymi komórkami (soup.random_cells).
+        seed to ziarno albo np.random.Generator; rect = (c0, r0, c1, r1)
+        ogranicza losowanie do prostokąta, reszta planszy zostaje bez zmian.
+        """
+        c0, r0, c1, r1 = fill_rect(rect, self.cols, self.rows)
+        self.grid[r0:r1, c0:c1] = random_cells(r1 - r0, c1 - c0, probability, seed, symmetry)
         self.generation = 0
+        self._reset_stats()
 
     def toggle_cell(self, col, row):
         """Przełącza stan komórki (żywa/martwa)."""
         if 0 <= row < self.rows and 0 <= col < self.cols:
-            self.grid[row][col] = 1 - self.grid[row][col]
+            self.grid[row, col] ^= 1
+            self.population += 1 if self.grid[row, col] else -1
+            self.board_hash ^= xor_keys(np.array([row * self.cols + col]))
+            self._bbox = None
 
     def count_alive_neighbors(self, col, row):
-        """Liczy liczbę żywych sąsiadów wokół komórki."""
-        count = 0
-        for dr in (-1, 0, 1):
-            for dc in (-1, 0, 1):
-                if dr == 0 and dc == 0:
-                    continue
-                nr, nc = row + dr, col + dc
-                if 0 <= nr < self.rows and 0 <= nc < self.cols:
-                    count += self.grid[nr][nc]
-        return count
+        """Liczy liczbę żywych sąsiadów wokół komórki (z warunkiem brzegowym)."""
+        window = halo_window(self.grid, row, row + 1, col, col + 1, self.boundary)
+        return int(window.sum()) - int(self.grid[row, col])
 
     def step(self) -> bool:
         """
-        Oblicza kolejne pokolenie według zasad Conwaya.
+        Oblicza kolejne pokolenie według reguły planszy.
         Zwraca True, jeśli stan planszy się zmienił, inaczej False.
         """
-        new_grid = [[0 for _ in range(self.cols)] for _ in range(self.rows)]
-        changed = False
-
-        for r in range(self.rows):
-            for c in range(self.cols):
-                alive = self.grid[r][c] == 1
-                neighbors = self.count_alive_neighbors(c, r)
-                if alive and neighbors in (2, 3):
-                    new_grid[r][c] = 1
-                elif not alive and neighbors == 3:
-                    new_grid[r][c] = 1
-                else:
-                    new_grid[r][c] = 0
-
-                if new_grid[r][c] != self.grid[r][c]:
-                    changed = True
+        # Gotowy bufor z ramką zamiast np.pad; ramka według warunku brzegowego
+        if self._padded is None:
+            self._padded = np.zeros((self.rows + 2, self.cols + 2), dtype=np.uint8)
+        padded = self._padded
+        padded[1:-1, 1:-1] = self.grid
+        fill_halo(padded, self.boundary)
+        new_grid = next_state(padded, self.rule)
+        births, deaths, hash_delta = count_changes(self.grid, new_grid)
 
         self.grid = new_grid
         self.generation += 1
-        return changed
+        self._record_step(births, deaths, hash_delta)
+        return self.changed_cells > 0
 
     def alive_count(self):
-        """Zwraca liczbę żywych komórek."""
-        return sum(sum(row) for row in self.grid)
+        """Zwraca liczbę żywych komórek (licznik, bez skanowania planszy)."""
+        return self.population
+
+    def bounding_box(self) -> tuple[int, int, int, int] | None:
+        """
+        Zwraca (c0, r0, c1, r1) – prostokąt żywych komórek (c1, r1 wyłącznie)
+        albo None dla pustej planszy. Wynik jest pamiętany do następnej zmiany.
+        """
+        if self._bbox is None and self.population:
+            rows = np.flatnonzero(self.grid.any(axis=1))
+            cols = np.flatnonzero(self.grid.any(axis=0))
+            self._bbox = (int(cols[0]), int(rows[0]), int(cols[-1]) + 1, int(rows[-1]) + 1)
+        return self._bbox if self.population else None
+
+    def alive_cells(self) -> tuple[np.ndarray, np.ndarray]:
+        """Zwraca (wiersze, kolumny) żywych komórek."""
+        return np.nonzero(self.grid)
+
+    def to_array(self) -> np.ndarray:
+        """Zwraca planszę jako tablicę uint8 (rows, cols) – bez kopiowania."""
+        return self.grid
+
+    def view(self, r0, r1, c0, c1) -> np.ndarray:
+        """
+        Fragment planszy [r0:r1, c0:c1] jako tablica uint8 – bez kopiowania,
+        więc aktualny tylko do następnej zmiany planszy.
+        """
+        return self.grid[r0:r1, c0:c1]
+
+    def load_array(self, cells: np.ndarray):
+        """Wczytuje całą planszę z tablicy (rows, cols) jednym przypisaniem."""
+        self.grid[...] = cells != 0
+        self._reset_stats()
+
+    def load_packed(self, words: np.ndarray, population=None, board_hash=None):
+        """
+        Wczytuje planszę z upakowanych słów uint64 (układ BitPackedGrid),
+        rozpakowując ją pasami. Bez population i board_hash liczy je od nowa.
+        """
+        cells = self.grid
+        # Pasami, żeby nie trzymać w pamięci drugiej kopii całej planszy
+        stripe = max(1, (1 << 22) // max(self.cols, 1))
+        for r0 in range(0, self.rows, stripe):
+            r1 = min(r0 + stripe, self.rows)
+            cells[r0:r1] = unpack_rows(words[r0:r1], self.cols)
+        if population is None or board_hash is None:
+            self._reset_stats()
+        else:
+            self._restore_stats(population, board_hash)
+
+
+def create_grid(cols, rows, engine="numpy", **options):
+    """
+    Tworzy planszę z wybranym silnikiem (options trafiają do konstruktora):
+    - "numpy"     – CellGrid, bajt na komórkę
+    - "bitpacked" – BitPackedGrid, 64 komórki w słowie uint64
+    - "chunked"   – ChunkedGrid, przelicza tylko aktywne fragmenty 32x32
+    - "parallel"  – ParallelGrid, pasy liczone w puli procesów
+    """
+    if engine == "numpy":
+        return CellGrid(cols, rows, **options)
+    if engine == "bitpacked":
+        from bitgrid import BitPackedGrid
+        return BitPackedGrid(cols, rows, **options)
+    if engine == "chunked":
+        from chunkgrid import ChunkedGrid
+        return ChunkedGrid(cols, rows, **options)
+    if engine == "parallel":
+        from parallel import ParallelGrid
+        return ParallelGrid(cols, rows, **options)
+    raise ValueError(f"Unknown grid engine: {engine}")
@@ -0,0 +1,286 @@
+# hashlife.py
+
+import numpy as np
+
+from rules import CONWAY, parse_rule
+
+
+class Node:
+    """
+    Węzeł drzewa czwórkowego HashLife.
+
+    Węzeł poziomu k opisuje kwadrat 2^k x 2^k złożony z czterech ćwiartek:
+    a (NW), b (NE), c (SW), d (SE). Poziom 0 to pojedyncza komórka.
+    Węzły są współdzielone (hash-consing), więc porównuje się je po tożsamości.
+    """
+
+    __slots__ = ("k", "a", "b", "c", "d", "n")
+
+    def __init__(self, k, a, b, c, d, n):
+        self.k = k
+        self.a = a
+        self.b = b
+        self.c = c
+        self.d = d
+        self.n = n  # liczba żywych komórek
+
+
+OFF = Node(0, None, None, None, None, 0)
+ON = Node(0, None, None, None, None, 1)
+
+
+class HashLife:
+    """
+    Silnik HashLife: drzewo czwórkowe z zapamiętanymi wynikami.
+
+    Pozwala przeskoczyć o dowolną liczbę pokoleń (rozkładaną na potęgi
+    dwójki) w czasie zależnym od regularności wzoru, a nie od liczby pokoleń.
+    Symuluje nieskończoną płaszczyznę – komórki poza planszą nie giną.
+    Reguły z B0 nie są obsługiwane (pusta przestrzeń nie byłaby pusta).
+    """
+
+    def __init__(self, max_nodes=1_000_000, rule=CONWAY):
+        self.rule = parse_rule(rule)
+        if 0 in self.rule.birth:
+            raise ValueError(f"HashLife does not support B0 rules: {self.rule.notation}")
+        self.max_nodes = max_nodes
+        self._nodes = {}
+        self._results = {}
+        self._empty = [OFF]
+        # Nowy stan komórki dla 9-bitowego sąsiedztwa 3x3 (bit 4 = środek)
+        self._rule = self.rule.neighbourhood.tolist()
+
+        self.root = self.empty(3)
+        # Współrzędne (kolumna, wiersz) lewego górnego rogu korzenia
+        self.origin_x = 0
+        self.origin_y = 0
+        self.generation = 0
+
+    # ----------------- BUDOWA WĘZŁÓW ----------------- #
+
+    def join(self, a, b, c, d) -> Node:
+        """Zwraca (jedyny) węzeł o podanych ćwiartkach."""
+        key = (a, b, c, d)
+        node = self._nodes.get(key)
+        if node is None:
+            node = Node(a.k + 1, a, b, c, d, a.n + b.n + c.n + d.n)
+            self._nodes[key] = node
+        return node
+
+    def empty(self, k) -> Node:
+        """Zwraca pusty węzeł poziomu k."""
+        while len(self._empty) <= k:
+            e = self._empty[-1]
+            self._empty.append(self.join(e, e, e, e))
+        return self._empty[k]
+
+    def centre(self, m) -> Node:
+        """Otacza węzeł pustą ramką – wynik ma poziom o 1 wyższy."""
+        e = self.empty(m.k - 1)
+        return self.join(
+            self.join(e, e, e, m.a),
+            self.join(e, e, m.b, e),
+            self.join(e, m.c, e, e),
+            self.join(m.d, e, e, e),
+        )
+
+    # ----------------- EWOLUCJA ----------------- #
+
+    def _life_4x4(self, m) -> Node:
+        """Przypadek bazowy: środek 2x2 węzła 4x4 po jednym pokoleniu."""
+        cells = (
+            (m.a.a.n, m.a.b.n, m.b.a.n, m.b.b.n),
+            (m.a.c.n, m.a.d.n, m.b.c.n, m.b.d.n),
+            (m.c.a.n, m.c.b.n, m.d.a.n, m.d.b.n),
+            (m.c.c.n, m.c.d.n, m.d.c.n, m.d.d.n),
+        )
+        out = []
+        for r in (1, 2):
+            for c in (1, 2):
+                idx = 0
+                for dr in (-1, 0, 1):
+                    for dc in (-1, 0, 1):
+                        idx = (idx << 1) | cells[r + dr][c + dc]
+                out.append(ON if self._rule[idx] else OFF)
+        return self.join(*out)
+
+    def successor(self, m, j) -> Node:
+        """
+        Zwraca środek węzła m (poziom k - 1) po 2^j pokoleniach, j <= k - 2.
+        Wyniki są zapamiętywane dla par (węzeł, j).
+        """
+        j = min(j, m.k - 2)
+        key = (m, j)
+        result = self._results.get(key)
+        if result is not None:
+            return result
+
+        if m.n == 0:
+            result = m.a
+        elif m.k == 2:
+            result = self._life_4x4(m)
+        else:
+            join = self.join
+            c1 = self.successor(m.a, j)
+            c2 = self.successor(join(m.a.b, m.b.a, m.a.d, m.b.c), j)
+            c3 = self.successor(m.b, j)
+            c4 = self.successor(join(m.a.c, m.a.d, m.c.a, m.c.b), j)
+            c5 = self.successor(join(m.a.d, m.b.c, m.c.b, m.d.a), j)
+            c6 = self.successor(join(m.b.c, m.b.d, m.d.a, m.d.b), j)
+            c7 = self.successor(m.c, j)
+            c8 = self.successor(join(m.c.b, m.d.a, m.c.d, m.d.c), j)
+            c9 = self.successor(m.d, j)
+
+            if j < m.k - 2:
+                # Pokolenia już policzone – składamy tylko środki
+                result = join(
+                    join(c1.d, c2.c, c4.b, c5.a),
+                    join(c2.d, c3.c, c5.b, c6.a),
+                    join(c4.d, c5.c, c7.b, c8.a),
+                    join(c5.d, c6.c, c8.b, c9.a),
+                )
+            else:
+                # Pełna prędkość: drugi półkrok na złożonych ćwiartkach
+                result = join(
+                    self.successor(join(c1, c2, c4, c5), j),
+                    self.successor(join(c2, c3, c5, c6), j),
+                    self.successor(join(c4, c5, c7, c8), j),
+                    self.successor(join(c5, c6, c8, c9), j),
+                )
+
+        self._results[key] = result
+        return result
+
+    @staticmethod
+    def _is_padded(m) -> bool:
+        """True, jeśli cała populacja mieści się w środkowej ćwiartce węzła."""
+        return (
+            m.a.n == m.a.d.d.n
+            and m.b.n == m.b.c.c.n
+            and m.c.n == m.c.b.b.n
+            and m.d.n == m.d.a.a.n
+        )
+
+    def _grow(self):
+        """Powiększa korzeń o pustą ramkę, zachowując współrzędne komórek."""
+        half = 1 << (self.root.k - 1)
+        self.root = self.centre(self.root)
+        self.origin_x -= half
+        self.origin_y -= half
+
+    def advance_pow2(self, j):
+        """Przesuwa wzór o 2^j pokoleń."""
+        while self.root.k < j + 2 or not self._is_padded(self.root):
+            self._grow()
+        # Dwie dodatkowe ramki – wzór nie wyjdzie poza wynik
+        self._grow()
+        self._grow()
+
+        quarter = 1 << (self.root.k - 2)
+        self.root = self.successor(self.root, j)
+        self.origin_x += quarter
+        self.origin_y += quarter
+        self.generation += 1 << j
+        self.collect_garbage()
+
+    def advance(self, generations):
+        """Przesuwa wzór o dowolną liczbę pokoleń (suma potęg dwójki)."""
+        j = 0
+        while generations:
+            if generations & 1:
+                self.advance_pow2(j)
+            generations >>= 1
+            j += 1
+
+    # ----------------- PAMIĘĆ ----------------- #
+
+    def collect_garbage(self):
+        """
+        Jeśli pamięć podręczna przekroczyła max_nodes, zostawia w niej tylko
+        węzły osiągalne z korzenia i czyści zapamiętane wyniki.
+        """
+        if len(self._nodes) <= self.max_nodes:
+            return
+
+        self._results.clear()
+        nodes = {}
+        stack = [self.root]
+        while stack:
+            m = stack.pop()
+            if m.k == 0:
+                continue
+            key = (m.a, m.b, m.c, m.d)
+            if key in nodes:
+                continue
+            nodes[key] = m
+            stack.extend(key)
+        self._nodes = nodes
+        self._empty = [OFF]
+
+    @property
+    def population(self):
+        return self.root.n
+
+    # ----------------- KONWERSJA ----------------- #
+
+    def _build(self, cells, k) -> Node:
+        """Buduje węzeł poziomu k z kwadratowej tablicy 2^k x 2^k."""
+        if not cells.any():
+            return self.empty(k)
+        if k == 0:
+            return ON
+        half = 1 << (k - 1)
+        return self.join(
+            self._build(cells[:half, :half], k - 1),
+            self._build(cells[:half, half:], k - 1),
+            self._build(cells[half:, :half], k - 1),
+            self._build(cells[half:, half:], k - 1),
+        )
+
+    @classmethod
+    def from_array(cls, cells: np.ndarray, generation=0, **kwargs) -> "HashLife":
+        """Tworzy silnik z tablicy (rows, cols); komórka [0, 0] ma współrzędne (0, 0)."""
+        life = cls(**kwargs)
+        rows, cols = cells.shape
+        k = 3
+        while (1 << k) < max(rows, cols):
+            k += 1
+        square = np.zeros((1 << k, 1 << k), dtype=bool)
+        square[:rows, :cols] = cells != 0
+        life.root = life._build(square, k)
+        life.generation = generation
+        return life
+
+    @classmethod
+    def from_grid(cls, grid, **kwargs) -> "HashLife":
+        """Tworzy silnik z bieżącego stanu planszy (dowolny silnik siatki)."""
+        kwargs.setdefault("rule", grid.rule)
+        return cls.from_array(grid.to_array(), grid.generation, **kwargs)
+
+    def to_array(self, x, y, width, height) -> np.ndarray:
+        """Wycina prostokąt [x, x + width) x [y, y + height) jako tablicę uint8."""
+        out = np.zeros((height, width), dtype=np.uint8)
+        stack = [(self.root, self.origin_x, self.origin_y)]
+        while stack:
+            m, nx, ny = stack.pop()
+            size = 1 << m.k
+            if (
+                m.n == 0
+                or nx >= x + width or ny >= y + height
+                or nx + size <= x or ny + size <= y
+            ):
+                continue
+            if m.k == 0:
+                out[ny - y, nx - x] = 1
+                continue
+            half = size >> 1
+            stack.append((m.a, nx, ny))
+            stack.append((m.b, nx + half, ny))
+            stack.append((m.c, nx, ny + half))
+            stack.append((m.d, nx + half, ny + half))
+        return out
+
+    def write_to(self, grid, x=0, y=0):
+        """Zapisuje widok zaczynający się w (x, y) do planszy o jej rozmiarze."""
+        grid.load_array(self.to_array(x, y, grid.cols, grid.rows))
+        grid.generation = self.generation
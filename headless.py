@@ -0,0 +1,226 @@
+# headless.py
+"""
+Symulacja wsadowa bez pygame i bez okna.
+
+    python headless.py --cols 512 --rows 512 --density 0.3 \\
+        --seed 1 --seeds 100 --generations 1000 --workers 8 --format csv
+
+Korzysta wyłącznie z silników planszy (grid.create_grid), więc startuje
+szybko i działa w minimalnych kontenerach bez ekranu.
+"""
+
+import argparse
+import csv
+import json
+import os
+import sys
+import time
+from multiprocessing import Pool
+
+from boundary import BOUNDARIES
+from cycles import CycleDetector
+from grid import create_grid
+from recorder import Recorder
+from rules import parse_rule
+from snapshot import open_snapshot, save_snapshot
+from soup import SYMMETRIES
+
+ENGINES = ("numpy", "bitpacked", "chunked", "parallel")
+FORMATS = ("text", "json", "csv")
+FIELDS = (
+    "seed", "generations", "alive", "period", "cycle_start",
+    "seconds", "gens_per_sec", "cells_per_sec",
+)
+
+
+def run_seed(
+        seed, cols, rows, density, generations, engine="numpy", max_period=0,
+        record_dir=None, checkpoint_dir=None, checkpoint_every=300.0, resume=None,
+        rule="B3/S23", boundary="dead", symmetry="C1",
+) -> dict:
+    """
+    Losuje planszę dla danego ziarna i liczy zadaną liczbę pokoleń.
+    Przy max_period > 0 kończy wcześniej, gdy plansza wejdzie w cykl.
+    Z record_dir zapisuje przebieg do record_dir/seed-<ziarno>.golrec.
+    Z checkpoint_dir co checkpoint_every sekund (i na końcu) zapisuje
+    migawkę checkpoint_dir/seed-<ziarno>.golsnap; resume wznawia z migawki
+    zamiast losować planszę (z regułą zapisaną w migawce). symmetry
+    to symetria zupy z soup.SYMMETRIES.
+    """
+    if resume:
+        grid = open_snapshot(resume, engine, boundary=boundary)
+        cols, rows = grid.cols, grid.rows
+    else:
+        grid = create_grid(cols, rows, engine, rule=rule, boundary=boundary)
+    detector = CycleDetector(max_period) if max_period else None
+    recorder = None
+    checkpoint = os.path.join(checkpoint_dir, f"seed-{seed}.golsnap") if checkpoint_dir else None
+    try:
+        if not resume:
+            grid.randomize(density, seed=seed, symmetry=symmetry)
+        if record_dir:
+            recorder = Recorder(os.path.join(record_dir, f"seed-{seed}.golrec"), cols, rows)
+            recorder.attach(grid)
+
+        start = time.perf_counter()
+        next_checkpoint = start + checkpoint_every
+        steps = 0
+        for _ in range(generations):
+            steps += 1
+            if detector is None:
+                grid.step()
+            elif detector.step(grid):
+                break
+            if checkpoint and time.perf_counter() >= next_checkpoint:
+                save_snapshot(grid, checkpoint)
+                next_checkpoint = time.perf_counter() + checkpoint_every
+        seconds = time.perf_counter() - start
+        if checkpoint:
+            save_snapshot(grid, checkpoint)
+        alive = grid.alive_count()
+    finally:
+        if recorder is not None:
+            recorder.close()
+        if hasattr(grid, "close"):
+            grid.close()
+
+    gens_per_sec = steps / seconds if seconds > 0 else float("inf")
+    return {
+        "seed": seed,
+        "generations": grid.generation,
+        "alive": alive,
+        "period": detector.period if detector else None,
+        "cycle_start": detector.cycle_start if detector else None,
+        "seconds": seconds,
+        "gens_per_sec": gens_per_sec,
+        "cells_per_sec": gens_per_sec * cols * rows,
+    }
+
+
+def _run_task(args) -> dict:
+    return run_seed(*args)
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Headless Game of Life batch simulation (no pygame)."
+    )
+    parser.add_argument("--cols", type=int, default=256, help="board width in cells")
+    parser.add_argument("--rows", type=int, default=256, help="board height in cells")
+    parser.add_argument("--density", type=float, default=0.25, help="initial alive probability")
+    parser.add_argument("--seed", type=int, default=0, help="first seed")
+    parser.add_argument("--seeds", type=int, default=1, help="number of consecutive seeds")
+    parser.add_argument("--generations", type=int, default=1000, help="generations per seed")
+    parser.add_argument("--engine", choices=ENGINES, default="numpy", help="grid engine")
+    parser.add_argument(
+        "--rule", default="B3/S23",
+        help="rule in B/S notation (e.g. B36/S23) or a preset name (e.g. HighLife)",
+    )
+    parser.add_argument(
+        "--boundary", choices=BOUNDARIES, default="dead",
+        help="what lies beyond the board edges",
+    )
+    parser.add_argument(
+        "--symmetry", choices=SYMMETRIES, default="C1",
+        help="symmetry of the random soup (C4 and D8 need a square board)",
+    )
+    parser.add_argument("--workers", type=int, default=1, help="seeds simulated in parallel")
+    parser.add_argument("--format", choices=FORMATS, default="text", help="output format")
+    parser.add_argument(
+        "--stop-on-cycle", type=int, default=0, metavar="MAX_PERIOD",
+        help="stop a seed once it repeats a state with period <= MAX_PERIOD",
+    )
+    parser.add_argument(
+        "--record", metavar="DIR",
+        help="record every run to DIR/seed-N.golrec (delta-encoded, see recorder.py)",
+    )
+    parser.add_argument(
+        "--checkpoint", metavar="DIR",
+        help="save a board snapshot DIR/seed-N.golsnap periodically and at the end",
+    )
+    parser.add_argument(
+        "--checkpoint-every", type=float, default=300.0, metavar="SECONDS",
+        help="seconds between checkpoints",
+    )
+    parser.add_argument(
+        "--resume", metavar="SNAPSHOT",
+        help="continue from a snapshot instead of a random board (single run)",
+    )
+    args = parser.parse_args(argv)
+
+    try:
+        args.rule = parse_rule(args.rule).notation
+    except ValueError as e:
+        parser.error(str(e))
+
+    if args.symmetry in ("C4", "D8") and args.cols != args.rows:
+        parser.error(f"--symmetry {args.symmetry} needs a square board")
+    if args.resume and args.seeds != 1:
+        parser.error("--resume continues a single run; use --seeds 1")
+    if args.engine == "parallel" and args.workers > 1:
+        parser.error("--engine parallel already uses a process pool; use --workers 1")
+    return args
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    for directory in (args.record, args.checkpoint):
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+    tasks = [
+        (
+            seed, args.cols, args.rows, args.density,
+            args.generations, args.engine, args.stop_on_cycle, args.record,
+            args.checkpoint, args.checkpoint_every, args.resume, args.rule,
+            args.boundary, args.symmetry,
+        )
+        for seed in range(args.seed, args.seed + args.seeds)
+    ]
+
+    start = time.perf_counter()
+    if args.workers > 1:
+        with Pool(args.workers) as pool:
+            results = pool.map(_run_task, tasks)
+    else:
+        results = [_run_task(task) for task in tasks]
+    wall = time.perf_counter() - start
+
+    total_generations = sum(r["gens_per_sec"] * r["seconds"] for r in results)
+    total_cells = sum(r["cells_per_sec"] * r["seconds"] for r in results)
+    summary = {
+        "runs": len(results),
+        "wall_seconds": wall,
+        "gens_per_sec": total_generations / wall if wall > 0 else float("inf"),
+        "cells_per_sec": total_cells / wall if wall > 0 else float("inf"),
+    }
+
+    if args.format == "json":
+        json.dump({"results": results, "summary": summary}, sys.stdout, indent=2)
+        print()
+    elif args.format == "csv":
+        writer = csv.DictWriter(sys.stdout, fieldnames=FIELDS)
+        writer.writeheader()
+        writer.writerows(results)
+        # Podsumowanie na stderr, żeby CSV pozostał czysty
+        print(_format_summary(summary), file=sys.stderr)
+    else:
+        for r in results:
+            cycle = ""
+            if r["period"]:
+                cycle = f", period {r['period']} from gen {r['cycle_start']}"
+            print(
+                f"seed {r['seed']}: gen {r['generations']}, alive {r['alive']}{cycle}, "
+                f"{r['gens_per_sec']:.1f} gen/s, {r['cells_per_sec']:.3g} cells/s"
+            )
+        print(_format_summary(summary))
+
+
+def _format_summary(summary) -> str:
+    return (
+        f"{summary['runs']} runs in {summary['wall_seconds']:.2f} s: "
+        f"{summary['gens_per_sec']:.1f} gen/s, {summary['cells_per_sec']:.3g} cells/s"
+    )
+
+
+if __name__ == "__main__":
+    main()
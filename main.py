@@ -1,6 +1,10 @@
+from multiprocessing import freeze_support
+
 from game import GameApp
 
 
 if __name__ == "__main__":
+    # Potrzebne dla puli procesów w zbudowanym .exe (PyInstaller)
+    freeze_support()
     app = GameApp()
     app.run()
@@ -0,0 +1,127 @@
+# parallel.py
+
+import os
+from multiprocessing import Pool
+from multiprocessing.shared_memory import SharedMemory
+
+import numpy as np
+
+from boundary import halo_window
+from grid import CellGrid, count_changes, next_state
+from rules import CONWAY, parse_rule
+
+# Stan procesu roboczego: podpięta pamięć współdzielona
+_worker = {}
+
+
+def _attach(name, rows, cols):
+    """Inicjalizator procesu roboczego – podpina podwójny bufor planszy."""
+    shm = SharedMemory(name=name)
+    _worker["shm"] = shm
+    _worker["buffers"] = np.ndarray((2, rows, cols), dtype=np.uint8, buffer=shm.buf)
+
+
+def _step_stripe(task) -> tuple[int, int, int]:
+    """
+    Liczy pas wierszy [r0, r1) z bufora src do bufora 1 - src według
+    reguły w notacji B/S. Czyta jeden wiersz ramki (halo) nad i pod pasem,
+    przy krawędziach planszy według warunku brzegowego.
+    Zwraca (narodziny, zgony, XOR kluczy Zobrista) dla pasa.
+    """
+    src, r0, r1, rule, boundary = task
+    buffers = _worker["buffers"]
+    board = buffers[src]
+
+    window = halo_window(board, r0, r1, 0, board.shape[1], boundary)
+    new_stripe = next_state(window, parse_rule(rule))
+
+    changes = count_changes(board[r0:r1], new_stripe, r0, 0, board.shape[1])
+    buffers[1 - src, r0:r1] = new_stripe
+    return changes
+
+
+class ParallelGrid(CellGrid):
+    """
+    Plansza liczona równolegle w pasach poziomych przez pulę procesów.
+
+    Oba pokolenia leżą w multiprocessing.shared_memory (podwójny bufor),
+    więc procesy robocze nigdy nie serializują planszy – dostają tylko
+    numer bufora i zakres wierszy. Wynik jest identyczny jak CellGrid.step.
+    """
+
+    def __init__(self, cols, rows, workers=None, stripe_height=None, rule=CONWAY, boundary="dead"):
+        self.workers = workers or os.cpu_count() or 1
+        if stripe_height is None:
+            # Kilka pasów na proces, żeby wyrównać obciążenie
+            stripe_height = max(1, -(-rows // (self.workers * 4)))
+        self.stripe_height = stripe_height
+
+        self._shm = SharedMemory(create=True, size=max(2 * rows * cols, 1))
+        self._buffers = np.ndarray((2, rows, cols), dtype=np.uint8, buffer=self._shm.buf)
+        self._current = 0
+        self._pool = None
+        try:
+            # Reguła i brzeg sprawdzane przed startem procesów; błędna
+            # nie zostawia po sobie ani puli, ani pamięci współdzielonej
+            super().__init__(cols, rows, rule, boundary)
+            self._pool = Pool(
+                processes=self.workers,
+                initializer=_attach,
+                initargs=(self._shm.name, rows, cols),
+            )
+        except BaseException:
+            self.close()
+            raise
+
+    @property
+    def grid(self) -> np.ndarray:
+        """Bieżące pokolenie – widok na bufor w pamięci współdzielonej."""
+        return self._buffers[self._current]
+
+    @grid.setter
+    def grid(self, cells):
+        self._buffers[self._current][...] = cells
+
+    def step(self) -> bool:
+        """
+        Oblicza kolejne pokolenie równolegle, pas po pasie.
+        Zwraca True, jeśli stan planszy się zmienił, inaczej False.
+        """
+        tasks = [
+            (
+                self._current, r0, min(r0 + self.stripe_height, self.rows),
+                self.rule.notation, self.boundary,
+            )
+            for r0 in range(0, self.rows, self.stripe_height)
+        ]
+        results = self._pool.map(_step_stripe, tasks)
+        births = deaths = hash_delta = 0
+        for born, died, keys in results:
+            births += born
+            deaths += died
+            hash_delta ^= keys
+
+        self._current = 1 - self._current
+        self.generation += 1
+        self._record_step(births, deaths, hash_delta)
+        return self.changed_cells > 0
+
+    def close(self):
+        """Zamyka pulę procesów i zwalnia pamięć współdzieloną."""
+        if self._shm is None:
+            return
+        if self._pool is not None:
+            self._pool.close()
+            self._pool.join()
+            self._pool = None
+
+        self._buffers = None
+        self._shm.close()
+        self._shm.unlink()
+        self._shm = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
@@ -0,0 +1,406 @@
+# patterns.py
+"""
+Wczytywanie i zapis wzorów: RLE (.rle), plaintext (.cells) i Macrocell (.mc).
+
+Parsery zwracają Pattern – zbiór żywych komórek jako tablice współrzędnych,
+budowany operacjami na całych tablicach NumPy (bez wywołań na komórkę).
+RLE jest czytane strumieniowo, porcjami po CHUNK_SIZE bajtów.
+Na planszę wzór trafia jednym load_array (place_pattern).
+"""
+
+import os
+
+import numpy as np
+
+from hashlife import HashLife
+from rules import CONWAY
+
+DEFAULT_RULE = CONWAY.notation
+CHUNK_SIZE = 1 << 20
+RLE_LINE_WIDTH = 70
+LEAF_SIZE = 8  # Macrocell: liście to kwadraty 8x8 (poziom 3)
+
+_DIGITS = b"0123456789"
+_WHITESPACE = b" \t\r\n"
+_POWERS_OF_10 = 10 ** np.arange(19, dtype=np.int64)
+
+
+class Pattern:
+    """
+    Wzór jako zbiór żywych komórek.
+
+    rows, cols to współrzędne względem lewego górnego rogu wzoru,
+    width i height to jego rozmiar (co najmniej prostokąt komórek).
+    """
+
+    def __init__(self, rows, cols, width=None, height=None, rule=DEFAULT_RULE, name=None):
+        self.rows = np.asarray(rows, dtype=np.int64)
+        self.cols = np.asarray(cols, dtype=np.int64)
+        used_w = int(self.cols.max()) + 1 if self.cols.size else 0
+        used_h = int(self.rows.max()) + 1 if self.rows.size else 0
+        self.width = max(width or 0, used_w)
+        self.height = max(height or 0, used_h)
+        self.rule = rule
+        self.name = name
+
+    @property
+    def population(self):
+        return self.rows.size
+
+    def to_array(self) -> np.ndarray:
+        """Zwraca wzór jako tablicę uint8 (height, width)."""
+        cells = np.zeros((self.height, self.width), dtype=np.uint8)
+        cells[self.rows, self.cols] = 1
+        return cells
+
+    @classmethod
+    def from_grid(cls, grid, name=None) -> "Pattern":
+        """Wycina z planszy prostokąt żywych komórek (bounding_box) razem z regułą."""
+        rule = grid.rule.notation
+        box = grid.bounding_box()
+        if box is None:
+            return cls([], [], rule=rule, name=name)
+        c0, r0, c1, r1 = box
+        rows, cols = grid.alive_cells()
+        return cls(rows - r0, cols - c0, c1 - c0, r1 - r0, rule, name)
+
+
+def place_pattern(grid, pattern, x=None, y=None):
+    """
+    Wpisuje wzór na planszę (domyślnie na środek) jednym load_array.
+    Komórki poza planszą są pomijane.
+    """
+    if x is None:
+        x = (grid.cols - pattern.width) // 2
+    if y is None:
+        y = (grid.rows - pattern.height) // 2
+    rows = pattern.rows + y
+    cols = pattern.cols + x
+    inside = (rows >= 0) & (rows < grid.rows) & (cols >= 0) & (cols < grid.cols)
+
+    cells = np.zeros((grid.rows, grid.cols), dtype=np.uint8)
+    cells[rows[inside], cols[inside]] = 1
+    grid.load_array(cells)
+    grid.generation = 0
+
+
+def _expand_runs(run_rows, run_cols, lengths) -> tuple[np.ndarray, np.ndarray]:
+    """Zamienia odcinki (wiersz, kolumna startowa, długość) na współrzędne komórek."""
+    total = int(lengths.sum())
+    starts = np.cumsum(lengths) - lengths
+    offsets = np.arange(total, dtype=np.int64) - np.repeat(starts, lengths)
+    return np.repeat(run_rows, lengths), np.repeat(run_cols, lengths) + offsets
+
+
+def _find_runs(rows, cols) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Grupuje żywe komórki w poziome odcinki: (wiersze, kolumny startowe, długości)."""
+    order = np.lexsort((cols, rows))
+    rows, cols = rows[order], cols[order]
+    if rows.size == 0:
+        return rows, cols, rows
+    new_run = np.ones(rows.size, dtype=bool)
+    new_run[1:] = (rows[1:] != rows[:-1]) | (cols[1:] != cols[:-1] + 1)
+    starts = np.flatnonzero(new_run)
+    lengths = np.diff(np.append(starts, rows.size))
+    return rows[starts], cols[starts], lengths
+
+
+# ----------------- RLE ----------------- #
+
+def _parse_rle_header(line) -> dict:
+    """'x = 3, y = 3, rule = B3/S23' -> {'x': '3', 'y': '3', 'rule': 'B3/S23'}"""
+    fields = {}
+    for part in line.split(","):
+        key, _, value = part.partition("=")
+        fields[key.strip().lower()] = value.strip()
+    return fields
+
+
+def _rle_chunk(body: bytes, row, col):
+    """
+    Dekoduje fragment RLE kończący się znacznikiem (nie cyfrą).
+    Zwraca (wiersze, kolumny startowe, długości odcinków, wiersz, kolumna)
+    – dwie ostatnie wartości to pozycja na początku następnego fragmentu.
+    """
+    data = np.frombuffer(body, dtype=np.uint8)
+    is_digit = (data >= ord("0")) & (data <= ord("9"))
+    tag_pos = np.flatnonzero(~is_digit)
+    tags = data[tag_pos]
+
+    # Liczba przed znacznikiem (domyślnie 1): cyfry składane wagami 10^i
+    counts = np.ones(tag_pos.size, dtype=np.int64)
+    digit_pos = np.flatnonzero(is_digit)
+    if digit_pos.size:
+        # Numer znacznika, do którego należy cyfra = liczba znaczników przed nią
+        owner = np.cumsum(~is_digit)[digit_pos]
+        weights = _POWERS_OF_10[tag_pos[owner] - 1 - digit_pos]
+        digits = (data[digit_pos] - ord("0")).astype(np.int64) * weights
+        # Cyfry jednej liczby leżą obok siebie – sumujemy je grupami
+        groups = np.flatnonzero(np.diff(owner, prepend=-1))
+        counts[owner[groups]] = np.add.reduceat(digits, groups)
+
+    newline = tags == ord("$")
+    row_step = np.where(newline, counts, 0)
+    tag_rows = row + np.cumsum(row_step) - row_step
+
+    # Kolumna startowa: komórki od ostatniego '$' (albo od początku fragmentu)
+    advance = np.where(newline, 0, counts)
+    before = np.cumsum(advance) - advance
+    index = np.arange(tags.size)
+    last_newline = np.maximum.accumulate(np.where(newline, index, -1))
+    base = np.where(last_newline >= 0, before[np.maximum(last_newline, 0)], -col)
+    tag_cols = before - base
+
+    alive = ~newline & (tags != ord("b")) & (tags != ord("."))
+    end_row = row + int(row_step.sum())
+    end_col = int(advance.sum()) - int(base[-1])
+    return tag_rows[alive], tag_cols[alive], counts[alive], end_row, end_col
+
+
+def read_rle(stream) -> Pattern:
+    """Wczytuje wzór RLE ze strumienia binarnego, porcjami."""
+    name = None
+    fields = {}
+    first = b""
+    for raw in stream:
+        line = raw.strip()
+        if not line:
+            continue
+        if line.startswith(b"#"):
+            if line[:2] == b"#N":
+                name = line[2:].strip().decode("utf-8", "replace")
+            continue
+        if line[:1] in (b"x", b"X"):
+            fields = _parse_rle_header(line.decode("ascii", "replace"))
+        else:
+            first = line
+        break
+
+    runs = []
+    row = col = 0
+    carry = first
+    while True:
+        chunk = stream.read(CHUNK_SIZE)
+        buffer = (carry + chunk).translate(None, _WHITESPACE)
+        end = buffer.find(b"!")
+        if end >= 0:
+            buffer = buffer[:end]
+        # Cyfry na końcu należą do znacznika z następnej porcji
+        cut = len(buffer.rstrip(_DIGITS))
+        body, carry = buffer[:cut], buffer[cut:]
+        if body:
+            run_rows, run_cols, lengths, row, col = _rle_chunk(body, row, col)
+            runs.append((run_rows, run_cols, lengths))
+        if not chunk or end >= 0:
+            break
+
+    if runs:
+        rows, cols = _expand_runs(*(np.concatenate(part) for part in zip(*runs)))
+    else:
+        rows = cols = np.empty(0, dtype=np.int64)
+    return Pattern(
+        rows, cols,
+        int(fields.get("x", 0) or 0), int(fields.get("y", 0) or 0),
+        fields.get("rule", DEFAULT_RULE), name,
+    )
+
+
+def write_rle(stream, pattern):
+    """Zapisuje wzór w RLE (strumień tekstowy), linie do RLE_LINE_WIDTH znaków."""
+    if pattern.name:
+        stream.write(f"#N {pattern.name}\n")
+    stream.write(f"x = {pattern.width}, y = {pattern.height}, rule = {pattern.rule}\n")
+
+    # Każdy odcinek to do trzech znaczników: skok wierszy '$', przerwa 'b', odcinek 'o'
+    run_rows, run_cols, lengths = _find_runs(pattern.rows, pattern.cols)
+    jumps = np.diff(run_rows, prepend=0)
+    run_ends = run_cols + lengths
+    gaps = run_cols - np.where(jumps > 0, 0, np.concatenate(([0], run_ends[:-1])))
+    counts = np.stack((jumps, gaps, lengths), axis=1).reshape(-1)
+    tags = np.tile(np.array(["$", "b", "o"]), run_rows.size)
+    used = counts > 0
+    tokens = [
+        f"{n}{t}" if n > 1 else t
+        for n, t in zip(counts[used].tolist(), tags[used].tolist())
+    ]
+    tokens.append("!")
+
+    # Łamanie linii: najdłuższy ciąg znaczników mieszczący się w RLE_LINE_WIDTH
+    ends = np.cumsum(np.fromiter(map(len, tokens), dtype=np.int64, count=len(tokens)))
+    start = 0
+    while start < len(tokens):
+        base = ends[start - 1] if start else 0
+        stop = max(int(np.searchsorted(ends, base + RLE_LINE_WIDTH, side="right")), start + 1)
+        stream.write("".join(tokens[start:stop]) + "\n")
+        start = stop
+
+
+# ----------------- PLAINTEXT ----------------- #
+
+def read_cells(stream) -> Pattern:
+    """Wczytuje wzór w formacie plaintext (.cells): '.' martwa, 'O' żywa."""
+    name = None
+    row_parts = []
+    col_parts = []
+    row = 0
+    for raw in stream:
+        line = raw.rstrip(b"\r\n")
+        if line.startswith(b"!"):
+            if line[:6] == b"!Name:":
+                name = line[6:].strip().decode("utf-8", "replace")
+            continue
+        data = np.frombuffer(line, dtype=np.uint8)
+        cols = np.flatnonzero((data == ord("O")) | (data == ord("*")))
+        if cols.size:
+            col_parts.append(cols)
+            row_parts.append(np.full(cols.size, row, dtype=np.int64))
+        row += 1
+
+    if row_parts:
+        return Pattern(np.concatenate(row_parts), np.concatenate(col_parts), name=name)
+    return Pattern([], [], name=name)
+
+
+def write_cells(stream, pattern):
+    """Zapisuje wzór w formacie plaintext (.cells)."""
+    if pattern.name:
+        stream.write(f"!Name: {pattern.name}\n")
+    text = np.full((pattern.height, pattern.width), ord("."), dtype=np.uint8)
+    text[pattern.rows, pattern.cols] = ord("O")
+    for line in text:
+        stream.write(line.tobytes().decode("ascii").rstrip(".") + "\n")
+
+
+# ----------------- MACROCELL ----------------- #
+
+def read_macrocell(stream) -> Pattern:
+    """
+    Wczytuje wzór Macrocell (.mc) – drzewo czwórkowe z narzędzi HashLife.
+    Węzły trafiają do HashLife (współdzielone), a komórki są wypisywane
+    całymi liśćmi 8x8, bez schodzenia do pojedynczych komórek.
+    """
+    life = HashLife()
+    nodes = [None]  # numeracja od 1; 0 = pusty węzeł
+    leaves = {}
+    rule = DEFAULT_RULE
+
+    for raw in stream:
+        line = raw.strip()
+        if not line or line.startswith(b"[M2]"):
+            continue
+        if line.startswith(b"#"):
+            if line[:2] == b"#R":
+                rule = line[2:].strip().decode("ascii", "replace")
+            continue
+        if line[:1] in b".*$":
+            # Liść 8x8: wiersze zakończone '$', '*' = żywa
+            leaf = np.zeros((LEAF_SIZE, LEAF_SIZE), dtype=np.uint8)
+            for r, text in enumerate(line.split(b"$")[:LEAF_SIZE]):
+                data = np.frombuffer(text, dtype=np.uint8)
+                leaf[r, np.flatnonzero(data == ord("*"))] = 1
+            node = life._build(leaf, 3)
+            leaves[node] = leaf
+        else:
+            k, *children = (int(v) for v in line.split())
+            node = life.join(*(
+                nodes[i] if i else life.empty(k - 1) for i in children
+            ))
+        nodes.append(node)
+
+    root = nodes[-1] if len(nodes) > 1 else life.empty(3)
+    row_parts = []
+    col_parts = []
+    stack = [(root, 0, 0)]
+    while stack:
+        m, x, y = stack.pop()
+        if m.n == 0:
+            continue
+        if m.k == 3:
+            r, c = np.nonzero(leaves[m])
+            row_parts.append(r + y)
+            col_parts.append(c + x)
+            continue
+        half = 1 << (m.k - 1)
+        stack.extend(((m.a, x, y), (m.b, x + half, y), (m.c, x, y + half), (m.d, x + half, y + half)))
+
+    if not row_parts:
+        return Pattern([], [], rule=rule)
+    rows = np.concatenate(row_parts).astype(np.int64)
+    cols = np.concatenate(col_parts).astype(np.int64)
+    return Pattern(rows - rows.min(), cols - cols.min(), rule=rule)
+
+
+def write_macrocell(stream, pattern):
+    """Zapisuje wzór jako Macrocell: węzły HashLife po kolei, liście 8x8."""
+    life = HashLife.from_array(pattern.to_array())
+    stream.write("[M2] (game of life)\n")
+    stream.write(f"#R {pattern.rule}\n")
+
+    numbers = {}
+
+    def number(m) -> int:
+        if m.n == 0:
+            return 0
+        found = numbers.get(m)
+        if found is not None:
+            return found
+        if m.k == 3:
+            rows = [
+                "".join("*" if v else "." for v in r).rstrip(".")
+                for r in _leaf_array(m).tolist()
+            ]
+            line = "$".join(rows).rstrip("$") + "$"
+        else:
+            line = f"{m.k} {number(m.a)} {number(m.b)} {number(m.c)} {number(m.d)}"
+        stream.write(line + "\n")
+        numbers[m] = len(numbers) + 1
+        return numbers[m]
+
+    if number(life.root) == 0:
+        stream.write("$\n")
+
+
+def _leaf_array(m) -> np.ndarray:
+    """Rozwija węzeł poziomu 3 do tablicy 8x8."""
+    leaf = np.zeros((LEAF_SIZE, LEAF_SIZE), dtype=np.uint8)
+    stack = [(m, 0, 0)]
+    while stack:
+        node, x, y = stack.pop()
+        if node.n == 0:
+            continue
+        if node.k == 0:
+            leaf[y, x] = 1
+            continue
+        half = 1 << (node.k - 1)
+        stack.extend((
+            (node.a, x, y), (node.b, x + half, y),
+            (node.c, x, y + half), (node.d, x + half, y + half),
+        ))
+    return leaf
+
+
+# ----------------- PLIKI ----------------- #
+
+READERS = {".rle": read_rle, ".cells": read_cells, ".mc": read_macrocell}
+WRITERS = {".rle": write_rle, ".cells": write_cells, ".mc": write_macrocell}
+
+
+def read_pattern(path) -> Pattern:
+    """Wczytuje wzór z pliku; format wynika z rozszerzenia."""
+    ext = os.path.splitext(path)[1].lower()
+    if ext not in READERS:
+        raise ValueError(f"Unknown pattern format: {path}")
+    with open(path, "rb") as stream:
+        pattern = READERS[ext](stream)
+    if pattern.name is None:
+        pattern.name = os.path.splitext(os.path.basename(path))[0]
+    return pattern
+
+
+def write_pattern(path, pattern):
+    """Zapisuje wzór do pliku; format wynika z rozszerzenia."""
+    ext = os.path.splitext(path)[1].lower()
+    if ext not in WRITERS:
+        raise ValueError(f"Unknown pattern format: {path}")
+    with open(path, "w", encoding="utf-8", newline="\n") as stream:
+        WRITERS[ext](stream, pattern)
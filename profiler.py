@@ -0,0 +1,199 @@
+# profiler.py
+"""
+Pomiar czasu faz pętli gry (zdarzenia, krok symulacji, rysowanie, flip).
+
+Profiler owija metody konkretnego obiektu (atrybut instancji zasłania
+metodę klasy), więc gdy jest odłączony, wywołania idą prosto do metod
+klasy i nic nie kosztują. Czasy trafiają do buforów cyklicznych
+o stałej pojemności; statystyki (p50/p99, pokolenia na sekundę, czas
+klatki) liczone są dopiero na żądanie.
+
+Zebrane próbki można zapisać jako JSON albo w formacie Chrome trace
+(chrome://tracing, Perfetto).
+"""
+
+import functools
+import json
+import os
+import threading
+import time
+
+import numpy as np
+
+# Faza z czasem między kolejnymi klatkami (attach_frame)
+FRAME = "frame"
+
+
+class RingBuffer:
+    """Ostatnie capacity próbek (początek, czas trwania, wątek)."""
+
+    def __init__(self, capacity):
+        self.capacity = capacity
+        self.starts = [0.0] * capacity
+        self.durations = [0.0] * capacity
+        self.threads = [0] * capacity
+        self.count = 0  # wszystkie próbki od początku
+
+    def add(self, start, duration, thread=0):
+        i = self.count % self.capacity
+        self.starts[i] = start
+        self.durations[i] = duration
+        self.threads[i] = thread
+        self.count += 1
+
+    def samples(self) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """(początki, czasy, wątki) od najstarszej do najnowszej próbki."""
+        n = min(self.count, self.capacity)
+        shift = -(self.count % self.capacity) if self.count > self.capacity else 0
+        return (
+            np.roll(np.array(self.starts[:n]), shift),
+            np.roll(np.array(self.durations[:n]), shift),
+            np.roll(np.array(self.threads[:n], dtype=np.int64), shift),
+        )
+
+    def clear(self):
+        self.count = 0
+
+
+class Profiler:
+    """
+    Zbiera czasy faz w buforach cyklicznych (po capacity próbek na fazę).
+
+    attach(obj, {"metoda": "faza"}) owija metody obiektu, detach()
+    przywraca oryginały. Czasy są w sekundach od time.perf_counter().
+    """
+
+    def __init__(self, capacity=1024):
+        self.capacity = capacity
+        self.phases = {}
+        self._wrapped = []
+
+    @property
+    def attached(self) -> bool:
+        return bool(self._wrapped)
+
+    def _buffer(self, phase) -> RingBuffer:
+        if phase not in self.phases:
+            self.phases[phase] = RingBuffer(self.capacity)
+        return self.phases[phase]
+
+    def _wrap(self, obj, name, wrapper):
+        original = getattr(obj, name)
+        setattr(obj, name, functools.wraps(original)(wrapper(original)))
+        self._wrapped.append((obj, name))
+
+    def attach(self, obj, methods: dict):
+        """Owija metody obiektu: {nazwa metody: nazwa fazy}."""
+        perf_counter = time.perf_counter
+        get_ident = threading.get_ident
+
+        for name, phase in methods.items():
+            add = self._buffer(phase).add
+
+            def wrapper(func, add=add):
+                def timed(*args, **kwargs):
+                    start = perf_counter()
+                    try:
+                        return func(*args, **kwargs)
+                    finally:
+                        add(start, perf_counter() - start, get_ident())
+                return timed
+
+            self._wrap(obj, name, wrapper)
+
+    def attach_frame(self, obj, name):
+        """Mierzy czas klatki jako odstęp między kolejnymi wywołaniami metody."""
+        perf_counter = time.perf_counter
+        add = self._buffer(FRAME).add
+        last = [None]
+
+        def wrapper(func):
+            def marked(*args, **kwargs):
+                now = perf_counter()
+                if last[0] is not None:
+                    add(last[0], now - last[0])
+                last[0] = now
+                return func(*args, **kwargs)
+            return marked
+
+        self._wrap(obj, name, wrapper)
+
+    def detach(self):
+        """Przywraca metody klas (usuwa atrybuty instancji)."""
+        for obj, name in reversed(self._wrapped):
+            obj.__dict__.pop(name, None)
+        self._wrapped = []
+
+    def clear(self):
+        for buffer in self.phases.values():
+            buffer.clear()
+
+    # ----------------- STATYSTYKI ----------------- #
+
+    def rate(self, phase, window=1.0) -> float:
+        """Wywołania fazy na sekundę w ostatnich window sekundach."""
+        buffer = self.phases.get(phase)
+        if buffer is None or buffer.count == 0:
+            return 0.0
+        starts = buffer.samples()[0]
+        now = time.perf_counter()
+        recent = starts[starts >= now - window]
+        if recent.size == starts.size and buffer.count > buffer.capacity:
+            # Bufor nie sięga window sekund wstecz – liczymy po jego zakresie
+            span = now - starts[0]
+            return recent.size / span if span > 0 else 0.0
+        return recent.size / window
+
+    def stats(self) -> dict:
+        """{faza: {count, mean_ms, p50_ms, p99_ms, max_ms}} dla próbek w buforach."""
+        result = {}
+        for phase, buffer in self.phases.items():
+            if buffer.count == 0:
+                continue
+            durations = buffer.samples()[1] * 1000
+            p50, p99 = np.percentile(durations, (50, 99))
+            result[phase] = {
+                "count": buffer.count,
+                "mean_ms": float(durations.mean()),
+                "p50_ms": float(p50),
+                "p99_ms": float(p99),
+                "max_ms": float(durations.max()),
+            }
+        return result
+
+    # ----------------- EKSPORT ----------------- #
+
+    def save_json(self, path, **extra):
+        """Zapisuje statystyki i próbki [początek, czas trwania] w sekundach."""
+        data = {
+            "stats": self.stats(),
+            "samples": {
+                phase: np.column_stack(buffer.samples()[:2]).tolist()
+                for phase, buffer in self.phases.items()
+            },
+            **extra,
+        }
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(data, f, indent=2)
+
+    def save_chrome_trace(self, path):
+        """Zapisuje próbki jako zdarzenia "X" formatu Chrome trace (mikrosekundy)."""
+        pid = os.getpid()
+        threads = {}
+        events = []
+        for phase, buffer in self.phases.items():
+            starts, durations, idents = buffer.samples()
+            for start, duration, ident in zip(starts.tolist(), durations.tolist(), idents.tolist()):
+                # Czas klatki na osobnym torze, wątki kolejno od 1
+                tid = 0 if phase == FRAME else threads.setdefault(ident, len(threads) + 1)
+                events.append({
+                    "name": phase,
+                    "ph": "X",
+                    "ts": start * 1e6,
+                    "dur": duration * 1e6,
+                    "pid": pid,
+                    "tid": tid,
+                })
+        events.sort(key=lambda e: (e["ts"], -e["dur"]))
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, f)
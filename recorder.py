@@ -0,0 +1,279 @@
+# recorder.py
+"""
+Zapis i odtwarzanie przebiegu symulacji.
+
+Format pliku (liczby little-endian):
+
+    nagłówek:  MAGIC, cols, rows, keyframe_interval
+    segment:   pierwsze pokolenie, liczba klatek, rozmiar danych
+               + dane skompresowane zlib:
+                 klatka kluczowa (np.packbits całej planszy)
+                 i kolejne delty: liczba zmienionych komórek
+                 i odstępy między ich indeksami (row * cols + col)
+
+Delta to zbiór komórek, które się przełączyły (narodziny i zgony),
+więc odtworzenie pokolenia to XOR z poprzednim. Każdy segment zaczyna
+się klatką kluczową, więc odtwarzacz dekoduje najwyżej jeden segment,
+żeby przeskoczyć do dowolnego pokolenia. Rejestrator trzyma w pamięci
+tylko bieżący segment (skompresowany) i poprzedni stan planszy.
+"""
+
+import bisect
+import struct
+import zlib
+
+import numpy as np
+
+from bitgrid import _set_bits
+
+MAGIC = b"GOLREC\x00\x01"
+HEADER = struct.Struct("<8sIII")
+SEGMENT = struct.Struct("<QII")
+COUNT = struct.Struct("<I")
+
+# Limit surowych danych segmentu – przy dużych zmianach klatka kluczowa wcześniej
+MAX_SEGMENT_BYTES = 32 * 1024 * 1024
+
+
+def _encode_delta(indices: np.ndarray) -> bytes:
+    """Posortowane indeksy jako liczba + odstępy (małe liczby dobrze się kompresują)."""
+    gaps = np.diff(indices, prepend=0).astype("<u4")
+    return COUNT.pack(indices.size) + gaps.tobytes()
+
+
+def _decode_delta(data, offset) -> tuple[np.ndarray, int]:
+    """Odwrotność _encode_delta; zwraca (indeksy, offset za deltą)."""
+    (count,) = COUNT.unpack_from(data, offset)
+    offset += COUNT.size
+    gaps = np.frombuffer(data, dtype="<u4", count=count, offset=offset)
+    return np.cumsum(gaps, dtype=np.int64), offset + 4 * count
+
+
+class Recorder:
+    """
+    Strumieniowy zapis kolejnych pokoleń do pliku.
+
+    Podpina się jako słuchacz kroku planszy (grid.step_listeners),
+    a record() można też wywołać ręcznie, np. dla stanu początkowego.
+    Skok pokolenia (HashLife, przewinięcie) zaczyna nowy segment
+    od klatki kluczowej.
+    """
+
+    def __init__(self, path, cols, rows, keyframe_interval=256, level=6):
+        self.path = path
+        self.cols = cols
+        self.rows = rows
+        self.keyframe_interval = keyframe_interval
+        self.level = level
+
+        self._file = open(path, "wb")
+        self._file.write(HEADER.pack(MAGIC, cols, rows, keyframe_interval))
+
+        self._compressor = None
+        self._chunks = []
+        self._raw_bytes = 0
+        self._start = 0
+        self._frames = 0
+
+        self.generation = None
+        self._previous = None
+        self._previous_hash = None
+
+    # ----------------- ZAPIS ----------------- #
+
+    def attach(self, grid):
+        """Zapisuje bieżący stan planszy i nagrywa każde kolejne pokolenie."""
+        self.record(grid)
+        grid.step_listeners.append(self.record)
+
+    def detach(self, grid):
+        if self.record in grid.step_listeners:
+            grid.step_listeners.remove(self.record)
+
+    def record(self, grid):
+        """Dopisuje stan planszy jako deltę albo klatkę kluczową."""
+        if (
+            self._compressor is None
+            or grid.generation != self.generation + 1
+            or self._frames >= self.keyframe_interval
+            or self._raw_bytes >= MAX_SEGMENT_BYTES
+        ):
+            self.flush()
+            self._begin_segment(grid)
+            self._previous = self._snapshot(grid)
+        elif grid.board_hash == self._previous_hash and not grid.changed_cells:
+            # Plansza bez zmian – pusta delta bez kopiowania i porównywania tablic
+            self._write(_encode_delta(np.empty(0, dtype=np.int64)))
+        else:
+            snapshot = self._snapshot(grid)
+            self._write(_encode_delta(self._changed(self._previous, snapshot)))
+            self._previous = snapshot
+
+        self._frames += 1
+        self.generation = grid.generation
+        self._previous_hash = grid.board_hash
+
+    def flush(self):
+        """Zamyka bieżący segment i zapisuje go na dysk."""
+        if self._compressor is None:
+            return
+        self._chunks.append(self._compressor.flush())
+        data = b"".join(self._chunks)
+        self._file.write(SEGMENT.pack(self._start, self._frames, len(data)))
+        self._file.write(data)
+        self._file.flush()
+
+        self._compressor = None
+        self._chunks = []
+
+    def close(self):
+        if self._file.closed:
+            return
+        self.flush()
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def _begin_segment(self, grid):
+        self._compressor = zlib.compressobj(self.level)
+        self._raw_bytes = 0
+        self._start = grid.generation
+        self._frames = 0
+        self._write(np.packbits(grid.to_array() != 0).tobytes())
+
+    def _write(self, raw: bytes):
+        self._raw_bytes += len(raw)
+        chunk = self._compressor.compress(raw)
+        if chunk:
+            self._chunks.append(chunk)
+
+    def _snapshot(self, grid) -> np.ndarray:
+        # BitPackedGrid porównujemy na słowach – bez rozpakowywania planszy
+        if hasattr(grid, "words"):
+            return grid.words.copy()
+        return grid.to_array().copy()
+
+    def _changed(self, previous: np.ndarray, current: np.ndarray) -> np.ndarray:
+        """Posortowane indeksy komórek, które zmieniły stan."""
+        if current.dtype == np.uint64:
+            rows, cols = _set_bits(previous ^ current)
+            return rows.astype(np.int64) * self.cols + cols
+        return np.flatnonzero(previous != current)
+
+
+class RecordingPlayer:
+    """
+    Odtwarzanie nagrania z przewijaniem do dowolnego pokolenia.
+
+    Indeks segmentów powstaje z samych nagłówków (bez dekompresji).
+    Segment zapisany później wygrywa od swojego pierwszego pokolenia –
+    tak nagranie wznowione po przewinięciu wstecz nadpisuje starą gałąź.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._file = open(path, "rb")
+        magic, self.cols, self.rows, self.keyframe_interval = HEADER.unpack(
+            self._file.read(HEADER.size)
+        )
+        if magic != MAGIC:
+            raise ValueError(f"Not a Game of Life recording: {path}")
+
+        # (pierwsze pokolenie, ostatnie pokolenie, offset danych, rozmiar)
+        self._index = []
+        self._scan_offset = HEADER.size
+        self.refresh()
+
+        self._segment = None
+        self._data = None
+        self._cells = None
+        self._generation = None
+        self._offset = 0
+
+    @property
+    def first_generation(self):
+        return self._index[0][0] if self._index else None
+
+    @property
+    def last_generation(self):
+        return self._index[-1][1] if self._index else None
+
+    def refresh(self):
+        """Dopisuje do indeksu segmenty dodane od ostatniego odczytu."""
+        self._file.seek(0, 2)
+        size = self._file.tell()
+        offset = self._scan_offset
+        while offset + SEGMENT.size <= size:
+            self._file.seek(offset)
+            start, frames, length = SEGMENT.unpack(self._file.read(SEGMENT.size))
+            data_offset = offset + SEGMENT.size
+            if data_offset + length > size:
+                break  # segment jeszcze niedopisany
+            while self._index and self._index[-1][0] >= start:
+                self._index.pop()
+            if self._index and self._index[-1][1] >= start:
+                first, _, old_offset, old_length = self._index[-1]
+                self._index[-1] = (first, start - 1, old_offset, old_length)
+            self._index.append((start, start + frames - 1, data_offset, length))
+            offset = data_offset + length
+        self._scan_offset = offset
+        self._segment = None
+
+    def nearest(self, generation, direction=-1) -> int | None:
+        """
+        Nagrane pokolenie najbliższe generation: ono samo, a gdy wypada
+        w luce między segmentami (np. po skoku HashLife) – pierwsze nagrane
+        w kierunku direction (-1 wstecz, 1 do przodu). None, gdy takiego nie ma.
+        """
+        starts = [entry[0] for entry in self._index]
+        position = bisect.bisect_right(starts, generation) - 1
+        if position >= 0 and generation <= self._index[position][1]:
+            return generation
+        if direction < 0:
+            return self._index[position][1] if position >= 0 else None
+        return self._index[position + 1][0] if position + 1 < len(self._index) else None
+
+    def frame(self, generation) -> np.ndarray:
+        """Zwraca planszę (rows, cols) uint8 w danym pokoleniu."""
+        starts = [entry[0] for entry in self._index]
+        position = bisect.bisect_right(starts, generation) - 1
+        if position < 0 or generation > self._index[position][1]:
+            raise IndexError(f"Generation {generation} is not in the recording")
+
+        entry = self._index[position]
+        if entry != self._segment or generation < self._generation:
+            self._load_segment(entry)
+
+        # Do przodu w obrębie segmentu – tylko kolejne delty
+        flat = self._cells.reshape(-1)
+        while self._generation < generation:
+            indices, self._offset = _decode_delta(self._data, self._offset)
+            flat[indices] ^= 1
+            self._generation += 1
+        return self._cells.copy()
+
+    def _load_segment(self, entry):
+        start, _, offset, length = entry
+        self._file.seek(offset)
+        self._data = zlib.decompress(self._file.read(length))
+
+        cells = self.rows * self.cols
+        keyframe = (cells + 7) // 8
+        bits = np.frombuffer(self._data, dtype=np.uint8, count=keyframe)
+        self._cells = np.unpackbits(bits, count=cells).reshape(self.rows, self.cols)
+        self._offset = keyframe
+        self._generation = start
+        self._segment = entry
+
+    def close(self):
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
@@ -0,0 +1,205 @@
+import numpy as np
+import pygame
+
+from camera import Camera
+from graphics import GraphicsManager, SPRITE_MIN_CELL
+
+
+class BoardRenderer:
+    """
+    Trwała powierzchnia widoku planszy odświeżana przyrostowo.
+
+    Rysuje tylko fragment planszy widoczny przez kamerę i dostaje tylko ten
+    fragment (grid.view), więc koszt zależy od rozmiaru widoku, a nie
+    planszy. Pamięta pokazany fragment i przy niezmienionej kamerze
+    przerysowuje tylko komórki, które się zmieniły.
+    update() zwraca listę prostokątów dla pygame.display.update(rects).
+
+    Przy powiększeniu poniżej 1 piksela na komórkę plansza jest zmniejszana
+    wektorowo (maksimum z bloków k x k) i wpisywana wprost w piksele.
+
+    W trybie pixel_mode małe komórki (za małe na sprite'y) też są wpisywane
+    wprost w piksele: tablica planszy jest powiększana przez broadcasting
+    i zapisywana przez surfarray, więc czas klatki nie zależy od liczby
+    żywych komórek. Duże komórki nadal rysujemy sprite'ami.
+    """
+
+    def __init__(self, graphics: GraphicsManager, camera: Camera, pixel_mode: bool = False):
+        self.graphics = graphics
+        self.camera = camera
+        self.pixel_mode = pixel_mode
+        self.surface = pygame.Surface((camera.view_width, camera.view_height)).convert()
+
+        self.base = None
+        self._view = None
+        self._shown = None
+        self._shown_frame = None
+
+    def invalidate(self):
+        """Wymusza pełne przerysowanie przy następnym update()."""
+        self._shown = None
+
+    def _sync_view(self):
+        """Dopasowuje warstwę bazową do kamery; zmiana widoku = pełne przerysowanie."""
+        camera = self.camera
+        self.graphics.configure(cell_size=camera.cell_pixels)
+        name = "board" if camera.zoom >= 1 else "background"
+        base = self.graphics.get_layer(name)
+
+        view = camera.state()
+        if base is not self.base or view != self._view:
+            self.base = base
+            self._view = view
+            self.invalidate()
+
+    def update(
+            self, cells: np.ndarray, frame_index: int, fallback_color: tuple[int, int, int],
+            offset: tuple[int, int] = (0, 0),
+    ) -> list[pygame.Rect]:
+        """
+        Dopasowuje powierzchnię do komórek; zwraca zmienione prostokąty.
+
+        cells to fragment planszy – zwykle grid.view() zakresu
+        camera.visible_range() – którego komórka [0, 0] leży na planszy
+        w (kolumna, wiersz) = offset; cała plansza to offset (0, 0).
+        Fragment, który nie pokrywa widoku (np. opublikowany przed ruchem
+        kamery), jest pomijany do następnej klatki.
+        """
+        self._sync_view()
+        visible = self._visible(cells, offset)
+        if visible is None:
+            return []
+        if self.camera.zoom < 1:
+            return self._update_downsampled(visible, fallback_color)
+        if self.pixel_mode and self.camera.cell_pixels < SPRITE_MIN_CELL:
+            return self._update_pixels(visible, fallback_color)
+        return self._update_cells(visible, frame_index, fallback_color)
+
+    def _visible(self, cells, offset) -> np.ndarray | None:
+        """Wycinek fragmentu w zakresie camera.visible_range() albo None, gdy go nie pokrywa."""
+        c0, c1, r0, r1 = self.camera.visible_range()
+        ox, oy = offset
+        rows, cols = cells.shape
+        if c0 < ox or r0 < oy or c1 - ox > cols or r1 - oy > rows:
+            return None
+        return cells[r0 - oy:r1 - oy, c0 - ox:c1 - ox]
+
+    # ----------------- KOMÓRKI >= 1 PIKSEL ----------------- #
+
+    def _update_cells(self, visible, frame_index, fallback_color) -> list[pygame.Rect]:
+        c0, _, r0, _ = self.camera.visible_range()
+        # Piksel widoku, od którego zaczyna się widoczny wycinek
+        origin = self.camera.cell_to_screen(c0, r0)
+
+        if self._shown is None:
+            # Pełne przerysowanie widoku
+            self.surface.blit(self.base, (0, 0))
+            rows, cols = np.nonzero(visible)
+            self.graphics.draw_cells(
+                self.surface, rows, cols, frame_index, fallback_color, origin
+            )
+            self._shown = visible.copy()
+            self._shown_frame = frame_index
+            return [self.surface.get_rect()]
+
+        if frame_index != self._shown_frame:
+            # Nowa klatka animacji – przerysować trzeba wszystkie żywe komórki
+            rows, cols = np.nonzero(visible | self._shown)
+            self._shown_frame = frame_index
+        else:
+            rows, cols = np.nonzero(visible != self._shown)
+
+        size = self.graphics.cell_size
+        xs = (cols * size + origin[0]).tolist()
+        ys = (rows * size + origin[1]).tolist()
+        rects = [pygame.Rect(x, y, size, size) for x, y in zip(xs, ys)]
+
+        # Najpierw czyste pola z tła, potem żywe komórki – po jednym blits
+        self.surface.blits([(self.base, rect, rect) for rect in rects], doreturn=False)
+        alive = visible[rows, cols] != 0
+        self.graphics.draw_cells(
+            self.surface, rows[alive], cols[alive], frame_index, fallback_color, origin
+        )
+
+        self._shown[rows, cols] = visible[rows, cols]
+        return rects
+
+    # ----------------- MAŁE KOMÓRKI: BEZPOŚREDNIO W PIKSELE ----------------- #
+
+    def _update_pixels(self, visible, fallback_color) -> list[pygame.Rect]:
+        c0, _, r0, _ = self.camera.visible_range()
+        ox, oy = self.camera.cell_to_screen(c0, r0)
+        size = self.graphics.cell_size
+
+        # Zakres do odświeżenia: cały widok albo prostokąt otaczający zmiany
+        if self._shown is None:
+            y0, y1, x0, x1 = 0, visible.shape[0], 0, visible.shape[1]
+        else:
+            diff = visible != self._shown
+            changed_rows = np.flatnonzero(diff.any(axis=1))
+            if changed_rows.size == 0:
+                return []
+            changed_cols = np.flatnonzero(diff.any(axis=0))
+            y0, y1 = changed_rows[0], changed_rows[-1] + 1
+            x0, x1 = changed_cols[0], changed_cols[-1] + 1
+
+        view = self.surface.get_rect()
+        rect = pygame.Rect(ox + x0 * size, oy + y0 * size, (x1 - x0) * size, (y1 - y0) * size)
+        clipped = rect.clip(view)
+        if self._shown is None:
+            self.surface.blit(self.base, (0, 0))
+            dirty = view
+        else:
+            self.surface.blit(self.base, clipped, clipped)
+            dirty = clipped
+
+        if clipped.width and clipped.height:
+            # Maska jednej komórki – bez pierwszego wiersza/kolumny, gdy widać siatkę
+            tile = np.ones((size, size), dtype=bool)
+            if self.graphics.show_grid:
+                tile[0, :] = False
+                tile[:, 0] = False
+
+            block = visible[y0:y1, x0:x1] != 0
+            h, w = block.shape
+            mask = (block[:, None, :, None] & tile[None, :, None, :]).reshape(h * size, w * size)
+            mask = mask[
+                clipped.top - rect.top:clipped.bottom - rect.top,
+                clipped.left - rect.left:clipped.right - rect.left,
+            ]
+
+            color = self.surface.map_rgb(fallback_color)
+            pixels = pygame.surfarray.pixels2d(self.surface)
+            pixels[clipped.left:clipped.right, clipped.top:clipped.bottom][mask.T] = color
+            del pixels  # zwalnia blokadę powierzchni
+
+        self._shown = visible.copy()
+        return [dirty]
+
+    # ----------------- KOMÓRKI < 1 PIKSEL ----------------- #
+
+    def _update_downsampled(self, visible, fallback_color) -> list[pygame.Rect]:
+        camera = self.camera
+        k = camera.cells_per_pixel
+        c0, c1, r0, r1 = camera.visible_range()
+
+        # Wycinek dopełniony zerami do wielokrotności k, wyrównany do początku widoku
+        px0, py0 = camera.cell_to_screen(c0, r0)
+        width = min(-(-(c1 - c0) // k), camera.view_width - px0)
+        height = min(-(-(r1 - r0) // k), camera.view_height - py0)
+        block = np.zeros((height * k, width * k), dtype=bool)
+        visible = visible[:height * k, :width * k]
+        block[:visible.shape[0], :visible.shape[1]] = visible != 0
+        reduced = block.reshape(height, k, width, k).any(axis=(1, 3))
+
+        if self._shown is not None and np.array_equal(reduced, self._shown):
+            return []
+
+        self.surface.blit(self.base, (0, 0))
+        if reduced.any():
+            color = self.surface.map_rgb(fallback_color)
+            pixels = pygame.surfarray.pixels2d(self.surface)
+            pixels[px0:px0 + width, py0:py0 + height][reduced.T] = color
+            del pixels  # zwalnia blokadę powierzchni
+        self._shown = reduced
+        return [self.surface.get_rect()]
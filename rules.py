@@ -0,0 +1,217 @@
+# rules.py
+"""
+Reguły typu Life w notacji B/S (np. B3/S23 – Conway, B36/S23 – HighLife).
+
+Rule kompiluje regułę raz, przy tworzeniu:
+- table[stan, liczba_sąsiadów] – tablica 2 x 9 dla silników NumPy,
+- neighbourhood[indeks 3x3] – 512 wpisów dla HashLife (bit 4 = środek),
+- implicants – zminimalizowana suma iloczynów bitów licznika sąsiadów
+  dla silnika bitowego (SWAR), tak że Conway kosztuje tyle samo operacji
+  co wzór wpisany na sztywno.
+"""
+
+import re
+from functools import lru_cache
+
+import numpy as np
+
+# Zmienne funkcji logicznej dla SWAR: stan komórki i bity licznika sąsiadów
+SWAR_VARS = ("alive", "sum0", "sum1", "sum2", "sum3")
+
+# Porównania z licznikiem są szybsze od odczytu z tablicy, gdy jest ich niewiele
+MAX_COMPARISONS = 4
+
+_NOTATION = re.compile(r"^B([0-8]*)/?S([0-8]*)$", re.IGNORECASE)
+_SB_NOTATION = re.compile(r"^S?([0-8]*)/B?([0-8]*)$", re.IGNORECASE)
+
+
+def _minimize(ones, dont_cares, bits) -> list[tuple[int, int]]:
+    """
+    Minimalizacja Quine'a–McCluskeya: zwraca implikanty (wartość, maska),
+    gdzie maska to bity pomijane. Pokrywa wszystkie mintermy z ones.
+    """
+    terms = {(m, 0) for m in ones | dont_cares}
+    primes = set()
+    while terms:
+        merged = set()
+        used = set()
+        ordered = sorted(terms)
+        for i, (v1, m1) in enumerate(ordered):
+            for v2, m2 in ordered[i + 1:]:
+                diff = v1 ^ v2
+                if m1 == m2 and diff and diff & (diff - 1) == 0:
+                    merged.add((v1 & ~diff, m1 | diff))
+                    used.add((v1, m1))
+                    used.add((v2, m2))
+        primes |= terms - used
+        terms = merged
+
+    def covers(term, m):
+        value, mask = term
+        return m & ~mask == value
+
+    def literals(term):
+        return bits - bin(term[1]).count("1")
+
+    # Najpierw implikanty konieczne, potem zachłannie najwięcej pokrytych
+    chosen = []
+    uncovered = set(ones)
+    for m in sorted(ones):
+        covering = [p for p in primes if covers(p, m)]
+        if len(covering) == 1 and covering[0] not in chosen:
+            chosen.append(covering[0])
+    for term in chosen:
+        uncovered -= {m for m in uncovered if covers(term, m)}
+    while uncovered:
+        best = max(
+            sorted(primes),
+            key=lambda p: (sum(covers(p, m) for m in uncovered), -literals(p)),
+        )
+        chosen.append(best)
+        uncovered -= {m for m in uncovered if covers(best, m)}
+    return sorted(chosen)
+
+
+class Rule:
+    """
+    Reguła typu Life: zbiory liczby sąsiadów dających narodziny (birth)
+    i przeżycie (survive). Porównywana po zbiorach, nie po nazwie.
+    """
+
+    def __init__(self, birth, survive, name=None):
+        self.birth = frozenset(birth)
+        self.survive = frozenset(survive)
+        self.name = name
+
+        # [stan, liczba sąsiadów] -> nowy stan
+        self.table = np.zeros((2, 9), dtype=np.uint8)
+        self.table[0, sorted(self.birth)] = 1
+        self.table[1, sorted(self.survive)] = 1
+        self.lookup = self.table.reshape(-1)  # indeks: stan * 9 + liczba
+
+        # 9-bitowe sąsiedztwo 3x3, bit 4 = komórka środkowa
+        index = np.arange(512)
+        centre = (index >> 4) & 1
+        count = np.array([bin(i & ~(1 << 4)).count("1") for i in range(512)])
+        self.neighbourhood = self.table[centre, count]
+
+        # SWAR: minterm = alive | liczba << 1; liczby 9..15 nie występują
+        ones = {
+            state | (count << 1)
+            for state in (0, 1)
+            for count in range(9)
+            if self.table[state, count]
+        }
+        dont_cares = {state | (count << 1) for state in (0, 1) for count in range(9, 16)}
+        self.implicants = [
+            tuple(
+                (var, bool(value >> var & 1))
+                for var in range(len(SWAR_VARS))
+                if not mask >> var & 1
+            )
+            for value, mask in _minimize(ones, dont_cares, len(SWAR_VARS))
+        ]
+        # Literały wspólne dla wszystkich iloczynów wyciągamy przed nawias:
+        # Conway to wtedy (alive | sum0) & sum1 & ~sum2, jak wzór na sztywno
+        common = set.intersection(*map(set, self.implicants)) if self.implicants else set()
+        self.swar_common = tuple(sorted(common))
+        self.swar_terms = [
+            tuple(literal for literal in implicant if literal not in common)
+            for implicant in self.implicants
+        ]
+        if not all(self.swar_terms):
+            self.swar_terms = []  # pusty iloczyn = prawda, zostają wspólne literały
+
+    @property
+    def notation(self) -> str:
+        return "B{}/S{}".format(
+            "".join(map(str, sorted(self.birth))),
+            "".join(map(str, sorted(self.survive))),
+        )
+
+    @property
+    def label(self) -> str:
+        return f"{self.notation} ({self.name})" if self.name else self.notation
+
+    def __eq__(self, other):
+        return (
+            isinstance(other, Rule)
+            and self.birth == other.birth
+            and self.survive == other.survive
+        )
+
+    def __hash__(self):
+        return hash((self.birth, self.survive))
+
+    def __repr__(self):
+        return f"Rule({self.notation!r})"
+
+    def __reduce__(self):
+        # Do procesów roboczych wystarczy notacja – tablice powstaną na miejscu
+        return parse_rule, (self.notation,)
+
+    def apply(self, neighbors: np.ndarray, alive: np.ndarray) -> np.ndarray:
+        """
+        Nowy stan (uint8) dla tablic liczby sąsiadów i stanu komórek.
+        Przy kilku liczbach w regule – porównania (jak wzór na sztywno),
+        przy wielu – jeden odczyt z tablicy table.
+        """
+        if len(self.birth | self.survive) > MAX_COMPARISONS:
+            return self.lookup.take(alive * np.uint8(9) + neighbors)
+
+        alive = alive.view(bool)
+        result = None
+        for count in sorted(self.birth | self.survive, reverse=True):
+            hit = neighbors == count
+            if count not in self.survive:
+                hit &= ~alive
+            elif count not in self.birth:
+                hit &= alive
+            result = hit if result is None else result | hit
+        if result is None:
+            return np.zeros(neighbors.shape, dtype=np.uint8)
+        return result.view(np.uint8)
+
+
+@lru_cache(maxsize=None)
+def parse_rule(text) -> Rule:
+    """
+    Zamienia tekst na regułę: "B3/S23", "b36s23", "23/3" (notacja S/B)
+    albo nazwę z RULES (np. "HighLife"). Nieznany tekst – ValueError.
+    """
+    if isinstance(text, Rule):
+        return text
+    cleaned = text.strip().replace(" ", "")
+    for rule in RULES:
+        if cleaned.lower() in (rule.name.lower().replace(" ", ""), rule.notation.lower()):
+            return rule
+
+    match = _NOTATION.match(cleaned)
+    if match:
+        birth, survive = match.groups()
+    else:
+        match = _SB_NOTATION.match(cleaned)
+        if not match:
+            raise ValueError(f"Invalid rule: {text!r}")
+        survive, birth = match.groups()
+    rule = Rule(map(int, birth), map(int, survive))
+    for known in RULES:
+        if known == rule:
+            return known
+    return rule
+
+
+CONWAY = Rule({3}, {2, 3}, "Conway")
+
+# Reguły do wyboru na ekranie przygotowania planszy
+RULES = (
+    CONWAY,
+    Rule({3, 6}, {2, 3}, "HighLife"),
+    Rule({2}, (), "Seeds"),
+    Rule({3, 6, 7, 8}, {3, 4, 6, 7, 8}, "Day & Night"),
+    Rule({3}, {0, 1, 2, 3, 4, 5, 6, 7, 8}, "Life without Death"),
+    Rule({3, 6}, {1, 2, 5}, "2x2"),
+    Rule({3}, {1, 2, 3, 4, 5}, "Maze"),
+    Rule({1, 3, 5, 7}, {1, 3, 5, 7}, "Replicator"),
+    Rule({3, 5, 6, 7, 8}, {5, 6, 7, 8}, "Diamoeba"),
+)
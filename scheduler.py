@@ -0,0 +1,144 @@
+import threading
+import time
+
+
+class StepScheduler:
+    """
+    Stały krok czasowy symulacji, niezależny od klatek ekranu.
+
+    Czas klatki trafia do akumulatora, a advance() wykonuje tyle kroków,
+    ile się w nim mieści – ale nie więcej niż max_steps_per_frame i nie
+    dłużej niż budget_ms. Interwał 0 oznacza tryb turbo: kroki bez limitu
+    aż do wyczerpania budżetu czasu klatki.
+    """
+
+    def __init__(self, interval_ms, max_steps_per_frame=8, budget_ms=12.0):
+        self.interval_ms = interval_ms
+        self.max_steps_per_frame = max_steps_per_frame
+        self.budget_ms = budget_ms
+        self.accumulator = 0.0
+
+    @property
+    def turbo(self) -> bool:
+        return self.interval_ms == 0
+
+    def set_interval(self, interval_ms):
+        self.interval_ms = interval_ms
+        self.accumulator = min(self.accumulator, interval_ms)
+
+    def reset(self):
+        self.accumulator = 0.0
+
+    def advance(self, dt_ms, step) -> int:
+        """
+        Wykonuje zaległe kroki symulacji; zwraca ich liczbę.
+        step() zwraca False, gdy symulację trzeba zatrzymać (np. koniec gry).
+        """
+        start = time.perf_counter()
+        budget = self.budget_ms / 1000
+        steps = 0
+
+        if self.turbo:
+            while time.perf_counter() - start < budget:
+                steps += 1
+                if not step():
+                    break
+            return steps
+
+        self.accumulator += dt_ms
+        while self.accumulator >= self.interval_ms:
+            if steps >= self.max_steps_per_frame or time.perf_counter() - start >= budget:
+                # Nie nadrabiamy w nieskończoność – zostaje najwyżej jeden krok zaległości
+                self.accumulator = min(self.accumulator, self.interval_ms)
+                break
+            self.accumulator -= self.interval_ms
+            steps += 1
+            if not step():
+                self.accumulator = 0.0
+                break
+        return steps
+
+
+class SimulationThread(threading.Thread):
+    """
+    Symulacja w osobnym wątku.
+
+    Wątek przekazuje rendererowi ostatnie gotowe pokolenie bez blokad:
+    na prośbę (request_frame) publikuje kopię fragmentu planszy region
+    (zakres kamery (c0, c1, r0, r1)) w atrybucie latest, podmienianym
+    jednym przypisaniem. Kopia powstaje najwyżej raz na klatkę i nie
+    częściej niż co render_every pokoleń, a jej koszt zależy od widoku,
+    nie od planszy. Po zmianie region publish_now() daje nowy fragment
+    od razu, czekając najwyżej na koniec bieżącego kroku.
+    """
+
+    def __init__(self, grid, step, interval_ms, render_every=1, region=None):
+        super().__init__(daemon=True)
+        self.grid = grid
+        self.step = step
+        self.interval_ms = interval_ms
+        self.render_every = render_every
+
+        self.region = region if region is not None else (0, grid.cols, 0, grid.rows)
+        # (pokolenie, fragment komórek, (c0, r0) fragmentu, (żywe, narodziny, zgony))
+        self.latest = None
+        self._frame_requested = True
+        self._published_generation = None
+        # Trzymana przez krok – publish_now() nie czyta planszy w trakcie kroku
+        self._lock = threading.Lock()
+        self._stop_event = threading.Event()
+
+    def request_frame(self):
+        """Renderer odebrał klatkę i prosi o kolejną."""
+        self._frame_requested = True
+
+    def _publish(self):
+        generation = self.grid.generation
+        if (
+            self._published_generation is not None
+            and generation - self._published_generation < self.render_every
+        ):
+            return
+        self._frame_requested = False
+        self._published_generation = generation
+        c0, c1, r0, r1 = self.region
+        # view() bywa widokiem bez kopii, a plansza zmienia się w następnym kroku
+        grid = self.grid
+        stats = (grid.population, grid.births, grid.deaths)
+        self.latest = (generation, grid.view(r0, r1, c0, c1).copy(), (c0, r0), stats)
+
+    def publish_now(self):
+        """Publikuje fragment region od razu (np. po ruchu kamery), po bieżącym kroku."""
+        with self._lock:
+            self._published_generation = None
+            self._publish()
+
+    def run(self):
+        next_tick = time.perf_counter()
+        while True:
+            if self.interval_ms:
+                next_tick += self.interval_ms / 1000
+                delay = next_tick - time.perf_counter()
+                if delay < 0:
+                    # Nie nadążamy – nie nadrabiamy serią kroków
+                    next_tick -= delay
+                if self._stop_event.wait(max(delay, 0.0)):
+                    break
+            elif self._stop_event.is_set():
+                break
+            else:
+                # Turbo – tylko oddajemy GIL wątkowi głównemu
+                time.sleep(0)
+
+            with self._lock:
+                keep_going = self.step()
+                if self._frame_requested:
+                    self._publish()
+            if not keep_going:
+                break
+
+    def stop(self):
+        """Zatrzymuje wątek i czeka na zakończenie bieżącego kroku."""
+        self._stop_event.set()
+        if self.is_alive() and self is not threading.current_thread():
+            self.join()
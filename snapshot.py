@@ -0,0 +1,109 @@
+# snapshot.py
+"""
+Binarne migawki planszy do szybkiego zapisu i wznawiania symulacji.
+
+Format (little-endian):
+
+    nagłówek (DATA_OFFSET bajtów): MAGIC, cols, rows, generation,
+        population, board_hash, rule (ASCII, dopełnione zerami)
+    dane: słowa uint64, wiersz po wierszu – ten sam układ co
+        BitPackedGrid.words (kolumna c w słowie c // 64, bit c % 64)
+
+open_snapshot mapuje dane przez np.memmap w trybie kopiowania przy
+zapisie: BitPackedGrid przejmuje mapę bez kopiowania, a strony pliku są
+wczytywane dopiero przy pierwszym dostępie. Populacja i hasz są
+w nagłówku, więc otwarcie nie czyta całej planszy.
+"""
+
+import contextlib
+import os
+import struct
+
+import numpy as np
+
+from bitgrid import WORD_BITS, pack_rows
+from grid import create_grid
+
+MAGIC = b"GOLSNAP\x01"
+HEADER = struct.Struct("<8sQQQQQ32s")
+DATA_OFFSET = 128
+
+
+def _words_per_row(cols) -> int:
+    return (cols + WORD_BITS - 1) // WORD_BITS
+
+
+def save_snapshot(grid, path):
+    """
+    Zapisuje planszę dowolnego silnika do pliku migawki.
+    BitPackedGrid zapisuje słowa wprost, pozostałe silniki pakują planszę
+    pasami. Plik powstaje pod nazwą tymczasową i podmienia stary dopiero
+    po pełnym zapisie, więc przerwany zapis nie psuje poprzedniej migawki.
+    Błąd zapisu (OSError) przechodzi do wywołującego.
+    """
+    if isinstance(getattr(grid, "words", None), np.memmap):
+        # Plansza wznowiona z migawki mapuje jeszcze plik – być może ten,
+        # który zaraz podmienimy (na Windows os.replace tego odmawia).
+        # Słowa przechodzą do pamięci, a mapa jest zwalniana.
+        grid.words = np.array(grid.words)
+    header = HEADER.pack(
+        MAGIC, grid.cols, grid.rows, grid.generation,
+        grid.population, grid.board_hash, grid.rule.notation.encode("ascii"),
+    )
+    words_per_row = _words_per_row(grid.cols)
+
+    temp_path = path + ".tmp"
+    try:
+        with open(temp_path, "wb") as f:
+            f.write(header.ljust(DATA_OFFSET, b"\0"))
+            if hasattr(grid, "words"):
+                grid.words.astype("<u8", copy=False).tofile(f)
+            else:
+                cells = grid.to_array()
+                stripe = max(1, (1 << 22) // max(grid.cols, 1))
+                for r0 in range(0, grid.rows, stripe):
+                    packed = pack_rows(cells[r0:r0 + stripe], words_per_row)
+                    packed.astype("<u8", copy=False).tofile(f)
+        os.replace(temp_path, path)
+    except OSError:
+        # Nieudany zapis nie zostawia po sobie pliku tymczasowego
+        with contextlib.suppress(OSError):
+            os.remove(temp_path)
+        raise
+
+
+def read_header(path) -> dict:
+    """Czyta nagłówek migawki (bez danych planszy)."""
+    with open(path, "rb") as f:
+        raw = f.read(HEADER.size)
+    if len(raw) < HEADER.size:
+        raise ValueError(f"Not a board snapshot: {path}")
+    magic, cols, rows, generation, population, board_hash, rule = HEADER.unpack(raw)
+    if magic != MAGIC:
+        raise ValueError(f"Not a board snapshot: {path}")
+    return {
+        "cols": cols,
+        "rows": rows,
+        "generation": generation,
+        "population": population,
+        "board_hash": board_hash,
+        "rule": rule.rstrip(b"\0").decode("ascii"),
+    }
+
+
+def open_snapshot(path, engine="bitpacked", **options):
+    """
+    Odtwarza planszę z migawki (z jej regułą) wybranym silnikiem – options
+    trafiają do create_grid. Z "bitpacked" plansza jest mapą pliku bez kopiowania;
+    zmiany trafiają tylko do pamięci procesu, nie do pliku.
+    """
+    header = read_header(path)
+    cols, rows = header["cols"], header["rows"]
+    words = np.memmap(
+        path, dtype="<u8", mode="c", offset=DATA_OFFSET,
+        shape=(rows, _words_per_row(cols)),
+    )
+    grid = create_grid(cols, rows, engine, rule=header["rule"], **options)
+    grid.load_packed(words, header["population"], header["board_hash"])
+    grid.generation = header["generation"]
+    return grid
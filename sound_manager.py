@@ -1,48 +1,54 @@
 import pygame
+from assets import AssetRegistry
 from utils import resource_path
 
+# Nazwa dźwięku -> plik w katalogu assets
+SOUND_FILES = {
+    "click": "click.wav",
+    "step": "step.wav",
+    "clear": "clear.wav",
+}
+
+
 class SoundManager:
     """
     Klasa odpowiedzialna za ładowanie i odtwarzanie dźwięków.
     Dzięki temu logika gry nie musi znać szczegółów pygame.mixer.
-    """
-
-    def __init__(self):
-        # Inicjalizacja modułu dźwięku
-        try:
-            pygame.mixer.init()
-        except pygame.error:
-            # Brak karty dźwiękowej / problem ze sterownikami
-            # Nie rozwalamy gry, po prostu wyłączamy dźwięk.
-            self.enabled = False
-            self.sounds = {}
-            return
 
-        self.enabled = True
-        self.sounds = {}
-
-        self._load_sound("click", "click.wav")
-        self._load_sound("step", "step.wav")
-        self._load_sound("clear", "clear.wav")
-
-    def _load_sound(self, name: str, filename: str):
-        """Ładuje pojedynczy dźwięk do słownika."""
-        if not self.enabled:
-            return
+    Mikser i pliki WAV są inicjalizowane w tle (AssetRegistry) –
+    do tego czasu play() po prostu nic nie odtwarza.
+    """
 
-        try:
-            path = resource_path(filename)
-            sound = pygame.mixer.Sound(path)
-            self.sounds[name] = sound
-        except Exception:
-            # Jeśli nie ma pliku / problem z formatem – dźwięk będzie po prostu pominięty
-            self.sounds[name] = None
+    def __init__(self, assets: AssetRegistry | None = None):
+        self.assets = assets if assets is not None else AssetRegistry()
+        self.assets.register("sounds", self._load_sounds)
+
+    @staticmethod
+    def _load_sounds() -> dict:
+        """Inicjalizuje mikser i ładuje wszystkie dźwięki (w wątku roboczym)."""
+        # Brak karty dźwiękowej / problem ze sterownikami – wyjątek wyłącza
+        # dźwięk (rejestr zapamiętuje błąd), ale nie rozwala gry
+        pygame.mixer.init()
+
+        sounds = {}
+        for name, filename in SOUND_FILES.items():
+            try:
+                sounds[name] = pygame.mixer.Sound(resource_path(filename))
+            except Exception:
+                # Jeśli nie ma pliku / problem z formatem – dźwięk będzie po prostu pominięty
+                sounds[name] = None
+        return sounds
+
+    @property
+    def enabled(self) -> bool:
+        return self.assets.ready("sounds")
 
     def play(self, name: str):
-        """Odtwarza dźwięk o podanej nazwie (jeśli dostępny)."""
-        if not self.enabled:
+        """Odtwarza dźwięk o podanej nazwie (jeśli już wczytany)."""
+        sounds = self.assets.get("sounds")
+        if sounds is None:
             return
 
-        sound = self.sounds.get(name)
+        sound = sounds.get(name)
         if sound is not None:
             sound.play()
@@ -0,0 +1,93 @@
+# soup.py
+"""
+Losowe plansze ("zupy") – powtarzalne i wypełniane hurtowo.
+
+Każda komórka to 16 bitów z surowych słów np.random.Generator porównane
+z progiem probability * 2**16, więc 4096 x 4096 losuje się w kilkadziesiąt
+milisekund, a to samo ziarno daje zawsze tę samą planszę – niezależnie
+od silnika i od tego, czy plansza jest losowana w całości, czy pasami
+o liczbie komórek podzielnej przez 4.
+
+Symetrie jak w przeszukiwaniu zup (apgsearch):
+    C1 – bez symetrii,
+    C2 – obrót o 180°,
+    C4 – obrót o 90° (tylko kwadrat),
+    D8 – obroty o 90° i odbicia (tylko kwadrat).
+Losowana jest tylko dziedzina podstawowa, a reszta to jej obrazy.
+"""
+
+import numpy as np
+
+SYMMETRIES = ("C1", "C2", "C4", "D8")
+_LEVELS = 1 << 16
+_WORD_MAX = np.iinfo(np.uint64).max
+
+
+def check_symmetry(symmetry) -> str:
+    """Zwraca nazwę symetrii albo rzuca ValueError dla nieznanej."""
+    if symmetry not in SYMMETRIES:
+        raise ValueError(f"unknown symmetry {symmetry!r} (expected one of {', '.join(SYMMETRIES)})")
+    return symmetry
+
+
+def fill_rect(rect, cols, rows) -> tuple[int, int, int, int]:
+    """
+    Prostokąt (c0, r0, c1, r1) przycięty do planszy (c1, r1 wyłącznie,
+    jak w bounding_box); None oznacza całą planszę.
+    """
+    if rect is None:
+        return 0, 0, cols, rows
+    c0, r0, c1, r1 = rect
+    c0, c1 = max(0, c0), min(cols, c1)
+    r0, r1 = max(0, r0), min(rows, r1)
+    return c0, r0, max(c0, c1), max(r0, r1)
+
+
+def _bernoulli(rng, shape, probability) -> np.ndarray:
+    """Tablica uint8 (0/1) – każda komórka żywa z prawdopodobieństwem probability."""
+    threshold = int(round(probability * _LEVELS))
+    if threshold <= 0:
+        return np.zeros(shape, dtype=np.uint8)
+    if threshold >= _LEVELS:
+        return np.ones(shape, dtype=np.uint8)
+    # Pełny zakres uint64 to surowe słowa generatora – cztery komórki na słowo
+    count = int(np.prod(shape))
+    words = rng.integers(0, _WORD_MAX, size=(count + 3) // 4, dtype=np.uint64, endpoint=True)
+    draws = words.astype("<u8", copy=False).view("<u2")[:count].reshape(shape)
+    return (draws < threshold).view(np.uint8)
+
+
+def random_cells(rows, cols, probability=0.25, seed=None, symmetry="C1") -> np.ndarray:
+    """
+    Losowa plansza (rows, cols) typu uint8 z żywymi komórkami
+    z prawdopodobieństwem probability.
+
+    seed to ziarno (int), gotowy np.random.Generator (losowanie
+    kontynuuje jego strumień) albo None (losowe ziarno).
+    """
+    check_symmetry(symmetry)
+    rng = np.random.default_rng(seed)
+    if symmetry == "C1":
+        return _bernoulli(rng, (rows, cols), probability)
+
+    if symmetry == "C2":
+        cells = np.zeros((rows, cols), dtype=np.uint8)
+        half = rows // 2
+        cells[:half] = _bernoulli(rng, (half, cols), probability)
+        if rows % 2:
+            # Środkowy wiersz przechodzi sam na siebie – losujemy jego połowę
+            middle = (cols + 1) // 2
+            cells[half, :middle] = _bernoulli(rng, (1, middle), probability)
+        return cells | cells[::-1, ::-1]
+
+    if rows != cols:
+        raise ValueError(f"{symmetry} symmetry needs a square area, got {cols}x{rows}")
+    cells = np.zeros((rows, cols), dtype=np.uint8)
+    quarter = (rows + 1) // 2
+    domain = _bernoulli(rng, (quarter, quarter), probability)
+    if symmetry == "D8":
+        # Ćwiartka symetryczna względem przekątnej – losowy tylko jej trójkąt
+        domain = np.tril(domain)
+        domain |= domain.T
+    cells[:quarter, :quarter] = domain
+    return cells | np.rot90(cells, 1) | np.rot90(cells, 2) | np.rot90(cells, 3)
@@ -0,0 +1,304 @@
+# sweep.py
+"""
+Przegląd parametrów: wiele przebiegów bez okna, rozdzielonych na pulę procesów.
+
+    python sweep.py --densities 0.1:0.5:0.05 --sizes 64,128,256 \\
+        --rules B3/S23,HighLife --seeds 0:100 --output sweep.csv
+
+Każda kombinacja (rozmiar, gęstość, reguła, ziarno) to jeden przebieg,
+zakończony tym samym kryterium co gra (CycleDetector.step z
+CYCLE_MAX_PERIOD) albo limitem --max-generations. Wyniki są dopisywane
+do CSV zaraz po ukończeniu przebiegu – nic nie czeka w pamięci – więc
+przerwany przegląd wystarczy uruchomić ponownie z tym samym --output:
+gotowe przebiegi są pomijane. Plik z wynikami innego silnika, warunku
+brzegowego albo limitów (--max-generations, --max-period) nie jest
+wznawiany – takich wyników nie da się zestawiać w jednych statystykach.
+
+Na końcu wypisywane są zbiorcze statystyki czasu życia (pokolenie
+wejścia w cykl) dla każdej kombinacji parametrów oraz przepustowość.
+"""
+
+import argparse
+import csv
+import math
+import os
+import sys
+import time
+from multiprocessing import Pool
+
+from boundary import BOUNDARIES
+from config import CYCLE_MAX_PERIOD
+from cycles import CycleDetector
+from grid import create_grid
+from headless import ENGINES
+from rules import parse_rule
+
+# Parametry wspólne dla całego pliku (opcje wiersza poleceń)
+RUN_FIELDS = ("engine", "boundary", "max_generations", "max_period")
+FIELDS = (
+    "size", "density", "rule", "seed", *RUN_FIELDS,
+    "lifetime", "period", "generations", "ended", "alive",
+    "seconds", "gens_per_sec",
+)
+# Kolumny identyfikujące przebieg (klucz przy wznawianiu)
+KEY_FIELDS = ("size", "density", "rule", "seed", *RUN_FIELDS)
+GROUP_FIELDS = ("size", "density", "rule")
+
+
+def run_one(
+        size, density, rule, seed, max_generations, max_period,
+        engine="numpy", boundary="dead",
+) -> dict:
+    """
+    Jeden przebieg: losowa plansza size x size o danej gęstości i regule,
+    krokowana do wejścia w cykl (jak w GameApp) albo do max_generations.
+    lifetime to pokolenie, od którego plansza się powtarza; przy
+    ended == "limit" – liczba policzonych pokoleń (wartość ucięta).
+    """
+    grid = create_grid(size, size, engine, rule=rule, boundary=boundary)
+    grid.randomize(density, seed=seed)
+    detector = CycleDetector(max_period)
+
+    start = time.perf_counter()
+    ended = "limit"
+    while grid.generation < max_generations:
+        if detector.step(grid):
+            ended = "cycle"
+            break
+    seconds = time.perf_counter() - start
+
+    return {
+        "size": size,
+        "density": density,
+        "rule": rule,
+        "seed": seed,
+        "engine": engine,
+        "boundary": boundary,
+        "max_generations": max_generations,
+        "max_period": max_period,
+        "lifetime": detector.cycle_start if ended == "cycle" else grid.generation,
+        "period": detector.period,
+        "generations": grid.generation,
+        "ended": ended,
+        "alive": grid.alive_count(),
+        "seconds": seconds,
+        "gens_per_sec": grid.generation / seconds if seconds > 0 else float("inf"),
+    }
+
+
+def _run_task(args) -> dict:
+    return run_one(*args)
+
+
+def _results(tasks, workers):
+    """Wyniki przebiegów w kolejności ukończenia; jeden proces – bez puli."""
+    if workers <= 1:
+        yield from map(_run_task, tasks)
+        return
+    with Pool(workers) as pool:
+        yield from pool.imap_unordered(_run_task, tasks)
+
+
+def _key(row) -> tuple:
+    """Klucz przebiegu – liczby w postaci tekstowej, jak w pliku CSV."""
+    return tuple(str(row[field]) for field in KEY_FIELDS)
+
+
+class Aggregate:
+    """
+    Statystyki grupy przebiegów liczone przyrostowo (Welford),
+    bez przechowywania pojedynczych wyników.
+    """
+
+    def __init__(self):
+        self.runs = 0
+        self.limited = 0
+        self.mean = 0.0
+        self._m2 = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+        self.alive = 0.0
+        self.generations = 0
+        self.seconds = 0.0
+
+    def add(self, row):
+        lifetime = float(row["lifetime"])
+        self.runs += 1
+        self.limited += row["ended"] == "limit"
+        delta = lifetime - self.mean
+        self.mean += delta / self.runs
+        self._m2 += delta * (lifetime - self.mean)
+        self.min = min(self.min, lifetime)
+        self.max = max(self.max, lifetime)
+        self.alive += float(row["alive"])
+        self.generations += int(row["generations"])
+        self.seconds += float(row["seconds"])
+
+    @property
+    def std(self) -> float:
+        return math.sqrt(self._m2 / (self.runs - 1)) if self.runs > 1 else 0.0
+
+
+def _parse_floats(text) -> list[float]:
+    """ "0.1,0.2" albo zakres "start:stop:krok" (stop włącznie)."""
+    if ":" in text:
+        start, stop, step = map(float, text.split(":"))
+        count = int(math.floor((stop - start) / step + 1e-9)) + 1
+        return [round(start + i * step, 10) for i in range(count)]
+    return [float(item) for item in text.split(",") if item]
+
+
+def _parse_ints(text) -> list[int]:
+    """ "64,128" albo zakres "start:stop" (stop wyłącznie), jak range()."""
+    if ":" in text:
+        return list(range(*map(int, text.split(":"))))
+    return [int(item) for item in text.split(",") if item]
+
+
+def _read_done(path, aggregates) -> set:
+    """
+    Wczytuje gotowe przebiegi z istniejącego CSV (do wznowienia) i dodaje
+    je do statystyk. Urwany ostatni wiersz przerwanego zapisu jest obcinany.
+    """
+    done = set()
+    if not os.path.exists(path):
+        return done
+    with open(path, "rb+") as f:
+        data = f.read()
+        if data and not data.endswith(b"\n"):
+            f.truncate(data.rfind(b"\n") + 1)
+    with open(path, newline="", encoding="utf-8") as f:
+        for row in csv.DictReader(f):
+            done.add(_key(row))
+            aggregates.setdefault(tuple(row[g] for g in GROUP_FIELDS), Aggregate()).add(row)
+    return done
+
+
+def _resume_conflict(path, args) -> str | None:
+    """
+    Opis niezgodności istniejącego CSV z parametrami RUN_FIELDS tego
+    uruchomienia albo None, gdy plik można wznowić (lub go nie ma).
+    """
+    if not os.path.exists(path) or os.path.getsize(path) == 0:
+        return None
+    current = {field: str(getattr(args, field)) for field in RUN_FIELDS}
+    with open(path, newline="", encoding="utf-8") as f:
+        reader = csv.DictReader(f)
+        missing = [field for field in RUN_FIELDS if field not in (reader.fieldnames or ())]
+        if missing:
+            return f"{path} has no {', '.join(missing)} column(s); use a new --output"
+        for row in reader:
+            if row.get(FIELDS[-1]) is None:
+                continue  # urwany ostatni wiersz – _read_done go obetnie
+            for field in RUN_FIELDS:
+                if row[field] != current[field]:
+                    return (
+                        f"{path} holds runs with {field} {row[field]}, not {current[field]}; "
+                        "use a new --output"
+                    )
+    return None
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Parameter sweep of headless Game of Life runs over a process pool."
+    )
+    parser.add_argument(
+        "--densities", type=_parse_floats, default=[0.25],
+        help="initial densities: list (0.1,0.3) or start:stop:step (inclusive)",
+    )
+    parser.add_argument(
+        "--sizes", type=_parse_ints, default=[128],
+        help="square board sides: list (64,128) or start:stop",
+    )
+    parser.add_argument(
+        "--rules", type=lambda text: [parse_rule(r).notation for r in text.split(",") if r],
+        default=["B3/S23"], help="comma-separated rules (B/S notation or preset names)",
+    )
+    parser.add_argument(
+        "--seeds", type=_parse_ints, default=list(range(10)),
+        help="seeds: list (1,5,7) or start:stop (exclusive)",
+    )
+    parser.add_argument("--max-generations", type=int, default=5000, help="limit per run")
+    parser.add_argument(
+        "--max-period", type=int, default=CYCLE_MAX_PERIOD,
+        help="longest detected cycle (default: the game's CYCLE_MAX_PERIOD)",
+    )
+    parser.add_argument("--engine", choices=ENGINES, default="numpy", help="grid engine")
+    parser.add_argument(
+        "--boundary", choices=BOUNDARIES, default="dead", help="board edge behaviour",
+    )
+    parser.add_argument(
+        "--workers", type=int, default=os.cpu_count() or 1, help="parallel processes",
+    )
+    parser.add_argument(
+        "--output", default="sweep.csv",
+        help="CSV with one row per run; an existing file is resumed",
+    )
+    args = parser.parse_args(argv)
+
+    conflict = _resume_conflict(args.output, args)
+    if conflict:
+        parser.error(conflict)
+    return args
+
+
+def main(argv=None):
+    args = parse_args(argv)
+
+    aggregates = {}
+    done = _read_done(args.output, aggregates)
+    params = {field: getattr(args, field) for field in RUN_FIELDS}
+    tasks = [
+        (size, density, rule, seed, args.max_generations, args.max_period,
+         args.engine, args.boundary)
+        for size in args.sizes
+        for density in args.densities
+        for rule in args.rules
+        for seed in args.seeds
+        if _key(dict(size=size, density=density, rule=rule, seed=seed, **params)) not in done
+    ]
+    total = len(tasks) + len(done)
+    print(f"{len(done)} runs done, {len(tasks)} to go", file=sys.stderr)
+
+    new_file = not os.path.exists(args.output) or os.path.getsize(args.output) == 0
+    start = time.perf_counter()
+    generations = cells = 0
+    with open(args.output, "a", newline="", encoding="utf-8") as f:
+        writer = csv.DictWriter(f, fieldnames=FIELDS)
+        if new_file:
+            writer.writeheader()
+        for finished, row in enumerate(_results(tasks, args.workers), len(done) + 1):
+            writer.writerow(row)
+            f.flush()
+            # Grupa jak po odczycie z CSV: wartości tekstowe
+            group = tuple(str(row[g]) for g in GROUP_FIELDS)
+            aggregates.setdefault(group, Aggregate()).add(row)
+            generations += row["generations"]
+            cells += row["generations"] * row["size"] ** 2
+            print(
+                f"[{finished}/{total}] size {row['size']} density {row['density']} "
+                f"{row['rule']} seed {row['seed']}: {row['ended']} at gen {row['lifetime']}",
+                file=sys.stderr,
+            )
+    wall = time.perf_counter() - start
+
+    print(f"{'size':>6} {'density':>8} {'rule':<14} {'runs':>5} {'limit':>5} "
+          f"{'lifetime mean':>13} {'std':>9} {'min':>7} {'max':>7} {'alive':>9}")
+    for (size, density, rule), agg in sorted(
+            aggregates.items(), key=lambda item: (int(item[0][0]), float(item[0][1]), item[0][2])
+    ):
+        print(
+            f"{size:>6} {density:>8} {rule:<14} {agg.runs:>5} {agg.limited:>5} "
+            f"{agg.mean:>13.1f} {agg.std:>9.1f} {agg.min:>7.0f} {agg.max:>7.0f} "
+            f"{agg.alive / agg.runs:>9.1f}"
+        )
+    if tasks and wall > 0:
+        print(
+            f"{len(tasks)} runs in {wall:.2f} s: {generations / wall:.1f} gen/s, "
+            f"{cells / wall:.3g} cells/s"
+        )
+
+
+if __name__ == "__main__":
+    main()
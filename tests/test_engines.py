@@ -0,0 +1,123 @@
+"""
+Równoważność silników: BitPackedGrid, ChunkedGrid i ParallelGrid muszą
+dawać dokładnie te same pokolenia, populację i hasz co CellGrid.
+"""
+
+from multiprocessing.shared_memory import SharedMemory
+
+import numpy as np
+import pytest
+
+from cycles import xor_cells
+from grid import create_grid
+
+BOUNDARIES = ("dead", "torus", "mirror", "klein")
+RULES = ("B3/S23", "B36/S23", "B2/S", "B3/S012345678", "B0/S8")
+# Rozmiary niepodzielne przez 64 i przez rozmiar fragmentu
+SHAPES = ((37, 70), (64, 65))
+GENERATIONS = 12
+# Fragmenty (r0, r1, c0, c1) planszy 37 x 150 – także na granicach słów uint64
+VIEWS = ((0, 37, 0, 150), (5, 20, 63, 65), (0, 1, 64, 128), (36, 37, 100, 150), (3, 3, 7, 7))
+
+ENGINE_OPTIONS = {
+    "bitpacked": {},
+    "chunked": {"chunk_size": 16},
+    "parallel": {"workers": 2, "stripe_height": 7},
+}
+
+
+@pytest.mark.parametrize("engine", sorted(ENGINE_OPTIONS))
+@pytest.mark.parametrize("boundary", BOUNDARIES)
+@pytest.mark.parametrize("rule", RULES)
+@pytest.mark.parametrize("rows, cols", SHAPES)
+def test_engine_matches_cellgrid(engine, boundary, rule, rows, cols):
+    reference = create_grid(cols, rows, "numpy", rule=rule, boundary=boundary)
+    grid = create_grid(cols, rows, engine, rule=rule, boundary=boundary, **ENGINE_OPTIONS[engine])
+    try:
+        reference.randomize(0.35, seed=rows * cols)
+        grid.load_array(reference.to_array())
+        for generation in range(1, GENERATIONS + 1):
+            reference.step()
+            grid.step()
+            expected = reference.to_array()
+            assert np.array_equal(grid.to_array(), expected), f"generation {generation}"
+            assert grid.population == reference.population
+            assert (grid.births, grid.deaths) == (reference.births, reference.deaths)
+            assert grid.board_hash == reference.board_hash == xor_cells(expected)
+    finally:
+        if hasattr(grid, "close"):
+            grid.close()
+
+
+@pytest.mark.parametrize("engine", sorted(ENGINE_OPTIONS))
+def test_hash_read_after_many_steps(engine):
+    # Kroki i przełączenia bez odczytu haszu – BitPackedGrid dolicza je leniwie
+    grid = create_grid(70, 37, engine, **ENGINE_OPTIONS[engine])
+    try:
+        grid.randomize(0.35, seed=7)
+        for _ in range(5):
+            grid.step()
+        grid.toggle_cell(3, 4)
+        grid.step()
+        grid.toggle_cell(69, 36)
+        assert grid.board_hash == xor_cells(grid.to_array())
+        grid.step()
+        assert grid.board_hash == xor_cells(grid.to_array())
+    finally:
+        if hasattr(grid, "close"):
+            grid.close()
+
+
+@pytest.mark.parametrize("engine", sorted(ENGINE_OPTIONS))
+def test_view_matches_to_array(engine):
+    grid = create_grid(150, 37, engine, **ENGINE_OPTIONS[engine])
+    try:
+        grid.randomize(0.4, seed=3)
+        grid.step()
+        cells = grid.to_array()
+        for r0, r1, c0, c1 in VIEWS:
+            assert np.array_equal(grid.view(r0, r1, c0, c1), cells[r0:r1, c0:c1])
+    finally:
+        if hasattr(grid, "close"):
+            grid.close()
+
+
+@pytest.mark.parametrize("engine", sorted(ENGINE_OPTIONS))
+@pytest.mark.parametrize("rule", ("B0/S8", "B01/S"))
+def test_b0_rule_from_empty_board(engine, rule):
+    # Z B0 pusta plansza od razu ożywa – także w świeżo utworzonym silniku
+    reference = create_grid(40, 40, "numpy", rule=rule)
+    grid = create_grid(40, 40, engine, rule=rule, **ENGINE_OPTIONS[engine])
+    try:
+        for _ in range(4):
+            reference.step()
+            grid.step()
+            assert np.array_equal(grid.to_array(), reference.to_array())
+            assert grid.population == reference.population
+    finally:
+        if hasattr(grid, "close"):
+            grid.close()
+
+
+@pytest.mark.parametrize("options, error", (
+    ({"rule": "B9/S23"}, ValueError),
+    ({"boundary": "sphere"}, ValueError),
+    ({"workers": -1}, ValueError),
+))
+def test_parallel_grid_releases_resources_on_error(monkeypatch, options, error):
+    import parallel
+
+    names = []
+
+    def shared_memory(**kwargs):
+        shm = SharedMemory(**kwargs)
+        names.append(shm.name)
+        return shm
+
+    monkeypatch.setattr(parallel, "SharedMemory", shared_memory)
+    with pytest.raises(error):
+        parallel.ParallelGrid(20, 20, **options)
+    # Pamięć współdzielona zwolniona – nie da się jej już podpiąć
+    assert len(names) == 1
+    with pytest.raises(FileNotFoundError):
+        SharedMemory(name=names[0])
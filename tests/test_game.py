@@ -0,0 +1,92 @@
+"""
+GameApp: z wątkiem symulacji wątek tylko krokuje planszę, a wynik,
+koniec gry i HUD zmienia wątek główny z opublikowanych wyników;
+nieudany zapis migawki jest zgłaszany, a nie wywraca gry.
+"""
+
+import threading
+
+import pytest
+
+from cycles import CycleDetector
+from grid import create_grid
+
+pytest.importorskip("pygame")
+
+
+@pytest.fixture
+def app(tmp_path, monkeypatch):
+    monkeypatch.setenv("SDL_VIDEODRIVER", "dummy")
+    monkeypatch.setenv("SDL_AUDIODRIVER", "dummy")
+    monkeypatch.chdir(tmp_path)
+    import game
+
+    app = game.GameApp()
+    app.fade_alpha = 0
+    app.grid.randomize(0.3, seed=4)
+    yield app
+    app._stop_simulation_thread()
+    app._stop_recording()
+    app.assets.shutdown()
+
+
+def _cycle_generation(app) -> int:
+    """Pokolenie wykrycia cyklu liczone bez gry, na kopii planszy."""
+    grid = create_grid(app.cols, app.rows, rule=app.grid.rule, boundary=app.grid.boundary)
+    grid.load_array(app.grid.to_array())
+    detector = CycleDetector(app.cycles.max_period)
+    while not detector.step(grid):
+        pass
+    return grid.generation
+
+
+def test_thread_step_does_not_touch_game_state(app):
+    expected = _cycle_generation(app)
+    app.state = "running"
+
+    def run():
+        while app._thread_step():
+            pass
+
+    worker = threading.Thread(target=run)
+    worker.start()
+    worker.join()
+    # Wątek doszedł do cyklu, ale stanu gry nie zmienił
+    assert app.grid.generation == expected
+    assert (app.state, app.current_score) == ("running", 0)
+
+    app._apply_thread_steps()
+    assert (app.state, app.current_score) == ("game_over", expected)
+    assert app.best_score >= expected
+
+
+def test_threaded_run_ends_in_main_thread(app, monkeypatch):
+    import game
+
+    monkeypatch.setattr(game, "SIMULATION_THREAD", True)
+    expected = _cycle_generation(app)
+    app.state = "running"
+    app.set_speed(0)
+    for _ in range(10_000):
+        app.update(16)
+        app.draw()
+        if app.state != "running":
+            break
+    app.update(16)
+    assert app.state == "game_over"
+    assert app.current_score == expected
+    assert app.sim_thread is None
+
+
+def test_failed_snapshot_save_is_reported(app, monkeypatch, tmp_path, capsys):
+    import game
+
+    monkeypatch.setattr(game, "SNAPSHOT_PATH", str(tmp_path / "missing" / "board.golsnap"))
+    assert not app.save_snapshot()
+    assert "Cannot save snapshot" in capsys.readouterr().err
+
+    monkeypatch.setattr(game, "SNAPSHOT_PATH", str(tmp_path / "board.golsnap"))
+    assert app.save_snapshot()
+    app.restore_snapshot()
+    # Zapis po wznowieniu nadpisuje migawkę, którą plansza mapuje
+    assert app.save_snapshot()
@@ -0,0 +1,72 @@
+"""
+HashLife a CellGrid: na planszy z szerokim pustym marginesem (wzór nie
+dochodzi do krawędzi) skok o N pokoleń musi dać to samo co N kroków.
+"""
+
+import numpy as np
+import pytest
+
+from grid import create_grid
+from hashlife import HashLife
+
+SIZE = 128
+SEED_SIZE = 16
+# Wzór rośnie najwyżej o komórkę na pokolenie – 40 pokoleń mieści się w marginesie
+GENERATIONS = (1, 8, 37, 40)
+
+
+def _seeded_grid(rule):
+    grid = create_grid(SIZE, SIZE, "numpy", rule=rule)
+    start = (SIZE - SEED_SIZE) // 2
+    grid.randomize(0.4, seed=11, rect=(start, start, start + SEED_SIZE, start + SEED_SIZE))
+    return grid
+
+
+@pytest.mark.parametrize("rule", ("B3/S23", "B36/S23", "B3678/S34678"))
+@pytest.mark.parametrize("generations", GENERATIONS)
+@pytest.mark.parametrize("max_nodes", (1_000_000, 500))
+def test_jump_matches_steps_on_empty_margin(rule, generations, max_nodes):
+    grid = _seeded_grid(rule)
+    life = HashLife.from_grid(grid, max_nodes=max_nodes)
+    for _ in range(generations):
+        grid.step()
+    cells = grid.to_array()
+    # Warunek porównania: nic nie dotarło do krawędzi planszy
+    assert not (cells[0].any() or cells[-1].any() or cells[:, 0].any() or cells[:, -1].any())
+
+    life.advance(generations)
+    assert life.generation == generations
+    assert life.population == grid.population
+    assert np.array_equal(life.to_array(0, 0, SIZE, SIZE), cells)
+
+
+def test_write_to_sets_board_and_generation():
+    grid = _seeded_grid("B3/S23")
+    expected = create_grid(SIZE, SIZE, "numpy")
+    expected.load_array(grid.to_array())
+    for _ in range(25):
+        expected.step()
+
+    life = HashLife.from_grid(grid)
+    life.advance(25)
+    life.write_to(grid)
+    assert grid.generation == 25
+    assert np.array_equal(grid.to_array(), expected.to_array())
+    assert grid.board_hash == expected.board_hash
+
+
+def test_glider_leaves_the_board_but_keeps_living():
+    # Nieskończona płaszczyzna: szybowiec za krawędzią nie ginie
+    grid = create_grid(8, 8, "numpy")
+    for col, row in ((1, 0), (2, 1), (0, 2), (1, 2), (2, 2)):
+        grid.toggle_cell(col, row)
+    life = HashLife.from_grid(grid)
+    life.advance(64)
+    assert life.population == 5
+    assert not life.to_array(0, 0, 8, 8).any()
+    assert life.to_array(16, 16, 8, 8).sum() == 5
+
+
+def test_b0_rule_is_rejected():
+    with pytest.raises(ValueError):
+        HashLife(rule="B0/S8")
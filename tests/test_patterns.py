@@ -0,0 +1,83 @@
+"""
+Wzory: zapis i odczyt RLE, plaintext (.cells) i Macrocell (.mc) oddają
+te same komórki, także przy czytaniu RLE małymi porcjami.
+"""
+
+import io
+
+import numpy as np
+import pytest
+
+import patterns
+from grid import create_grid
+from patterns import Pattern, place_pattern, read_pattern, read_rle, write_pattern
+
+FORMATS = sorted(patterns.READERS)
+GLIDER = b"#N Glider\nx = 3, y = 3, rule = B3/S23\nbo$2bo$3o!\n"
+
+
+def _soup(cols, rows, seed, rule="B3/S23") -> Pattern:
+    grid = create_grid(cols, rows, "numpy", rule=rule)
+    grid.randomize(0.3, seed=seed)
+    return Pattern.from_grid(grid, name="soup")
+
+
+@pytest.mark.parametrize("ext", FORMATS)
+@pytest.mark.parametrize("cols, rows", ((5, 3), (150, 40), (300, 211)))
+def test_round_trip(tmp_path, ext, cols, rows):
+    pattern = _soup(cols, rows, seed=cols + rows, rule="B36/S23")
+    path = str(tmp_path / ("soup" + ext))
+    write_pattern(path, pattern)
+    loaded = read_pattern(path)
+    assert loaded.population == pattern.population
+    assert np.array_equal(loaded.to_array(), pattern.to_array())
+    assert loaded.name == "soup"
+    if ext != ".cells":
+        # Plaintext nie zapisuje reguły
+        assert loaded.rule == "B36/S23"
+
+
+@pytest.mark.parametrize("ext", FORMATS)
+def test_empty_pattern(tmp_path, ext):
+    path = str(tmp_path / ("empty" + ext))
+    write_pattern(path, Pattern([], []))
+    assert read_pattern(path).population == 0
+
+
+def test_rle_glider():
+    pattern = read_rle(io.BytesIO(GLIDER))
+    assert (pattern.name, pattern.rule) == ("Glider", "B3/S23")
+    assert (pattern.width, pattern.height) == (3, 3)
+    assert pattern.to_array().tolist() == [[0, 1, 0], [0, 0, 1], [1, 1, 1]]
+
+
+def test_rle_lines_fit_the_width(tmp_path):
+    path = tmp_path / "soup.rle"
+    write_pattern(str(path), _soup(300, 50, seed=2))
+    lines = path.read_text(encoding="utf-8").splitlines()
+    assert all(len(line) <= patterns.RLE_LINE_WIDTH for line in lines[1:])
+
+
+@pytest.mark.parametrize("chunk_size", (1, 2, 7, 64))
+def test_rle_read_in_small_chunks(tmp_path, monkeypatch, chunk_size):
+    # Liczby wielocyfrowe i '$' rozcięte granicą porcji
+    pattern = Pattern([0, 0, 3, 14], [0, 120, 0, 99], rule="B3/S23")
+    path = str(tmp_path / "wide.rle")
+    write_pattern(path, pattern)
+    monkeypatch.setattr(patterns, "CHUNK_SIZE", chunk_size)
+    assert np.array_equal(read_pattern(path).to_array(), pattern.to_array())
+
+
+def test_place_pattern_centres_and_clips():
+    grid = create_grid(10, 8, "numpy")
+    grid.generation = 7
+    glider = read_rle(io.BytesIO(GLIDER))
+    place_pattern(grid, glider)
+    assert grid.generation == 0
+    assert grid.population == 5
+    assert np.array_equal(grid.to_array()[2:5, 3:6], glider.to_array())
+
+    # Wzór częściowo za krawędzią – zostają tylko komórki na planszy
+    place_pattern(grid, glider, x=-1, y=6)
+    assert grid.to_array().tolist()[6:] == [[1] + [0] * 9, [0, 1] + [0] * 8]
+    assert grid.population == 2
@@ -0,0 +1,143 @@
+"""
+Nagrywanie i odtwarzanie: każde pokolenie wraca z nagrania dokładnie,
+także przez granice segmentów, po luce (skok) i po nowej gałęzi.
+"""
+
+import numpy as np
+import pytest
+
+from grid import create_grid
+from recorder import Recorder, RecordingPlayer
+
+COLS, ROWS = 70, 37
+
+
+def _record_run(path, engine, generations, keyframe_interval):
+    """Nagrywa generations kroków zupy; zwraca plansze kolejnych pokoleń."""
+    grid = create_grid(COLS, ROWS, engine)
+    grid.randomize(0.35, seed=5)
+    frames = [grid.to_array().copy()]
+    with Recorder(path, COLS, ROWS, keyframe_interval) as recorder:
+        recorder.attach(grid)
+        for _ in range(generations):
+            grid.step()
+            frames.append(grid.to_array().copy())
+    return frames
+
+
+@pytest.mark.parametrize("engine", ("numpy", "bitpacked"))
+def test_round_trip_across_keyframes(tmp_path, engine):
+    path = tmp_path / "run.golrec"
+    frames = _record_run(path, engine, 23, keyframe_interval=5)
+    with RecordingPlayer(path) as player:
+        assert (player.first_generation, player.last_generation) == (0, 23)
+        # Wstecz i na przemian – za każdym razem od właściwej klatki kluczowej
+        for generation in [*range(23, -1, -1), 7, 22, 0, 11]:
+            assert np.array_equal(player.frame(generation), frames[generation]), generation
+
+
+def test_gap_after_jump(tmp_path):
+    path = tmp_path / "jump.golrec"
+    grid = create_grid(COLS, ROWS, "numpy")
+    grid.randomize(0.35, seed=6)
+    with Recorder(path, COLS, ROWS, keyframe_interval=16) as recorder:
+        recorder.attach(grid)
+        for _ in range(4):
+            grid.step()
+        # Skok jak w GameApp.jump_generations: load_array i ręczny zapis
+        grid.load_array(np.roll(grid.to_array(), 3, axis=1))
+        grid.generation = 50
+        recorder.record(grid)
+        jumped = grid.to_array().copy()
+        grid.step()
+        grid.step()
+        last = grid.to_array().copy()
+
+    with RecordingPlayer(path) as player:
+        assert np.array_equal(player.frame(50), jumped)
+        assert np.array_equal(player.frame(52), last)
+        with pytest.raises(IndexError):
+            player.frame(20)
+        assert player.nearest(20, -1) == 4
+        assert player.nearest(20, 1) == 50
+        assert player.nearest(51, -1) == 51
+        assert player.nearest(60, 1) is None
+
+
+def test_new_branch_overrides_from_its_first_generation(tmp_path):
+    # Wznowienie po przewinięciu wstecz – ten sam rejestrator, nowa gałąź od pokolenia 6
+    path = tmp_path / "branch.golrec"
+    grid = create_grid(COLS, ROWS, "numpy")
+    grid.randomize(0.35, seed=8)
+    with Recorder(path, COLS, ROWS, keyframe_interval=4) as recorder:
+        recorder.attach(grid)
+        frames = [grid.to_array().copy()]
+        for _ in range(10):
+            grid.step()
+            frames.append(grid.to_array().copy())
+        # Po pokoleniu 5 plansza wyczyszczona – gałąź na pewno inna niż stara
+        grid.load_array(np.zeros((ROWS, COLS), dtype=np.uint8))
+        grid.generation = 5
+        grid.step()
+        branch = grid.to_array().copy()
+
+    with RecordingPlayer(path) as player:
+        assert (player.first_generation, player.last_generation) == (0, 6)
+        assert np.array_equal(player.frame(5), frames[5])
+        assert np.array_equal(player.frame(6), branch)
+    assert not np.array_equal(frames[6], branch)
+
+
+def test_player_sees_segments_flushed_while_recording(tmp_path):
+    path = tmp_path / "live.golrec"
+    grid = create_grid(COLS, ROWS, "numpy")
+    grid.randomize(0.35, seed=7)
+    with Recorder(path, COLS, ROWS, keyframe_interval=8) as recorder:
+        recorder.attach(grid)
+        grid.step()
+        recorder.flush()
+        with RecordingPlayer(path) as player:
+            assert player.last_generation == 1
+            for _ in range(3):
+                grid.step()
+            recorder.flush()
+            player.refresh()
+            assert player.last_generation == 4
+            assert np.array_equal(player.frame(4), grid.to_array())
+
+
+def test_game_rewinds_across_a_jump(tmp_path, monkeypatch):
+    pytest.importorskip("pygame")
+    monkeypatch.setenv("SDL_VIDEODRIVER", "dummy")
+    monkeypatch.setenv("SDL_AUDIODRIVER", "dummy")
+    monkeypatch.chdir(tmp_path)
+    import game
+
+    app = game.GameApp()
+    try:
+        app.state = "setup"
+        app.grid.randomize(0.3, seed=5)
+        app.state = "running"
+        app._start_recording()
+        for _ in range(5):
+            app.simulate_step()
+        app.jump_generations(game.JUMP_GENERATIONS)
+        jumped = app.grid.generation
+        app.simulate_step()
+        app.simulate_step()
+        app.state = "paused"
+
+        seen = []
+        for _ in range(5):
+            app.scrub(-1)
+            seen.append(app.grid.generation)
+        # Przeskoczone pokolenia są pomijane, a nie wywracają gry
+        assert seen == [jumped + 1, jumped, 5, 4, 3]
+        app.scrub(1)
+        app.scrub(1)
+        assert app.grid.generation == 5
+        app.scrub(1)
+        assert app.grid.generation == jumped
+    finally:
+        app._stop_recording()
+        app.assets.shutdown()
@@ -0,0 +1,92 @@
+"""
+Migawki: zapis z każdego silnika i odczyt do każdego silnika odtwarzają
+planszę, pokolenie, regułę, populację i hasz; zapis nadpisuje także
+migawkę, którą plansza wciąż mapuje.
+"""
+
+import numpy as np
+import pytest
+
+from cycles import xor_cells
+from grid import create_grid
+from snapshot import open_snapshot, read_header, save_snapshot
+
+ENGINE_OPTIONS = {
+    "numpy": {},
+    "bitpacked": {},
+    "chunked": {"chunk_size": 16},
+    "parallel": {"workers": 2, "stripe_height": 7},
+}
+# Szerokość niepodzielna przez 64 – ostatnie słowo wiersza niepełne
+COLS, ROWS = 130, 37
+
+
+def _close(grid):
+    if hasattr(grid, "close"):
+        grid.close()
+
+
+@pytest.mark.parametrize("source", sorted(ENGINE_OPTIONS))
+@pytest.mark.parametrize("target", sorted(ENGINE_OPTIONS))
+def test_round_trip(tmp_path, source, target):
+    path = str(tmp_path / "board.golsnap")
+    grid = create_grid(COLS, ROWS, source, rule="B36/S23", **ENGINE_OPTIONS[source])
+    try:
+        grid.randomize(0.35, seed=3)
+        for _ in range(4):
+            grid.step()
+        save_snapshot(grid, path)
+        expected = grid.to_array().copy()
+        population, board_hash = grid.population, grid.board_hash
+    finally:
+        _close(grid)
+
+    assert read_header(path)["generation"] == 4
+    restored = open_snapshot(path, target, **ENGINE_OPTIONS[target])
+    try:
+        assert (restored.cols, restored.rows, restored.generation) == (COLS, ROWS, 4)
+        assert restored.rule.notation == "B36/S23"
+        assert np.array_equal(restored.to_array(), expected)
+        assert (restored.population, restored.board_hash) == (population, board_hash)
+        # Po wznowieniu plansza liczy dalej jak zwykle
+        restored.step()
+        cells = restored.to_array()
+        assert restored.population == int(cells.sum())
+        assert restored.board_hash == xor_cells(cells)
+    finally:
+        _close(restored)
+
+
+def test_save_over_the_mapped_snapshot(tmp_path):
+    # F5 po F9: plansza mapuje plik, który zapis podmienia
+    path = str(tmp_path / "board.golsnap")
+    grid = create_grid(COLS, ROWS, "bitpacked")
+    grid.randomize(0.35, seed=4)
+    save_snapshot(grid, path)
+
+    restored = open_snapshot(path, "bitpacked")
+    assert isinstance(restored.words, np.memmap)
+    restored.toggle_cell(0, 0)
+    expected = restored.to_array().copy()
+    save_snapshot(restored, path)
+    assert not isinstance(restored.words, np.memmap)
+    assert np.array_equal(restored.to_array(), expected)
+
+    again = open_snapshot(path, "numpy")
+    assert np.array_equal(again.to_array(), expected)
+    assert again.board_hash == restored.board_hash
+
+
+def test_failed_save_keeps_the_old_snapshot(tmp_path):
+    path = str(tmp_path / "board.golsnap")
+    grid = create_grid(COLS, ROWS, "numpy")
+    grid.randomize(0.35, seed=5)
+    save_snapshot(grid, path)
+    before = (tmp_path / "board.golsnap").read_bytes()
+
+    # Katalog w miejscu pliku tymczasowego – zapis musi się nie udać
+    (tmp_path / "board.golsnap.tmp").mkdir()
+    grid.step()
+    with pytest.raises(OSError):
+        save_snapshot(grid, path)
+    assert (tmp_path / "board.golsnap").read_bytes() == before
@@ -0,0 +1,72 @@
+"""
+Przegląd parametrów: wznawianie z istniejącego CSV pomija gotowe przebiegi,
+naprawia urwany wiersz i nie miesza wyników z innymi parametrami.
+"""
+
+import csv
+
+import pytest
+
+import sweep
+
+ARGS = [
+    "--sizes", "24", "--densities", "0.3", "--rules", "B3/S23,HighLife",
+    "--seeds", "0:3", "--max-generations", "60", "--workers", "1",
+]
+
+
+def _rows(path) -> list[dict]:
+    with open(path, newline="", encoding="utf-8") as f:
+        return list(csv.DictReader(f))
+
+
+def test_resume_skips_finished_runs(tmp_path, capsys):
+    output = str(tmp_path / "sweep.csv")
+    sweep.main(ARGS + ["--output", output])
+    first = _rows(output)
+    assert len(first) == 6
+    assert {row["boundary"] for row in first} == {"dead"}
+    assert {row["max_generations"] for row in first} == {"60"}
+
+    capsys.readouterr()
+    sweep.main(ARGS + ["--output", output])
+    assert "6 runs done, 0 to go" in capsys.readouterr().err
+    assert _rows(output) == first
+
+
+def test_resume_repairs_a_truncated_row(tmp_path):
+    output = tmp_path / "sweep.csv"
+    sweep.main(ARGS + ["--output", str(output)])
+    first = _rows(output)
+    # Przerwany zapis: ostatni wiersz urwany w połowie
+    data = output.read_bytes()
+    output.write_bytes(data[:len(data) - 10])
+
+    sweep.main(ARGS + ["--output", str(output)])
+    rows = _rows(output)
+    assert len(rows) == 6
+    assert {sweep._key(row) for row in rows} == {sweep._key(row) for row in first}
+    # Przebiegi są powtarzalne – ponowiony ma ten sam czas życia
+    lifetimes = {sweep._key(row): row["lifetime"] for row in first}
+    assert all(lifetimes[sweep._key(row)] == row["lifetime"] for row in rows)
+
+
+@pytest.mark.parametrize("flags", (
+    ["--boundary", "torus"],
+    ["--engine", "bitpacked"],
+    ["--max-generations", "80"],
+))
+def test_resume_refuses_other_parameters(tmp_path, flags):
+    output = str(tmp_path / "sweep.csv")
+    sweep.main(ARGS + ["--output", output])
+    with pytest.raises(SystemExit) as excinfo:
+        sweep.main(ARGS + flags + ["--output", output])
+    assert excinfo.value.code == 2
+    assert len(_rows(output)) == 6
+
+
+def test_resume_refuses_a_file_without_run_parameters(tmp_path):
+    output = tmp_path / "old.csv"
+    output.write_text("size,density,rule,seed,lifetime\n24,0.3,B3/S23,0,10\n", encoding="utf-8")
+    with pytest.raises(SystemExit):
+        sweep.parse_args(["--output", str(output)])